@@ -9,15 +9,72 @@ to prevent "AI slop" and maintain high-quality outputs.
 import requests
 import json
 import hashlib
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
 class QualityTracker:
-    """Helper class for integrating quality tracking into OAA services."""
+    """Helper class for integrating quality tracking into OAA services.
+
+    With buffer_size > 0 events are queued locally and sent to
+    /dev/quality/record-batch as NDJSON once buffer_size events are waiting
+    or flush_interval seconds after the first one, whichever comes first.
+    Call flush() (or use the tracker as a context manager) before exiting.
+    """
     
-    def __init__(self, oaa_base_url: str = "https://oaa-api-library.onrender.com"):
+    def __init__(self, oaa_base_url: str = "https://oaa-api-library.onrender.com",
+                 buffer_size: int = 0, flush_interval: float = 5.0):
         self.oaa_base_url = oaa_base_url
         self.quality_enabled = True  # Set to False to disable tracking
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._session = requests.Session()  # keep-alive across flushes
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.flush()
+    
+    def _buffer_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue one event; flush when the buffer is full."""
+        event["ts"] = time.time()
+        with self._lock:
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.buffer_size
+            if not full and self._timer is None and self.flush_interval > 0:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            return self.flush()
+        return {"status": "buffered"}
+    
+    def flush(self) -> Dict[str, Any]:
+        """Send every buffered event in one request."""
+        with self._lock:
+            events, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not events:
+            return {"status": "empty"}
+        body = "\n".join(json.dumps(e) for e in events) + "\n"
+        try:
+            response = self._session.post(
+                f"{self.oaa_base_url}/dev/quality/record-batch",
+                data=body.encode(),
+                headers={"Content-Type": "application/x-ndjson"},
+                timeout=10
+            )
+            return response.json()
+        except Exception as e:
+            print(f"Warning: Failed to flush {len(events)} quality events: {e}")
+            return {"status": "error", "message": str(e)}
     
     def record_output(self, output_data: Dict[str, Any], 
                      has_provenance: bool = False,
@@ -42,6 +99,16 @@ class QualityTracker:
         if not self.quality_enabled:
             return {"status": "disabled"}
         
+        if self.buffer_size > 0:
+            return self._buffer_event({
+                "event": "output",
+                "has_provenance": has_provenance,
+                "sources": sources or [],
+                "is_duplicate": is_duplicate,
+                "is_quarantined": is_quarantined,
+                "beacon_valid": beacon_valid
+            })
+        
         payload = {
             "output_data": output_data,
             "has_provenance": has_provenance,
@@ -67,6 +134,9 @@ class QualityTracker:
         if not self.quality_enabled:
             return {"status": "disabled"}
         
+        if self.buffer_size > 0:
+            return self._buffer_event({"event": "copilot_overlap", "pr_id": pr_id, "overlap_score": overlap_score})
+        
         payload = {
             "pr_id": pr_id,
             "overlap_score": overlap_score
@@ -88,6 +158,9 @@ class QualityTracker:
         if not self.quality_enabled:
             return {"status": "disabled"}
         
+        if self.buffer_size > 0:
+            return self._buffer_event({"event": "rollback", "reason": reason, "output_hash": output_hash})
+        
         payload = {
             "reason": reason,
             "output_hash": output_hash
@@ -232,6 +305,21 @@ def example_quality_gate():
         print("Quality tracking disabled, skipping gate")
         return True
 
+def example_batched_tracking():
+    """Example: Buffering events on a busy service."""
+    # One request per 500 events (or per 2 seconds) instead of one per output
+    with QualityTracker(buffer_size=500, flush_interval=2.0) as tracker:
+        for i in range(1200):
+            tracker.record_output(
+                output_data={"type": "summary", "n": i},
+                has_provenance=True,
+                sources=["ingest"],
+                beacon_valid=True
+            )
+        tracker.record_rollback("stale_cache")
+    # leaving the block flushed the remainder
+    print("Batched 1201 quality events")
+
 # Helper functions
 
 def validate_beacon_schema(beacon_data: Dict[str, Any]) -> bool:
@@ -272,6 +360,10 @@ def main():
     example_quality_gate()
     print()
     
+    print("5. Batching quality events:")
+    example_batched_tracking()
+    print()
+    
     print("=== Examples completed ===")
 
 if __name__ == "__main__":
@@ -12,13 +12,18 @@ Outputs:
   - Optional POST to Lab7 OAA and Civic Ledger
 """
 from __future__ import annotations
-import os, time, json, hashlib, pathlib
+import os, sys, time, json, hashlib, pathlib
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 
 import requests
 
+# the segmented log (src/app/utils/echo_log.py) lives in the app package: run from a full repo checkout
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from src.app.utils.echo_log import SegmentedLog
+from src.app.utils.probe import probe_services
+
 # ---------- Config via ENV ----------
 LAB4_URL   = os.getenv("LAB4_URL",   "https://hive-api-2le8.onrender.com/health")
 LAB6_URL   = os.getenv("LAB6_URL",   "https://lab6-proof-api.onrender.com/health")
@@ -36,6 +41,7 @@ RETRY_COUNT      = int(os.getenv("RETRY_COUNT", "1"))
 LOG_DIR          = os.getenv("ECHO_LOG_DIR", "./echo_logs")
 
 pathlib.Path(LOG_DIR).mkdir(parents=True, exist_ok=True)
+ECHO_LOG = SegmentedLog(LOG_DIR, "echo")  # echo_<seq>.ndjson segments + .idx offsets
 
 def utcnow_iso():
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -51,31 +57,10 @@ class ServiceCheck:
     latency_ms: Optional[float]
     error: Optional[str]
 
-def http_health(name: str, url: str) -> ServiceCheck:
-    t0 = time.perf_counter()
-    try:
-        r = requests.get(url, timeout=TIMEOUT_SEC)
-        latency = round((time.perf_counter() - t0) * 1000, 2)
-        if r.ok:
-            return ServiceCheck(name, url, "UP", latency, None)
-        return ServiceCheck(name, url, "DOWN", latency, f"HTTP {r.status_code}")
-    except Exception as e:
-        return ServiceCheck(name, url, "DOWN", None, str(e))
-
 def check_core_services() -> List[ServiceCheck]:
-    checks = []
-    for name, url in [
-        ("Lab4", LAB4_URL),
-        ("Lab6", LAB6_URL),
-        ("CivicLedger", LEDGER_URL),
-        ("GICIndexer", GIC_URL),
-        ("Lab7", LAB7_URL),
-    ]:
-        c = http_health(name, url)
-        if c.status == "DOWN" and RETRY_COUNT > 0:
-            c = http_health(name, url)  # quick retry
-        checks.append(c)
-    return checks
+    services = {"Lab4": LAB4_URL, "Lab6": LAB6_URL, "CivicLedger": LEDGER_URL, "GICIndexer": GIC_URL, "Lab7": LAB7_URL}
+    summary = probe_services(services, timeout=TIMEOUT_SEC, retries=RETRY_COUNT)  # all at once, hedged retries
+    return [ServiceCheck(name, v["url"], v["status"], v["latency_ms"], v["error"]) for name, v in summary.items()]
 
 def load_latest_global_pulse(p: str = "./global-health-sentinel/attestations") -> Optional[Dict[str, Any]]:
     """Optionally decorate the Echo pulse with the most recent Global Health attestation."""
@@ -109,10 +94,8 @@ def build_echo_pulse(global_health: Optional[Dict[str, Any]] = None) -> Dict[str
     return pulse
 
 def save_pulse(pulse: Dict[str, Any]) -> str:
-    ts = pulse["timestamp"].replace(":", "").replace("-", "")
-    p = pathlib.Path(LOG_DIR) / f"echo_{ts}.json"
-    p.write_text(json.dumps(pulse, indent=2))
-    return str(p)
+    """Append to the segmented echo log; returns "<dir>/<segment>.ndjson#<i>"."""
+    return str(pathlib.Path(LOG_DIR) / ECHO_LOG.append(pulse))
 
 def _headers():
     h = {"Content-Type": "application/json"}
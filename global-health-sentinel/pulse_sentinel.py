@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
-import os, json, time, hashlib, pathlib
+import os, sys, json, time, hashlib, pathlib
 from datetime import datetime, timezone
 
+# the segmented log (src/app/utils/echo_log.py) lives in the app package: run from a full repo checkout
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from src.app.utils.echo_log import SegmentedLog
+
 # ---- Configure via ENV or edit below ----
 REGIONS = os.getenv("GHS_REGIONS", "US,EU,JP").split(",")
 LOG_DIR = os.getenv("GHS_LOG_DIR", "./logs")
@@ -17,6 +21,7 @@ ENFORCE_SHIELD = os.getenv("GHS_ENFORCE_SHIELD", "1") == "1"
 
 pathlib.Path(LOG_DIR).mkdir(parents=True, exist_ok=True)
 pathlib.Path(ATT_DIR).mkdir(parents=True, exist_ok=True)
+PULSE_LOG = SegmentedLog(LOG_DIR, "pulse")  # pulse_<seq>.ndjson segments + .idx offsets
 
 def utcnow_iso():
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -52,9 +57,7 @@ def build_pulse():
     return payload
 
 def write_log(pulse):
-    p = pathlib.Path(LOG_DIR) / f"pulse_{pulse['timestamp'][:10]}.jsonl"
-    with open(p, "a", encoding="utf-8") as f:
-        f.write(json.dumps(pulse, separators=(",", ":")) + "\n")
+    PULSE_LOG.append(pulse)
 
 def save_attestation(pulse):
     ts = pulse["timestamp"].replace(":", "").replace("-", "")
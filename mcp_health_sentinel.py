@@ -25,6 +25,10 @@ global_health_path = os.path.join(current_dir, 'global-health-sentinel')
 
 sys.path.insert(0, sentinel_path)
 sys.path.insert(0, global_health_path)
+sys.path.insert(0, current_dir or ".")  # repo root: the sentinels import src.app.utils.echo_log
+
+from src.app.utils.echo_log import SegmentedLog
+from src.app.utils.probe import probe_services
 
 # Import functions directly
 try:
@@ -125,6 +129,7 @@ class MCPHealthSentinel:
         self.services = SERVICES
         self.log_dir = pathlib.Path("./sentinel_logs")
         self.echo_log_dir = pathlib.Path("./global-health-sentinel/echo_logs")
+        self.echo_log = SegmentedLog(self.echo_log_dir.resolve(), "echo")  # absolute: survives the chdir below
         self.attest_dir = pathlib.Path("./global-health-sentinel/attestations")
         
         # Ensure directories exist
@@ -135,7 +140,8 @@ class MCPHealthSentinel:
     def get_service_status(self) -> Dict[str, Any]:
         """Get current status of all monitored services"""
         try:
-            summary = check_once()
+            # concurrent sweep; safe to call from inside the MCP server's event loop
+            summary = probe_services(self.services)
             return {
                 "status": "success",
                 "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -224,18 +230,16 @@ class MCPHealthSentinel:
             # Run the echo bridge
             run_echo_bridge()
             
-            # Find the latest generated echo pulse
-            echo_files = list(self.echo_log_dir.glob("echo_*.json"))
-            if echo_files:
-                latest_file = max(echo_files, key=lambda x: x.stat().st_mtime)
-                with open(latest_file, "r", encoding="utf-8") as f:
-                    echo_data = json.load(f)
+            # Latest pulse in the segmented echo log
+            latest = self.echo_log.latest()
+            if latest:
+                echo_data = self.echo_log.get(*latest)
                 
                 os.chdir(original_cwd)
                 return {
                     "status": "success",
                     "echo_pulse": echo_data,
-                    "saved_to": str(latest_file),
+                    "saved_to": f"{self.echo_log_dir / latest[0]}.ndjson#{latest[1]}",
                     "fingerprint": echo_data["fingerprint_sha256"]
                 }
             else:
@@ -284,19 +288,17 @@ class MCPHealthSentinel:
                         "signals_count": len(data["signals"].get("epidemic", [])) + len(data["signals"].get("climate_health", []))
                     })
             
-            # Echo pulses
-            echo_files = list(self.echo_log_dir.glob("echo_*.json"))
-            for file in sorted(echo_files, key=lambda x: x.stat().st_mtime, reverse=True)[:limit]:
-                with open(file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    attestations.append({
-                        "type": "echo_pulse",
-                        "file": file.name,
-                        "timestamp": data["timestamp"],
-                        "fingerprint": data["fingerprint_sha256"],
-                        "services_up": len(data["summary"]["up"]),
-                        "services_down": len(data["summary"]["down"])
-                    })
+            # Echo pulses: newest `limit` records straight from the segment index
+            for segment, i in reversed(self.echo_log.tail(limit)):
+                data = self.echo_log.get(segment, i)
+                attestations.append({
+                    "type": "echo_pulse",
+                    "file": f"{segment}.ndjson#{i}",
+                    "timestamp": data["timestamp"],
+                    "fingerprint": data["fingerprint_sha256"],
+                    "services_up": len(data["summary"]["up"]),
+                    "services_down": len(data["summary"]["down"])
+                })
             
             # Sort by timestamp
             attestations.sort(key=lambda x: x["timestamp"], reverse=True)
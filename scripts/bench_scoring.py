@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark OAA source scoring: scalar score_source loop vs score_sources_batch.
+
+Usage:
+    python scripts/bench_scoring.py [--n 20000] [--repeat 3]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.app.routers.oaa.models import Endpoint, Source
+from src.app.routers.oaa.scoring import np, score_source, score_sources_batch
+
+
+def make_sources(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    licenses = ["MIT", "Apache-2.0", "GPL-3.0", "", None, "cc0"]
+    out = []
+    for i in range(n):
+        meta = {}
+        if rng.random() < 0.5:
+            meta["rate_limit"] = "60/m"
+        if rng.random() < 0.4:
+            meta["uptime"] = str(rng.choice([rng.random(), 1.2, "n/a"]))
+        if rng.random() < 0.2:
+            meta["reputation"] = str(round(rng.random(), 3))
+        out.append(Source(
+            id=f"src:bench:{i}",
+            name=f"API {i}",
+            domain=rng.choice(["", f"api{i}.example"]),
+            license=rng.choice(licenses),
+            owner=rng.choice([None, {"org": "x"}, {"name": "y"}]),
+            endpoints=[Endpoint(path="/v1", schema=rng.choice([None, "openapi"]))] if rng.random() < 0.7 else [],
+            meta=meta,
+            last_update=rng.choice([None, now - timedelta(days=rng.randint(0, 400))]),
+            tags=rng.sample(["weather", "geo", "unsafe", "pii_leak", "finance"], k=rng.randint(0, 2)),
+        ))
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark scalar vs batch OAA scoring")
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sources = make_sources(args.n)
+    now = datetime.utcnow()
+
+    def best(fn):
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - t0)
+        return min(times), result
+
+    t_scalar, scalar = best(lambda: [score_source(s, now) for s in sources])
+    t_batch, batch = best(lambda: score_sources_batch(sources, now))
+
+    identical = all(a.model_dump() == b.model_dump() for a, b in zip(scalar, batch))
+    print(f"sources:   {args.n}  (numpy: {'yes' if np is not None else 'no, scalar fallback'})")
+    print(f"scalar:    {t_scalar * 1000:8.1f} ms")
+    print(f"batch:     {t_batch * 1000:8.1f} ms  ({t_scalar / t_batch:.1f}x)")
+    print(f"identical: {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Maintenance for the segmented echo/sentinel logs (src/app/utils/echo_log.py).
+
+Usage:
+    # fold legacy echo_*.json pulse files into the segmented log (the API also
+    # does this at startup; a marker file stops it happening twice, and an
+    # interrupted run resumes where it stopped)
+    python scripts/echo_log_tool.py migrate --dir ./echo_logs [--remove]
+
+    # roll sealed segments older than N days into daily gzip archives
+    python scripts/echo_log_tool.py compact --dir ./echo_logs [--days 30] [--stream echo]
+
+    # segment / record counts
+    python scripts/echo_log_tool.py stats --dir ./echo_logs
+
+--dir defaults to ECHO_LOG_DIR. Safe to run while sentinels are writing:
+both commands take the same lock as the writers.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.app.utils.echo_log import COMPACT_AFTER_DAYS, SegmentedLog, migrate_json_files
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Migrate, compact and inspect segmented echo logs")
+    parser.add_argument("command", choices=["migrate", "compact", "stats"])
+    parser.add_argument("--dir", default=os.getenv("ECHO_LOG_DIR", "./echo_logs"), help="Log directory")
+    parser.add_argument("--stream", default="echo", help="Stream name (echo, health, pulse)")
+    parser.add_argument("--src", help="migrate: directory holding the legacy files (default: --dir)")
+    parser.add_argument("--pattern", default="echo_*.json", help="migrate: legacy file glob")
+    parser.add_argument("--remove", action="store_true", help="migrate: delete each file once appended")
+    parser.add_argument("--days", type=float, default=COMPACT_AFTER_DAYS, help="compact: age cutoff in days")
+    parser.add_argument("--archive", help="compact: archive directory (default: <dir>/archive)")
+    args = parser.parse_args()
+
+    log = SegmentedLog(args.dir, args.stream)
+    if args.command == "migrate":
+        if args.src and Path(args.src).resolve() != Path(args.dir).resolve():
+            written, skipped = migrate_json_files(args.src, log, args.pattern, remove=args.remove)
+        else:
+            written, skipped = log.import_legacy(args.pattern, remove=args.remove)
+        print(f"✅ Migrated {written} record(s) into {args.dir}/{args.stream}_*.ndjson")
+        for name in skipped:
+            print(f"⚠️  Skipped unreadable {name}")
+        return 1 if skipped else 0
+    if args.command == "compact":
+        done = log.compact(args.days, args.archive)
+        print(f"✅ Compacted {len(done)} segment(s)" + (f": {', '.join(done)}" if done else ""))
+        return 0
+    segments = log.segments()
+    total = sum(log.count(name) for name in segments)
+    print(f"{args.stream}: {len(segments)} segment(s), {total} record(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
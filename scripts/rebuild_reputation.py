@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Rebuild OAA reputation aggregates from the vote log.
+
+The OAA keeps running per-source vote totals (up/down/neutral counts and
+signed stake sum) that record_vote updates in O(1). This script replays
+the full vote log and compares the result with the stored aggregates.
+
+Usage:
+    python scripts/rebuild_reputation.py            # report mismatches (exit 1 if any)
+    python scripts/rebuild_reputation.py --write    # replace stored aggregates with the rebuilt ones
+
+Uses the same OAA_STORE / OAA_STORE_PATH settings as the API.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.app.routers.oaa.store import rebuild_reputation, reputation_from
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild OAA reputation aggregates from the vote log")
+    parser.add_argument("--write", action="store_true", help="Overwrite stored aggregates with the rebuilt values")
+    args = parser.parse_args()
+
+    mismatches = rebuild_reputation(write=args.write)
+    if not mismatches:
+        print("✅ Reputation aggregates match the vote log")
+        return 0
+
+    for sid, (stored, rebuilt) in sorted(mismatches.items()):
+        print(f"❌ {sid}: stored={tuple(stored)} rebuilt={tuple(rebuilt)} "
+              f"reputation {reputation_from(stored):.4f} -> {reputation_from(rebuilt):.4f}")
+    if args.write:
+        print(f"🔧 Rewrote aggregates ({len(mismatches)} source(s) corrected)")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
-import os, time, json, hashlib, pathlib, sys
+import os, time, json, hashlib, pathlib, sys, math, signal, asyncio, argparse
+from collections import deque
 from datetime import datetime, timezone, timedelta
 
 import requests
 
+# the segmented log (src/app/utils/echo_log.py) lives in the app package: run from a full repo checkout
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from src.app.utils.echo_log import SegmentedLog
+from src.app.utils.http_clients import CLIENTS
+from src.app.utils.probe import ENGINE, probe_services, targets_for
+
 # -------- Config (env or defaults) --------
 SERVICES = {
     "Lab4":       os.getenv("LAB4_URL",       "https://hive-api-2le8.onrender.com/health"),
@@ -14,19 +21,22 @@ SERVICES = {
 }
 
 TIMEOUT_SEC     = int(os.getenv("TIMEOUT_SEC", "10"))
-RETRY_COUNT     = int(os.getenv("RETRY_COUNT", "1"))      # quick retry per service
-INTERVAL_SEC    = int(os.getenv("INTERVAL_SEC", "300"))    # 300s = 5min if you run loop mode
+RETRY_COUNT     = int(os.getenv("RETRY_COUNT", "1"))      # extra (hedged) attempts per service
+INTERVAL_SEC    = float(os.getenv("INTERVAL_SEC", "300"))  # 300s = 5min in loop mode; seconds are fine with --daemon
 STATE_PATH      = os.getenv("STATE_PATH", "./sentinel_state.json")
 LOG_DIR         = os.getenv("LOG_DIR", "./sentinel_logs")
 ALERT_THRESHOLD = int(os.getenv("ALERT_THRESHOLD", "2"))   # services down to trigger alert
 ALERT_WINDOW_M  = int(os.getenv("ALERT_WINDOW_MIN", "15")) # must persist ≥ 15 minutes
 ALERT_WEBHOOK   = os.getenv("ALERT_WEBHOOK", "")           # optional Slack/webhook URL
+DAEMON_LOG_SEC  = float(os.getenv("DAEMON_LOG_SEC", "300"))  # --daemon: health log heartbeat (plus every status change)
+LATENCY_HISTORY = int(os.getenv("LATENCY_HISTORY", "720"))   # --daemon: latency samples kept per service
 
 # Optional: auto-post attestation to Ledger (set URL/token if you want)
 ATTEST_POST_URL   = os.getenv("ATTEST_POST_URL", "")       # e.g. https://civic-protocol-core-ledger.onrender.com/ledger/attest
 ATTEST_BEARER     = os.getenv("ATTEST_BEARER", "")         # token if needed
 
 pathlib.Path(LOG_DIR).mkdir(parents=True, exist_ok=True)
+HEALTH_LOG = SegmentedLog(LOG_DIR, "health")  # health_<seq>.ndjson segments + .idx offsets
 
 def utcnow_iso():
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -34,30 +44,9 @@ def utcnow_iso():
 def sha256_hex(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
-def http_get(url: str) -> tuple[str, float | None, str | None]:
-    """Return (status, latency_ms, error) where status in {'UP','DOWN'}."""
-    t0 = time.perf_counter()
-    try:
-        r = requests.get(url, timeout=TIMEOUT_SEC)
-        latency = round((time.perf_counter() - t0) * 1000, 2)
-        if r.ok:
-            return "UP", latency, None
-        else:
-            return "DOWN", latency, f"HTTP {r.status_code}"
-    except Exception as e:
-        return "DOWN", None, str(e)
-
 def check_once() -> dict:
-    summary = {}
-    for name, url in SERVICES.items():
-        status, latency, err = http_get(url)
-        if status == "DOWN" and RETRY_COUNT > 0:
-            # one quick retry
-            status2, latency2, err2 = http_get(url)
-            if status2 == "UP":
-                status, latency, err = status2, latency2, None
-        summary[name] = {"status": status, "latency_ms": latency, "error": err, "url": url}
-    return summary
+    """Probe every service concurrently (pooled, hedged retries); {name: {status, latency_ms, error, url}}."""
+    return probe_services(SERVICES, timeout=TIMEOUT_SEC, retries=RETRY_COUNT)
 
 def load_state() -> dict:
     if not os.path.exists(STATE_PATH):
@@ -69,8 +58,10 @@ def load_state() -> dict:
         return {"alerts": []}
 
 def save_state(state: dict):
-    with open(STATE_PATH, "w", encoding="utf-8") as f:
+    tmp = f"{STATE_PATH}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(state, f, indent=2)
+    os.replace(tmp, STATE_PATH)  # readers never see a half-written file
 
 def should_alert(state: dict, now: datetime, down_count: int) -> bool:
     # Maintain a rolling window of "down_count >= threshold" spans.
@@ -97,11 +88,7 @@ def post_webhook(message: str, payload: dict | None = None):
         pass
 
 def write_log(record: dict):
-    # Append JSON line
-    day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    p = pathlib.Path(LOG_DIR) / f"health_{day}.jsonl"
-    with open(p, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    HEALTH_LOG.append(record)
 
 def build_attestation(summary: dict) -> dict:
     ts = utcnow_iso()
@@ -166,12 +153,168 @@ def run_once():
         json.dump(att, f, indent=2)
     print(f"Attestation saved → {att_path}")
 
+# -------- Daemon mode: one process, state in memory --------
+def next_tick(deadline: float, now: float, interval: float) -> float:
+    """Next fixed-rate deadline after `deadline`; ticks missed by an overrun are skipped, not bunched up."""
+    deadline += interval
+    if deadline < now:
+        deadline += math.ceil((now - deadline) / interval) * interval
+    return deadline
+
+def percentile(values: list, q: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+class SentinelDaemon:
+    """
+    Probes on a fixed-rate schedule and keeps the alert window and latency
+    history in memory. The state file is rewritten (in a worker thread) only
+    when its content changes; the health log gets a record on every status
+    change and a heartbeat every DAEMON_LOG_SEC. Instead of an attestation file
+    per run, the latest attestation lives in the state file and is re-posted
+    only when a service changes status.
+    """
+
+    def __init__(self, interval: float = INTERVAL_SEC, probe=None):
+        self.interval = interval
+        self.targets = targets_for(SERVICES, TIMEOUT_SEC, RETRY_COUNT)
+        self.probe = probe or self._probe
+        self.state = load_state()
+        self.history = {name: deque(maxlen=LATENCY_HISTORY) for name in SERVICES}
+        self.ticks = 0
+        self._saved = json.dumps(self.state, sort_keys=True)
+        self._flush = None
+        self._tasks = set()
+        self._logged_at = None
+        self._alerted_at = None
+        self._stop = None
+
+    async def _probe(self) -> dict:
+        return {r.name: r.as_dict() for r in await ENGINE.sweep(self.targets)}
+
+    def _background(self, fn, *args):
+        task = asyncio.create_task(asyncio.to_thread(fn, *args))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def latency_stats(self) -> dict:
+        out = {}
+        for name, samples in self.history.items():
+            ok = [x for x in samples if x is not None]
+            out[name] = {"n": len(samples), "failed": len(samples) - len(ok),
+                         "p50_ms": percentile(ok, 0.5), "p95_ms": percentile(ok, 0.95), "max_ms": max(ok, default=None)}
+        return out
+
+    def _save(self, snap: str):
+        try:
+            save_state(json.loads(snap))
+        except OSError as e:
+            self._saved = None  # retry on the next tick
+            print(f"[sentinel] state flush failed: {e}", file=sys.stderr)
+
+    def flush(self):
+        """Write the state file in a worker thread if it changed and no write is in flight."""
+        snap = json.dumps(self.state, sort_keys=True)
+        if snap == self._saved or (self._flush is not None and not self._flush.done()):
+            return
+        self._saved = snap
+        self._flush = asyncio.create_task(asyncio.to_thread(self._save, snap))
+
+    async def tick(self, now: datetime | None = None) -> dict:
+        now = now or datetime.now(timezone.utc)
+        summary = await self.probe()
+        down = [k for k, v in summary.items() if v["status"] == "DOWN"]
+        for name, v in summary.items():
+            self.history.setdefault(name, deque(maxlen=LATENCY_HISTORY)).append(v["latency_ms"])
+
+        statuses = {k: v["status"] for k, v in summary.items()}
+        changed = statuses != self.state.get("statuses")
+        self.state["statuses"] = statuses
+        alert = should_alert(self.state, now, len(down))
+
+        mono = time.monotonic()
+        if changed or self._logged_at is None or mono - self._logged_at >= DAEMON_LOG_SEC:
+            self._logged_at = mono
+            self._background(write_log, {
+                "timestamp": now.isoformat(),
+                "summary": summary,
+                "down_count": len(down),
+                "down_list": down,
+                "latency_stats": self.latency_stats(),
+            })
+
+        if changed:
+            att = build_attestation(summary)
+            self.state["last_attestation"] = dict(att)
+            self._background(maybe_post_attestation, att)
+            lines = [f"[{now.isoformat(timespec='seconds')}] status change:"]
+            for name, v in summary.items():
+                lines.append(f"- {name}: {v['status']} | latency={v['latency_ms']} ms | err={v['error']}")
+            print("\n".join(lines))
+
+        # alert once the window is sustained, then at most once per ALERT_WINDOW_M while it lasts
+        if not alert:
+            self._alerted_at = None
+        elif self._alerted_at is None or now - self._alerted_at >= timedelta(minutes=ALERT_WINDOW_M):
+            self._alerted_at = now
+            msg = f"[ALERT] {len(down)} services DOWN for ≥{ALERT_WINDOW_M}m: {', '.join(down)}"
+            print(msg)
+            self._background(post_webhook, msg, {"down": down, "attestation": self.state.get("last_attestation")})
+
+        self.flush()
+        return summary
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    async def run(self, max_ticks: int | None = None):
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stop.set)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # not the main thread, or no signal support
+        deadline = loop.time()
+        try:
+            while not self._stop.is_set():
+                try:
+                    await self.tick()
+                except Exception as e:
+                    print(f"[sentinel] probe cycle failed: {e}", file=sys.stderr)
+                self.ticks += 1
+                if max_ticks is not None and self.ticks >= max_ticks:
+                    break
+                deadline = next_tick(deadline, loop.time(), self.interval)
+                try:
+                    await asyncio.wait_for(self._stop.wait(), max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._flush is not None:
+                await self._flush
+            self.flush()  # whatever changed while the last write was in flight
+            if self._flush is not None:
+                await self._flush
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            await CLIENTS.aclose()
+
 if __name__ == "__main__":
-    # Single run (default) or loop if "loop" arg passed
-    loop = len(sys.argv) > 1 and sys.argv[1].lower() == "loop"
-    if not loop:
+    ap = argparse.ArgumentParser(description="Health Sentinel: probe services, log, attest, alert.")
+    ap.add_argument("mode", nargs="?", default="once", type=str.lower, choices=["once", "loop"],
+                    help="once (default) or loop: run_once every INTERVAL_SEC")
+    ap.add_argument("--daemon", action="store_true",
+                    help="long-running fixed-rate mode with in-memory state (no per-run files)")
+    ap.add_argument("--interval", type=float, default=INTERVAL_SEC, help="seconds between probes (default INTERVAL_SEC)")
+    args = ap.parse_args()
+    if args.daemon:
+        asyncio.run(SentinelDaemon(args.interval).run())
+    elif args.mode == "once":
         run_once()
     else:
         while True:
             run_once()
-            time.sleep(INTERVAL_SEC)
+            time.sleep(args.interval)
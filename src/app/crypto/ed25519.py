@@ -1,37 +1,126 @@
 # app/crypto/ed25519.py
-import base64, json, hashlib
-from typing import Any, Dict, Tuple
+import base64, json, hashlib, os
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 from nacl import signing
 from nacl.encoding import RawEncoder
 
+try:
+    import orjson  # optional: faster encoder for the canonical form
+except ImportError:
+    orjson = None
+
 # ---- Canonical JSON & hashing ----
+# The canonical form is defined by the stdlib encoder below; signatures in the
+# wild were made over exactly these bytes. orjson is only used for documents
+# where its output is known to be byte-identical.
+_ORJSON_OPTS = (
+    orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS
+) if orjson else 0
+_PLAIN_SCALARS = frozenset({str, int, bool, type(None)})
+
+def _orjson_compatible(obj: Any) -> bool:
+    """
+    orjson and json.dumps only disagree on floats (orjson writes 1e-7 / 1e16
+    where repr gives 1e-07 / 1e+16, and null for NaN/Infinity) and on types
+    json cannot encode. Allow plain containers/scalars and floats that repr
+    prints without an exponent.
+    """
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        t = type(x)
+        if t is dict:
+            stack.extend(x.values())
+        elif t is list or t is tuple:
+            stack.extend(x)
+        elif t is float:
+            if not (x == 0.0 or 1e-4 <= abs(x) < 1e16):
+                return False
+        elif t not in _PLAIN_SCALARS:
+            return False
+    return True
+
+def canonical_bytes(obj: Any) -> bytes:
+    if orjson is not None and _orjson_compatible(obj):
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTS)
+        except orjson.JSONEncodeError:
+            pass  # non-str keys, ints beyond 64 bits, ...: use the reference encoder
+    return canonical_json(obj).encode("utf-8")
+
+def canonicalize(obj: Any) -> Tuple[bytes, str]:
+    """Canonical bytes and their sha256 hex digest from one serialization."""
+    msg = canonical_bytes(obj)
+    return msg, hashlib.sha256(msg).hexdigest()
+
 def canonical_json(obj: Any) -> str:
     return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
 
 def sha256_hex(obj: Any) -> str:
-    return hashlib.sha256(canonical_json(obj).encode("utf-8")).hexdigest()
+    return hashlib.sha256(canonical_bytes(obj)).hexdigest()
 
-# ---- Load keys from env (base64) ----
+# ---- Key registry: parse each base64 key once (bounded LRU) ----
+KEY_CACHE_SIZE = int(os.getenv("OAA_KEY_CACHE_SIZE", "1024"))
+
+@lru_cache(maxsize=64)
 def load_signing_key(b64_priv: str) -> signing.SigningKey:
     raw = base64.b64decode(b64_priv)
     return signing.SigningKey(raw)
 
+@lru_cache(maxsize=KEY_CACHE_SIZE)
 def load_verify_key(b64_pub: str) -> signing.VerifyKey:
     raw = base64.b64decode(b64_pub)
     return signing.VerifyKey(raw)
 
+class SigningHandle(NamedTuple):
+    """Parsed OAA signing key plus the metadata attestations carry."""
+    key: signing.SigningKey
+    public_key_b64: str
+    version: str
+
+    def sign(self, payload: Dict[str, Any]) -> Tuple[str, str]:
+        return ed25519_sign_with(self.key, payload)
+
+@lru_cache(maxsize=8)
+def _signing_handle(b64_priv: str, b64_pub: str, version: str) -> SigningHandle:
+    return SigningHandle(load_signing_key(b64_priv), b64_pub, version)
+
+def oaa_signer() -> Optional[SigningHandle]:
+    """
+    Handle for the OAA key in OAA_ED25519_PRIVATE_B64 / OAA_ED25519_PUBLIC_B64.
+    Cached on the env values, so a rotated key is picked up without a restart.
+    Returns None when either half is unset.
+    """
+    priv_b64 = os.getenv("OAA_ED25519_PRIVATE_B64", "")
+    pub_b64 = os.getenv("OAA_ED25519_PUBLIC_B64", "")
+    if not (priv_b64 and pub_b64):
+        return None
+    return _signing_handle(priv_b64, pub_b64, os.getenv("OAA_SIGNING_VERSION", "oaa:ed25519:v1"))
+
 # ---- Sign / Verify ----
 def ed25519_sign(b64_priv: str, payload: Dict[str, Any]) -> Tuple[str, str]:
-    sk = load_signing_key(b64_priv)
-    msg = canonical_json(payload).encode("utf-8")
+    return ed25519_sign_with(load_signing_key(b64_priv), payload)
+
+def ed25519_sign_with(sk: signing.SigningKey, payload: Dict[str, Any]) -> Tuple[str, str]:
+    msg, digest = canonicalize(payload)
     sig = sk.sign(msg, encoder=RawEncoder).signature  # 64 bytes
     sig_b64 = base64.b64encode(sig).decode("ascii")
-    return sha256_hex(payload), sig_b64
+    return digest, sig_b64
 
 def ed25519_verify(b64_pub: str, payload: Dict[str, Any], sig_b64: str) -> bool:
     vk = load_verify_key(b64_pub)
     sig = base64.b64decode(sig_b64)
-    msg = canonical_json(payload).encode("utf-8")
+    msg = canonical_bytes(payload)
+    try:
+        vk.verify(msg, sig)
+        return True
+    except Exception:
+        return False
+
+def ed25519_verify_raw(vk: signing.VerifyKey, msg: bytes, sig: bytes) -> bool:
+    """Verify pre-encoded bytes with an already-parsed key (batch/hot paths)."""
     try:
         vk.verify(msg, sig)
         return True
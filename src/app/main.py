@@ -1,4 +1,5 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import JSONResponse
 from .routers.oaa import router as oaa_router
@@ -7,17 +8,32 @@ from .routers.health_auth import router as health_auth_router
 from .routers.health_redis import router as health_redis_router
 from .routers.oaa.verify_history import router as verify_history_router
 from .routers.oaa.keys_page import router as keys_page_router
-from .routers.oaa.echo_routes import router as echo_routes_router
+from .routers.oaa.echo_routes import router as echo_routes_router, import_legacy_pulses
 from .routers.quality_metrics import router as quality_metrics_router
 from .routers.atlas import router as atlas_router
 from .routers.civic_mount import router as civic_mount_router
-import os
-import json
+from .routers.oaa.outbox import WORKER as outbox_worker
+from .utils.http_clients import CLIENTS as http_clients
+import asyncio, os
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Import legacy echo pulse files before serving (a no-op once done); drain
+    # the ledger outbox for as long as the app is up; close pooled upstream
+    # connections on the way out
+    await asyncio.to_thread(import_legacy_pulses)
+    await outbox_worker.start()
+    try:
+        yield
+    finally:
+        await outbox_worker.stop()
+        await http_clients.aclose()
 
 app = FastAPI(
     title="Lab7 – Open Attestation Authority (OAA)",
     description="Cryptographic attestation and verification engine for the Kaizen DVA ecosystem",
-    version="1.0.1"
+    version="1.0.1",
+    lifespan=lifespan,
 )
 
 # Include routers
@@ -41,20 +57,6 @@ oaa_router.ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
 def health_root():
     return JSONResponse({"status": "ok", "service": "oaa", "version": app.version})
 
-# ATLAS manifest endpoint
-@app.get("/.civic/atlas.manifest.json")
-def atlas_manifest():
-    """Serve the ATLAS manifest for this service"""
-    manifest_path = ".civic/atlas.manifest.json"
-    try:
-        with open(manifest_path, "r") as f:
-            manifest = json.load(f)
-        return JSONResponse(manifest)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="ATLAS manifest not found")
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="Invalid ATLAS manifest format")
-
 @app.get("/")
 def root():
     return {
@@ -70,6 +72,7 @@ def root():
             "healthz": "/healthz",
             "health_auth": "/health/auth",
             "redis_health": "/_health/redis",
+            "http_pools": "/_health/http",
             "oaa_redis_health": "/oaa/_health/redis",
             "echo_ingest": "/oaa/echo/ingest",
             "quality_metrics": "/dev/quality",
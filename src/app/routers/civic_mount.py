@@ -4,16 +4,21 @@
 # Version: 1.0
 # Date: 2025-10-23
 
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Request, HTTPException, Header, Response
 from datetime import datetime
+from typing import Optional
 import hashlib
-import json
 import os
 
+from ..utils.manifest_cache import MANIFESTS, manifest_cache
+
 router = APIRouter()
 
 def _compute_manifest_hash(files):
     """Compute combined sha256 of all civic manifests."""
+    cache = manifest_cache()
+    if list(files) == cache.paths:
+        return cache.bundle_sha256
     sha = hashlib.sha256()
     for f in files:
         if os.path.exists(f):
@@ -21,28 +26,38 @@ def _compute_manifest_hash(files):
                 sha.update(fh.read())
     return sha.hexdigest()
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not isinstance(if_none_match, str):
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
 @router.get("/api/civic/mount")
-def civic_mount(request: Request):
+def civic_mount(request: Request, response: Response = None, if_none_match: Optional[str] = Header(None)):
     """
     The Civic Mount endpoint.
     Allows any LLM or agent to retrieve the Civic OS manifests,
     ensuring continuity, interoperability, and proof of integrity.
     """
     # Manifests to expose for docking
-    manifests = [
-        "./.civic/atlas.manifest.json",
-        "./.civic/biodna.json",
-        "./.civic/virtue_accords.yaml"
-    ]
+    manifests = MANIFESTS
 
     # Build base URL for fully-qualified manifest URLs
     base = str(request.base_url).rstrip("/")
     manifest_urls = [f"{base}/{m.replace('./','',1)}" for m in manifests]
 
-    # Compute GI signature over file contents
-    gi_signature = _compute_manifest_hash(manifests)
-    
-    response = {
+    # GI signature over file contents, from the in-memory bundle
+    gi_signature = manifest_cache().bundle_sha256
+
+    # Same bundle + same base URL => same mount document (timestamp aside)
+    etag = '"' + hashlib.sha256(f"{gi_signature}|{base}".encode()).hexdigest()[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    if response is not None:
+        response.headers.update(headers)
+
+    mount = {
         "manifest_bundle": manifests,
         "manifest_urls": manifest_urls,
         "gi_signature": f"sha256:{gi_signature}",
@@ -60,42 +75,29 @@ def civic_mount(request: Request):
         }
     }
 
-    return response
+    return mount
 
 @router.get("/api/civic/status")
 def civic_status():
     """
     Get current Civic OS status and manifest health.
     """
-    manifests = [
-        "./.civic/atlas.manifest.json",
-        "./.civic/biodna.json",
-        "./.civic/virtue_accords.yaml"
-    ]
-    
     status = {
         "civic_os_status": "operational",
         "manifests": {},
         "overall_health": "healthy"
     }
     
-    for manifest in manifests:
-        if os.path.exists(manifest):
-            try:
-                with open(manifest, "r") as f:
-                    data = json.load(f) if manifest.endswith('.json') else f.read()
-                status["manifests"][manifest] = {
-                    "exists": True,
-                    "size": os.path.getsize(manifest),
-                    "readable": True
-                }
-            except Exception as e:
-                status["manifests"][manifest] = {
-                    "exists": True,
-                    "size": os.path.getsize(manifest),
-                    "readable": False,
-                    "error": str(e)
-                }
+    # readability was checked once when the cache (re)loaded each file
+    for manifest, f in manifest_cache().files.items():
+        if f.exists:
+            status["manifests"][manifest] = {
+                "exists": True,
+                "size": f.size,
+                "readable": f.readable
+            }
+            if f.error:
+                status["manifests"][manifest]["error"] = f.error
         else:
             status["manifests"][manifest] = {
                 "exists": False,
@@ -103,4 +105,99 @@ def civic_status():
             }
             status["overall_health"] = "degraded"
     
-    return status
\ No newline at end of file
+    return status
+# ---- Manifest bundle files ----
+# Static-like serving of the files listed in manifest_urls, straight from the
+# in-memory cache: strong ETags, Last-Modified, precompressed gzip/br
+# variants and single byte ranges.
+MEDIA_TYPES = {".json": "application/json", ".yaml": "application/yaml", ".yml": "application/yaml"}
+BUNDLE_FILES = {os.path.basename(m): m for m in MANIFESTS}
+
+def _pick_encoding(accept_encoding: Optional[str], available) -> Optional[str]:
+    if not accept_encoding or not available:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for enc in ("br", "gzip"):
+        if enc in available and accepted.get(enc, accepted.get("*", 0)) > 0:
+            return enc
+    return None
+
+def _parse_range(header: str, size: int):
+    """Single `bytes=` range -> (start, end) inclusive; None if not satisfiable.
+    ValueError for anything invalid (including last < first), which callers ignore."""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError("unsupported range")
+    first, _, last = spec.strip().partition("-")
+    if not first:  # suffix: last N bytes
+        n = int(last)
+        return (max(0, size - n), size - 1) if n > 0 and size else None
+    start = int(first)
+    if last and int(last) < start:
+        raise ValueError("invalid range")
+    end = min(int(last), size - 1) if last else size - 1
+    return (start, end) if start < size else None
+
+@router.api_route("/.civic/{name}", methods=["GET", "HEAD"])
+def civic_manifest_file(name: str, request: Request):
+    path = BUNDLE_FILES.get(name)
+    f = manifest_cache().get(path) if path else None
+    if not f or not f.exists:
+        raise HTTPException(status_code=404, detail="Manifest not found")
+    if name.endswith(".json") and not f.readable:
+        raise HTTPException(status_code=500, detail="Invalid manifest format")
+
+    h = request.headers
+    headers = {
+        "Last-Modified": f.last_modified,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "public, max-age=60",
+    }
+    media_type = MEDIA_TYPES.get(os.path.splitext(name)[1], "application/octet-stream")
+
+    # Ranges address the identity bytes, so they are never combined with compression
+    rng = h.get("range")
+    if rng and h.get("if-range") not in (None, f.etag, f.last_modified):
+        rng = None  # stale validator: send the whole file
+    enc = None if rng else _pick_encoding(h.get("accept-encoding"), f.encodings)
+    etag = f.etag if enc is None else f'"{f.sha256[:32]}-{enc}"'
+    headers["ETag"] = etag
+
+    inm = h.get("if-none-match")
+    if inm is not None:
+        if _etag_matches(inm, etag) or _etag_matches(inm, f.etag):
+            return Response(status_code=304, headers=headers)
+    elif h.get("if-modified-since") == f.last_modified:
+        return Response(status_code=304, headers=headers)
+
+    body, status = f.data, 200
+    if rng:
+        try:
+            span = _parse_range(rng, f.size)
+        except ValueError:
+            span = rng = None  # invalid or unsupported: ignore the header, send 200
+        if rng and span is None:
+            headers["Content-Range"] = f"bytes */{f.size}"
+            return Response(status_code=416, headers=headers)
+        if span:
+            start, end = span
+            body, status = f.data[start:end + 1], 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{f.size}"
+    elif enc:
+        body = f.encodings[enc]
+        headers["Content-Encoding"] = enc
+
+    if request.method == "HEAD":
+        headers["Content-Length"] = str(len(body))
+        return Response(status_code=status, headers=headers, media_type=media_type)
+    return Response(content=body, status_code=status, headers=headers, media_type=media_type)
@@ -1,6 +1,7 @@
 # app/routers/health.py
 from fastapi import APIRouter
 from datetime import datetime
+from ..utils.http_clients import CLIENTS
 
 router = APIRouter()
 
@@ -8,3 +9,8 @@ router = APIRouter()
 def health():
     return {"ok": True, "ts": datetime.utcnow().isoformat() + "Z"}
 
+@router.get("/_health/http")
+def http_pools():
+    # Outbound connection pools: in_flight/max_connections shows saturation
+    return {"ok": True, "pools": CLIENTS.metrics()}
+
@@ -0,0 +1,114 @@
+# app/routers/oaa/echo_index.py
+# In-process index over the echo pulse log in ECHO_LOG_DIR (segmented NDJSON,
+# see utils/echo_log.py). The positions of the newest pulses are refreshed at
+# most once per ECHO_INDEX_CHECK_SEC; each pulse is parsed once, on first use,
+# and its summary fields and ETag are cached. /echo/latest can then answer
+# If-None-Match with no disk read, and /echo/list costs O(limit). Legacy
+# echo_*.json pulse files are imported at app startup (echo_routes), never
+# while serving a request.
+import hashlib, json, os, threading, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ...utils.echo_log import SegmentedLog
+
+CHECK_SEC = float(os.getenv("ECHO_INDEX_CHECK_SEC", "1.0"))
+TAIL_KEEP = 100  # newest positions kept in memory; /echo/list's maximum
+ENTRY_CACHE = 1024
+
+def fingerprint(obj: dict) -> str:
+    s = json.dumps(obj, sort_keys=True)
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+class EchoEntry(NamedTuple):
+    name: str  # "<segment>.ndjson#<i>"
+    timestamp: Optional[str]
+    fingerprint_sha256: Optional[str]  # as recorded in the pulse
+    summary: Dict[str, Any]
+    etag: str  # weak tag over the whole document
+
+    def item(self) -> Dict[str, Any]:
+        return {
+            "file": self.name,
+            "timestamp": self.timestamp,
+            "fingerprint_sha256": self.fingerprint_sha256,
+            "summary": self.summary,
+        }
+
+class EchoIndex:
+    def __init__(self, directory: Path, check_sec: float = CHECK_SEC):
+        self.log = SegmentedLog(directory, "echo")
+        self.check_sec = check_sec
+        self.tail: List[Tuple[str, int]] = []  # newest positions, oldest first
+        self.entries: "OrderedDict[Tuple[str, int], EchoEntry]" = OrderedDict()
+        self._latest: Optional[tuple] = None  # (position, parsed document)
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> "EchoIndex":
+        now = time.monotonic()
+        if not force and now - self._checked < self.check_sec:
+            return self
+        with self._lock:
+            self.tail = self.log.tail(TAIL_KEEP)
+            self._checked = now
+        return self
+
+    def _entry(self, pos: Tuple[str, int]) -> Optional[EchoEntry]:
+        e = self.entries.get(pos)
+        if e is None:
+            try:
+                data = self.log.get(*pos)
+            except Exception:
+                return None  # compacted away or corrupt line
+            e = EchoEntry(f"{pos[0]}.ndjson#{pos[1]}", data.get("timestamp"), data.get("fingerprint_sha256"),
+                          data.get("summary", {}), f'W/"{fingerprint(data)}"')
+            self.entries[pos] = e
+            if len(self.entries) > ENTRY_CACHE:
+                self.entries.popitem(last=False)
+            if self.tail and pos == self.tail[-1]:
+                self._latest = (pos, data)  # saves a second read for /latest
+        return e
+
+    def latest(self) -> Optional[EchoEntry]:
+        """Newest readable pulse's entry; served from memory once cached."""
+        self.refresh()
+        for pos in reversed(self.tail):
+            e = self._entry(pos)
+            if e is not None:
+                return e
+        return None
+
+    def latest_document(self) -> Optional[tuple]:
+        """(entry, parsed pulse) for the newest pulse; the document is kept for the latest only."""
+        self.refresh()
+        for pos in reversed(self.tail):
+            e = self._entry(pos)
+            if e is None:
+                continue
+            cached = self._latest
+            if cached is None or cached[0] != pos:
+                cached = self._latest = (pos, self.log.get(*pos))
+            return e, cached[1]
+        return None
+
+    def newest(self, limit: int) -> List[EchoEntry]:
+        """Up to `limit` newest readable entries, oldest first."""
+        self.refresh()
+        out = []
+        for pos in self.tail[-limit:]:
+            e = self._entry(pos)
+            if e is not None:
+                out.append(e)
+        return out
+
+_indexes: Dict[Path, EchoIndex] = {}
+_indexes_lock = threading.Lock()
+
+def echo_index(directory: Path) -> EchoIndex:
+    with _indexes_lock:
+        idx = _indexes.get(directory)
+        if idx is None:
+            idx = _indexes[directory] = EchoIndex(directory, CHECK_SEC)
+    return idx
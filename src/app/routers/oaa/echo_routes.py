@@ -1,16 +1,21 @@
 # oaa_echo_routes.py
 from __future__ import annotations
-import os, json, hashlib, time
+import os, time, json, base64
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Header, Response, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from .echo_index import echo_index
+from ...utils.echo_log import SegmentedLog, record_ts
+
 # ---------- Config ----------
 ECHO_LOG_DIR = Path(os.getenv("ECHO_LOG_DIR", "./echo_logs")).resolve()
 OAA_BEARER   = os.getenv("OAA_BEARER", "")  # optional; if set, GET endpoints can require it
+RANGE_LIMIT_MAX = int(os.getenv("ECHO_RANGE_LIMIT_MAX", "10000"))
+RANGE_CHUNK = 256  # records per streamed chunk
 
 router = APIRouter(prefix="/echo", tags=["oaa-echo"])
 
@@ -39,41 +44,72 @@ class EchoPulseIngest(BaseModel):
     payload: dict
 
 # ---------- Utilities ----------
-def _list_echo_files(limit: int = 50) -> List[Path]:
-    if not ECHO_LOG_DIR.exists():
-        return []
-    files = [p for p in ECHO_LOG_DIR.glob("echo_*.json") if p.is_file()]
-    files.sort()  # lexicographic sort works because filenames are timestamp-prefixed
-    return files[-limit:]
+def _index():
+    return echo_index(ECHO_LOG_DIR)
+
+def import_legacy_pulses():
+    """Fold legacy echo_*.json files in ECHO_LOG_DIR into the log; run from app startup (blocking)."""
+    try:
+        written, skipped = SegmentedLog(ECHO_LOG_DIR, "echo").import_legacy()
+    except OSError as e:
+        print(f"⚠️  Legacy echo import skipped: {e}")  # read-only or missing directory
+        return
+    if written or skipped:
+        print(f"✅ Imported {written} legacy echo pulse(s); {len(skipped)} unreadable")
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not isinstance(if_none_match, str):
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or etag[2:] in tags  # weak comparison
 
-def _read_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+def _parse_time(value: Optional[str], name: str) -> Optional[float]:
+    """Epoch seconds or ISO-8601 (naive means UTC)."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    ts = record_ts({"timestamp": value}, default=float("nan"))
+    if ts != ts:
+        raise HTTPException(status_code=400, detail=f"Bad '{name}': expected epoch seconds or ISO-8601")
+    return ts
 
-def _fingerprint(obj: dict) -> str:
-    s = json.dumps(obj, sort_keys=True)
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+def _encode_cursor(pos) -> str:
+    raw = json.dumps(list(pos), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        name, i = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(name), int(i)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Bad cursor")
 
 # ---------- Routes ----------
 @router.get("/latest", response_model=EchoPulse)
 def get_latest_echo_pulse(
     response: Response,
-    if_none_match: Optional[str] = Header(default=None, convert_underscores=False),
+    if_none_match: Optional[str] = Header(default=None),
     _: None = Depends(require_bearer)
 ):
-    files = _list_echo_files(limit=1)
-    if not files:
+    idx = _index()
+    entry = idx.latest()
+    if entry is None:
         raise HTTPException(status_code=404, detail="No echo pulses found")
 
-    data = _read_json(files[-1])
-    etag = f"W/\"{_fingerprint(data)}\""
+    # Basic HTTP caching support: answered from the index, no disk read
+    if _etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers={"ETag": entry.etag, "Cache-Control": "public, max-age=30"})
 
-    # Basic HTTP caching support
-    if if_none_match and if_none_match == etag:
-        response.status_code = status.HTTP_304_NOT_MODIFIED
-        return JSONResponse(status_code=304, content=None, headers={"ETag": etag})
+    found = idx.latest_document()
+    if found is None:
+        raise HTTPException(status_code=404, detail="No echo pulses found")
+    entry, data = found
 
     # Attach ETag and a small cache hint
-    response.headers["ETag"] = etag
+    response.headers["ETag"] = entry.etag
     response.headers["Cache-Control"] = "public, max-age=30"
     return data
 
@@ -83,22 +119,45 @@ def list_echo_pulses(
     _: None = Depends(require_bearer)
 ):
     limit = max(1, min(limit, 100))
-    files = _list_echo_files(limit=limit)
-    items = []
-    for p in files:
-        try:
-            data = _read_json(p)
-            items.append({
-                "file": p.name,
-                "timestamp": data.get("timestamp"),
-                "fingerprint_sha256": data.get("fingerprint_sha256"),
-                "summary": data.get("summary", {}),
-            })
-        except Exception:
-            # Skip unreadable entries
-            continue
+    # unreadable entries are skipped
+    items = [e.item() for e in _index().newest(limit)]
     return {"count": len(items), "items": items}
 
+@router.get("/range")
+def echo_pulses_in_range(
+    from_: Optional[str] = Query(default=None, alias="from"),
+    to: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 1000,
+    _: None = Depends(require_bearer)
+):
+    """
+    Stream pulses with from <= timestamp < to as NDJSON, oldest first.
+    from/to take epoch seconds or ISO-8601; both are optional. The start is
+    found by binary search over the segment indexes, so cost is bounded by
+    the records returned. When more than `limit` match, X-Next-Cursor holds
+    the cursor for the next page (pass it back with the same `to`).
+    Segments rolled into gzip archives by compaction are not searched;
+    X-Echo-Oldest gives the oldest timestamp still online.
+    """
+    limit = max(1, min(limit, RANGE_LIMIT_MAX))
+    start_ts, until = _parse_time(from_, "from"), _parse_time(to, "to")
+    log = _index().log
+    start = _decode_cursor(cursor) if cursor else log.seek(start_ts if start_ts is not None else float("-inf"))
+    positions, nxt = log.scan(start, until, limit) if start else ([], None)
+
+    def body():
+        for k in range(0, len(positions), RANGE_CHUNK):
+            yield b"".join(log.read(name, i) + b"\n" for name, i in positions[k:k + RANGE_CHUNK])
+
+    headers = {"X-Record-Count": str(len(positions))}
+    if nxt:
+        headers["X-Next-Cursor"] = _encode_cursor(nxt)
+    oldest = log.oldest_ts()
+    if oldest is not None:
+        headers["X-Echo-Oldest"] = str(oldest)
+    return StreamingResponse(body(), media_type="application/x-ndjson", headers=headers)
+
 @router.get("/health")
 def echo_api_health():
     # Lightweight route so your Sentinel can check this module specifically
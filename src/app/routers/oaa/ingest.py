@@ -0,0 +1,185 @@
+# app/routers/oaa/ingest.py
+# Streaming snapshot ingestion: parse a remote JSON array incrementally and
+# score/store it in fixed-size chunks, so peak memory is bounded by the chunk
+# size rather than the catalog size.
+import asyncio, codecs, json, os, time, uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from ...utils.http_clients import CLIENTS, http_client
+from .models import IngestJob, Source
+from .policy import Policy, apply_policy
+from .scoring import score_sources_batch
+from .store import upsert_sources
+
+INGEST_CHUNK = int(os.getenv("OAA_INGEST_CHUNK", "1000"))
+INGEST_TIMEOUT = float(os.getenv("OAA_INGEST_TIMEOUT_SEC", "30"))
+CLIENTS.register("ingest", timeout=INGEST_TIMEOUT)
+MAX_ITEM_CHARS = 8 * 1024 * 1024  # one array element may not exceed this
+JOBS_KEEP = 100
+
+JOBS: Dict[str, IngestJob] = {}
+_tasks: set = set()
+
+class SnapshotFormatError(ValueError):
+    pass
+
+# ---------- Incremental JSON array parser ----------
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Yield the elements of a top-level JSON array as bytes arrive."""
+    dec = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf, pos = "", 0
+    started = done = False
+    expect_item = True  # False right after an element: a ',' or ']' must follow
+
+    def skip_ws(i: int) -> int:
+        while i < len(buf) and buf[i] in " \t\r\n":
+            i += 1
+        return i
+
+    async def more() -> bool:
+        nonlocal buf, pos
+        async for chunk in chunks:
+            buf = buf[pos:] + utf8.decode(chunk)
+            pos = 0
+            return True
+        buf = buf[pos:] + utf8.decode(b"", final=True)
+        pos = 0
+        return False
+
+    eof = not await more()
+    while not done:
+        pos = skip_ws(pos)
+        if pos >= len(buf):
+            if eof:
+                raise SnapshotFormatError("unexpected end of snapshot")
+            eof = not await more()
+            continue
+
+        ch = buf[pos]
+        if not started:
+            if ch != "[":
+                raise SnapshotFormatError("snapshot must be a JSON array")
+            started, pos = True, pos + 1
+        elif ch == "]":
+            done = True
+        elif not expect_item:
+            if ch != ",":
+                raise SnapshotFormatError(f"expected ',' or ']' at offset {pos}")
+            expect_item, pos = True, pos + 1
+        else:
+            try:
+                item, end = dec.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise SnapshotFormatError(f"malformed element at offset {pos}")
+                if len(buf) - pos > MAX_ITEM_CHARS:
+                    raise SnapshotFormatError("snapshot element too large")
+                eof = not await more()
+                continue
+            # a scalar ending exactly at the buffer edge may still be cut short
+            if end == len(buf) and not eof:
+                eof = not await more()
+                continue
+            pos, expect_item = end, False
+            yield item
+
+# ---------- Normalization / chunk processing ----------
+def normalize_item(item: Any) -> Optional[Source]:
+    """Coerce a catalog entry into a Source; None if it cannot be used."""
+    try:
+        # basic normalization
+        item.setdefault("id", item.get("id") or item.get("name","").lower().replace(" ","-"))
+        # coerce last_update if present
+        if "last_update" in item and isinstance(item["last_update"], str):
+            try:
+                item["last_update"] = datetime.fromisoformat(item["last_update"].replace("Z",""))
+            except:
+                item.pop("last_update", None)
+        return Source(**item)
+    except Exception:
+        return None
+
+def process_chunk(pol: Policy, sources: List[Source]) -> List[Dict[str, Any]]:
+    """Score, gate and store one chunk; returns the per-source results."""
+    results = []
+    scored = []
+    for s, sc in zip(sources, score_sources_batch(sources)):
+        sc, reasons = apply_policy(pol, s, sc)
+        scored.append((s, sc))
+        results.append({"id": s.id, "composite": sc.composite, "gate": sc.policy_gate, "reasons": reasons})
+    upsert_sources(scored)
+    return results
+
+async def ingest_url(url: str, job: IngestJob, collect: Optional[List[Dict[str, Any]]] = None) -> IngestJob:
+    """
+    Stream `url` through the chunked pipeline, updating `job` as it goes.
+    While chunk k is scored and written on a worker thread, chunk k+1 is
+    downloaded and parsed, so at most two chunks are held at once.
+    """
+    pol = Policy.load()
+    job.status = "running"
+    pending: Optional[asyncio.Future] = None
+
+    async def flush(batch: List[Source]):
+        nonlocal pending
+        if pending:
+            await finish(pending)
+        pending = asyncio.ensure_future(asyncio.to_thread(process_chunk, pol, batch))
+
+    async def finish(fut: asyncio.Future):
+        results = await fut
+        job.added += len(results)
+        job.chunks += 1
+        if collect is not None:
+            collect.extend(results)
+
+    try:
+        async with http_client("ingest").stream("GET", url) as r:
+            r.raise_for_status()
+            batch: List[Source] = []
+            async for item in iter_json_array(r.aiter_bytes()):
+                job.received += 1
+                s = normalize_item(item)
+                if s is None:
+                    job.skipped += 1
+                    continue
+                batch.append(s)
+                if len(batch) >= INGEST_CHUNK:
+                    await flush(batch)
+                    batch = []
+            if batch:
+                await flush(batch)
+            if pending:
+                await finish(pending)
+                pending = None
+        job.status = "done"
+    except Exception as e:
+        if pending:
+            try:
+                await finish(pending)
+            except Exception:
+                pass
+        job.status = "failed"
+        job.error = str(e) or e.__class__.__name__
+    finally:
+        job.finished = time.time()
+    return job
+
+# ---------- Jobs ----------
+def new_job(url: str) -> IngestJob:
+    job = IngestJob(job_id=uuid.uuid4().hex, url=url, started=time.time())
+    JOBS[job.job_id] = job
+    # keep only the most recent jobs
+    while len(JOBS) > JOBS_KEEP:
+        JOBS.pop(next(iter(JOBS)))
+    return job
+
+def start_job(url: str) -> IngestJob:
+    """Run ingest_url in the background; poll JOBS[job_id] for progress."""
+    job = new_job(url)
+    task = asyncio.create_task(ingest_url(url, job))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
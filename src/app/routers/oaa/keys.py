@@ -1,8 +1,11 @@
 # app/routers/oaa/keys.py
-import base64, os, time, json
-from typing import List, Dict
+import base64, os, time, json, hashlib, threading
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
+KEYS_FILE = Path("data/keys.json")
+_ENV_VARS = ("OAA_ED25519_PUBLIC_B64", "OAA_SIGNING_VERSION", "OAA_SIGNING_CREATED", "OAA_ISSUER")
+
 def _kid_from_pub(b64_pub: str) -> str:
     # short key ID based on first 8 bytes
     raw = base64.b64decode(b64_pub)
@@ -25,43 +28,112 @@ def current_key_entry() -> Dict:
         "issuer": os.getenv("OAA_ISSUER","oaa.lab7"),
     }
 
-def load_key_history() -> List[Dict]:
-    """Load archived keys from data/keys.json"""
-    keys_file = Path("data/keys.json")
-    if not keys_file.exists():
+def _read_key_history(path: Path) -> List[Dict]:
+    if not path.exists():
         return []
     try:
-        return json.loads(keys_file.read_text())
+        return json.loads(path.read_text())
     except json.JSONDecodeError:
         return []
 
+class KeysetService:
+    """
+    Current env key + archived keys from data/keys.json, parsed once and
+    reloaded only when the file's mtime/size or the key env vars change.
+    Keys are indexed by kid and by public key, and the well-known document
+    is pre-serialized with its ETag.
+    """
+
+    def __init__(self, path: Path = KEYS_FILE):
+        self.path = path
+        self._stamp: Optional[Tuple] = None
+        self._lock = threading.Lock()
+        self.current: Dict = {}
+        self.history: List[Dict] = []
+        # (key, source, history_index) in verification order: current first
+        self.entries: List[Tuple[Dict, str, Optional[int]]] = []
+        self.by_kid: Dict[str, List[Tuple[Dict, str, Optional[int]]]] = {}
+        self.by_x: Dict[str, Dict] = {}
+        self.doc: Dict = {}
+        self.body: bytes = b""
+        self.etag: str = ""
+
+    def _current_stamp(self) -> Tuple:
+        try:
+            st = self.path.stat()
+            fstamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            fstamp = None
+        return fstamp, tuple(os.getenv(k, "") for k in _ENV_VARS)
+
+    def refresh(self) -> "KeysetService":
+        stamp = self._current_stamp()
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._load(stamp)
+        return self
+
+    def _load(self, stamp: Tuple) -> None:
+        cur = current_key_entry()
+        hist = _read_key_history(self.path)
+
+        # Combine current and history, ensuring no duplicates
+        keys: List[Dict] = []
+        entries: List[Tuple[Dict, str, Optional[int]]] = []
+        by_x: Dict[str, Dict] = {}
+        if cur:
+            keys.append(cur)
+            entries.append((cur, "current", None))
+            by_x[cur["x"]] = cur
+        for i, key in enumerate(hist):
+            key_x = key.get("x", "")
+            if key_x and key_x not in by_x:
+                keys.append(key)
+                entries.append((key, "history", i))
+                by_x[key_x] = key
+
+        by_kid: Dict[str, List[Tuple[Dict, str, Optional[int]]]] = {}
+        for e in entries:
+            if e[0].get("kid"):
+                by_kid.setdefault(e[0]["kid"], []).append(e)
+
+        doc = {
+            "issuer": os.getenv("OAA_ISSUER","oaa.lab7"),
+            "updated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "keys": keys
+        }
+        body = json.dumps(doc, separators=(",", ":")).encode("utf-8")
+        # Weak ETag over the key material only, so every worker agrees on it
+        # even though "updated" is per-process load time
+        tag = hashlib.sha256(json.dumps([doc["issuer"], keys], sort_keys=True).encode("utf-8")).hexdigest()
+
+        # Swap in the rebuilt indexes
+        self.current, self.history, self.entries = cur, hist, entries
+        self.by_kid, self.by_x = by_kid, by_x
+        self.doc, self.body = doc, body
+        self.etag = f'W/"{tag[:32]}"'
+        self._stamp = stamp
+
+    def candidates(self, kid: Optional[str] = None) -> List[Tuple[Dict, str, Optional[int]]]:
+        """Keys to try for a signature: just the kid's key(s) when known, else all."""
+        self.refresh()
+        if kid and kid in self.by_kid:
+            return self.by_kid[kid]
+        return self.entries
+
+_service = KeysetService()
+
+def keyset_service() -> KeysetService:
+    return _service.refresh()
+
+def load_key_history() -> List[Dict]:
+    """Load archived keys from data/keys.json"""
+    return keyset_service().history
+
 def legacy_keys() -> List[Dict]:
     # Load from data/keys.json instead of env vars
     return load_key_history()
 
 def keyset() -> Dict:
-    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-    cur = current_key_entry()
-    hist = load_key_history()
-    
-    # Combine current and history, ensuring no duplicates
-    keys = []
-    seen = set()
-    
-    # Add current key first
-    if cur:
-        keys.append(cur)
-        seen.add(cur.get("x", ""))
-    
-    # Add historical keys
-    for key in hist:
-        key_x = key.get("x", "")
-        if key_x and key_x not in seen:
-            keys.append(key)
-            seen.add(key_x)
-    
-    return {
-        "issuer": os.getenv("OAA_ISSUER","oaa.lab7"),
-        "updated": now,
-        "keys": keys
-    }
+    return keyset_service().doc
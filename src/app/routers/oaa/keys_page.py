@@ -1,23 +1,19 @@
 # app/routers/oaa/keys_page.py
 from fastapi import APIRouter, Request
 from fastapi.templating import Jinja2Templates
-import os, json, pathlib, datetime
+import os, datetime
 from typing import Any, Dict, List
 
+from .keys import keyset_service
+
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
-KEYS_FILE = pathlib.Path("data/keys.json")
 
 def _now_iso() -> str:
     return datetime.datetime.utcnow().isoformat() + "Z"
 
 def _load_history() -> List[Dict[str, Any]]:
-    if not KEYS_FILE.exists():
-        return []
-    try:
-        return json.loads(KEYS_FILE.read_text())
-    except json.JSONDecodeError:
-        return []
+    return keyset_service().history
 
 def _current_key() -> Dict[str, Any]:
     return {
@@ -0,0 +1,107 @@
+# app/routers/oaa/merkle.py
+# Merkle tree over per-source leaf hashes (sorted by source_id).
+#   leaf = sha256(0x00 || canonical_json(item))
+#   node = sha256(0x01 || left || right)
+# An odd node at the end of a level is promoted to the next level unchanged.
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from ...crypto.ed25519 import canonical_bytes
+
+EMPTY_ROOT = hashlib.sha256(b"").hexdigest()
+
+def leaf_hash(item: Dict[str, Any]) -> str:
+    return hashlib.sha256(b"\x00" + canonical_bytes(item)).hexdigest()
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def verify_proof(leaf_hex: str, proof: List[Dict[str, str]], root_hex: str) -> bool:
+    """Fold an inclusion proof from the leaf up and compare with the root."""
+    h = bytes.fromhex(leaf_hex)
+    for step in proof:
+        sib = bytes.fromhex(step["hash"])
+        h = _node(sib, h) if step["side"] == "left" else _node(h, sib)
+    return h.hex() == root_hex
+
+class MerkleTree:
+    """
+    Updating an existing key rehashes one leaf-to-root path (O(log n)).
+    Adding or removing keys changes leaf positions, so the internal levels
+    are rebuilt lazily on the next root()/proof() call (O(n) hashes, no
+    re-serialization of sources).
+    """
+
+    def __init__(self, leaves: Optional[Dict[str, str]] = None):
+        self._leaves: Dict[str, bytes] = {k: bytes.fromhex(v) for k, v in (leaves or {}).items()}
+        self._keys: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._levels: Optional[List[List[bytes]]] = None
+
+    def __len__(self) -> int:
+        return len(self._leaves)
+
+    def leaves(self) -> Dict[str, str]:
+        return {k: v.hex() for k, v in self._leaves.items()}
+
+    def set(self, key: str, leaf_hex: str):
+        leaf = bytes.fromhex(leaf_hex)
+        known = key in self._leaves
+        self._leaves[key] = leaf
+        if not known:
+            self._levels = None
+        elif self._levels is not None:
+            self._update_path(self._index[key], leaf)
+
+    def delete(self, key: str):
+        if self._leaves.pop(key, None) is not None:
+            self._levels = None
+
+    def _build(self) -> List[List[bytes]]:
+        self._keys = sorted(self._leaves)
+        self._index = {k: i for i, k in enumerate(self._keys)}
+        level = [self._leaves[k] for k in self._keys]
+        levels = [level]
+        while len(level) > 1:
+            nxt = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                nxt.append(level[-1])
+            levels.append(nxt)
+            level = nxt
+        self._levels = levels
+        return levels
+
+    def _update_path(self, i: int, leaf: bytes):
+        levels = self._levels
+        levels[0][i] = leaf
+        for d in range(len(levels) - 1):
+            lvl = levels[d]
+            sib = i ^ 1
+            if sib >= len(lvl):
+                h = lvl[i]  # promoted odd node
+            elif i % 2:
+                h = _node(lvl[sib], lvl[i])
+            else:
+                h = _node(lvl[i], lvl[sib])
+            i //= 2
+            levels[d + 1][i] = h
+
+    def root(self) -> str:
+        if not self._leaves:
+            return EMPTY_ROOT
+        levels = self._levels if self._levels is not None else self._build()
+        return levels[-1][0].hex()
+
+    def proof(self, key: str) -> Optional[Dict[str, Any]]:
+        """Sibling path from the key's leaf to the root, or None if unknown."""
+        if key not in self._leaves:
+            return None
+        levels = self._levels if self._levels is not None else self._build()
+        i = idx = self._index[key]
+        path = []
+        for lvl in levels[:-1]:
+            sib = i ^ 1
+            if sib < len(lvl):
+                path.append({"side": "left" if i % 2 else "right", "hash": lvl[sib].hex()})
+            i //= 2
+        return {"index": idx, "leaf_hash": levels[0][idx].hex(), "proof": path, "root": levels[-1][0].hex()}
@@ -65,3 +65,25 @@ class VerifyResponse(BaseModel):
     signer_known: Optional[bool] = None
     ts_ok: Optional[bool] = None
     nonce_ok: Optional[bool] = None
+    nonce_seen: Optional[bool] = None  # read-only checks (/verify/batch, /verify/audit)
+
+class VerifyBatchRequest(BaseModel):
+    attestations: List[Dict[str, Any]]
+
+class VerifyBatchResponse(BaseModel):
+    ok: bool                      # True only if every attestation verified
+    count: int
+    verified: int
+    results: List[VerifyResponse] # same order as the request
+
+class IngestJob(BaseModel):
+    job_id: str
+    url: str
+    status: Literal["queued","running","done","failed"] = "queued"
+    received: int = 0             # array elements parsed so far
+    added: int = 0                # scored and written to the store
+    skipped: int = 0              # elements that failed normalization
+    chunks: int = 0
+    started: float
+    finished: Optional[float] = None
+    error: Optional[str] = None
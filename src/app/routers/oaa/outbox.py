@@ -0,0 +1,285 @@
+# app/routers/oaa/outbox.py
+# Durable ledger outbox: signed attestations are committed to a local SQLite
+# file first and POSTed to LEDGER_URL/attest by a background worker, in
+# batches, over the shared "ledger" connection pool, with exponential backoff.
+# Delivery is at-least-once: a worker that dies mid-batch leaves its rows
+# leased, and they are retried once the lease expires.
+import asyncio, json, os, random, sqlite3, threading, time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from ...utils.http_clients import CLIENTS, http_client
+
+OUTBOX_PATH = os.getenv("OAA_OUTBOX_PATH", "data/oaa_outbox.sqlite3")
+OUTBOX_BATCH = int(os.getenv("OAA_OUTBOX_BATCH", "50"))
+OUTBOX_CONCURRENCY = int(os.getenv("OAA_OUTBOX_CONCURRENCY", "8"))
+OUTBOX_POLL_SEC = float(os.getenv("OAA_OUTBOX_POLL_SEC", "5"))
+OUTBOX_LEASE_SEC = float(os.getenv("OAA_OUTBOX_LEASE_SEC", "60"))
+OUTBOX_BACKOFF_SEC = float(os.getenv("OAA_OUTBOX_BACKOFF_SEC", "2"))
+OUTBOX_BACKOFF_MAX_SEC = float(os.getenv("OAA_OUTBOX_BACKOFF_MAX_SEC", "300"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OAA_OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_KEEP_SENT_SEC = float(os.getenv("OAA_OUTBOX_KEEP_SENT_SEC", "86400"))
+LEDGER_TIMEOUT = float(os.getenv("OAA_LEDGER_TIMEOUT_SEC", "15"))
+CLIENTS.register("ledger", timeout=LEDGER_TIMEOUT)
+
+def backoff(attempts: int) -> float:
+    """Delay before retry number `attempts` (1-based): exponential, capped, with jitter."""
+    delay = min(OUTBOX_BACKOFF_MAX_SEC, OUTBOX_BACKOFF_SEC * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+class Outbox:
+    """
+    Rows move pending -> sent (or -> dead after OUTBOX_MAX_ATTEMPTS / a
+    permanent 4xx). claim() leases rows so several workers can drain the same
+    file without sending an entry twice.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS outbox (
+        seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind        TEXT NOT NULL,
+        body        TEXT NOT NULL,
+        status      TEXT NOT NULL DEFAULT 'pending',
+        attempts    INTEGER NOT NULL DEFAULT 0,
+        created     REAL NOT NULL,
+        next_at     REAL NOT NULL,
+        lease_until REAL NOT NULL DEFAULT 0,
+        last_error  TEXT,
+        receipt     TEXT,
+        sent_at     REAL
+    );
+    CREATE INDEX IF NOT EXISTS outbox_due_idx ON outbox(status, next_at);
+    """
+
+    def __init__(self, path: str = OUTBOX_PATH):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript(self.SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")  # an acknowledged enqueue must survive power loss
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, kind: str, attestation: Dict[str, Any]) -> int:
+        now = time.time()
+        with self._write() as conn:
+            return conn.execute(
+                "INSERT INTO outbox(kind, body, created, next_at) VALUES (?,?,?,?)",
+                (kind, json.dumps(attestation), now, now),
+            ).lastrowid
+
+    def claim(self, limit: int = OUTBOX_BATCH, now: Optional[float] = None) -> List[Tuple[int, Dict[str, Any], int]]:
+        """Lease up to `limit` due entries; returns (seq, attestation, attempts)."""
+        now = time.time() if now is None else now
+        with self._write() as conn:
+            rows = conn.execute(
+                "SELECT seq, body, attempts FROM outbox WHERE status = 'pending' AND next_at <= ? "
+                "AND lease_until <= ? ORDER BY seq LIMIT ?", (now, now, limit)
+            ).fetchall()
+            conn.executemany("UPDATE outbox SET lease_until = ? WHERE seq = ?",
+                             [(now + OUTBOX_LEASE_SEC, r[0]) for r in rows])
+        return [(seq, json.loads(body), attempts) for seq, body, attempts in rows]
+
+    def mark_sent(self, results: List[Tuple[int, Any]]):
+        now = time.time()
+        with self._write() as conn:
+            conn.executemany(
+                "UPDATE outbox SET status = 'sent', receipt = ?, sent_at = ?, attempts = attempts + 1, "
+                "lease_until = 0, last_error = NULL WHERE seq = ?",
+                [(json.dumps(receipt), now, seq) for seq, receipt in results],
+            )
+
+    def mark_failed(self, failures: List[Tuple[int, int, str, bool]]) -> List[int]:
+        """failures: (seq, attempts_so_far, error, retryable). Returns the seqs that went dead."""
+        now = time.time()
+        rows = []
+        for seq, attempts, error, retryable in failures:
+            attempts += 1
+            dead = not retryable or attempts >= OUTBOX_MAX_ATTEMPTS
+            rows.append(("dead" if dead else "pending", attempts, now + backoff(attempts), error, seq))
+        with self._write() as conn:
+            conn.executemany(
+                "UPDATE outbox SET status = ?, attempts = ?, next_at = ?, last_error = ?, lease_until = 0 WHERE seq = ?",
+                rows,
+            )
+        return [seq for status, _, _, _, seq in rows if status == "dead"]
+
+    def prune(self, keep_sec: float = OUTBOX_KEEP_SENT_SEC) -> int:
+        with self._write() as conn:
+            return conn.execute("DELETE FROM outbox WHERE status = 'sent' AND sent_at < ?",
+                                (time.time() - keep_sec,)).rowcount
+
+    def get(self, seq: int) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT seq, kind, status, attempts, created, next_at, last_error, receipt, sent_at FROM outbox WHERE seq = ?",
+            (seq,),
+        ).fetchone()
+        if not row:
+            return None
+        out = dict(zip(("id", "kind", "status", "attempts", "created", "next_at", "last_error", "receipt", "sent_at"), row))
+        out["receipt"] = json.loads(out["receipt"]) if out["receipt"] else None
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        oldest = conn.execute("SELECT MIN(created) FROM outbox WHERE status = 'pending'").fetchone()[0]
+        return {
+            "pending": counts.get("pending", 0),
+            "sent": counts.get("sent", 0),
+            "dead": counts.get("dead", 0),
+            "oldest_pending_age_sec": round(time.time() - oldest, 3) if oldest else None,
+        }
+
+_outbox: Optional[Outbox] = None
+_outbox_lock = threading.Lock()
+
+def outbox() -> Outbox:
+    # opened on first use so importing the router never creates the file
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                _outbox = Outbox()
+    return _outbox
+
+# ---------- Delivery ----------
+_settled_hooks: List[Callable[[Dict[str, Any], bool], None]] = []
+
+def on_settled(fn: Callable[[Dict[str, Any], bool], None]):
+    """Register fn(attestation, delivered); called in a worker thread once an
+    entry is sent (True) or dead-lettered (False)."""
+    _settled_hooks.append(fn)
+
+def _settle(entries: List[Tuple[Dict[str, Any], bool]]):
+    for att, delivered in entries:
+        for fn in _settled_hooks:
+            try:
+                fn(att, delivered)
+            except Exception:
+                pass  # a hook must not stall delivery; its entry is already settled
+
+def ledger_url() -> str:
+    return os.getenv("LEDGER_URL", "").rstrip("/")
+
+def _retryable(e: Exception) -> bool:
+    if isinstance(e, httpx.HTTPStatusError):
+        code = e.response.status_code
+        return code >= 500 or code in (408, 425, 429)
+    return True  # transport errors, timeouts, bad JSON
+
+class OutboxWorker:
+    """Background task draining the outbox; started and stopped by the app lifespan.
+    Requests go through the shared "ledger" client pool (HTTP_LEDGER_* env)."""
+
+    def __init__(self, box_factory=outbox):
+        self._box_factory = box_factory
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self):
+        """Wake the drain loop early (safe to call from any thread)."""
+        if self._loop and self._wake and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self):
+        box = await asyncio.to_thread(self._box_factory)
+        last_prune = 0.0
+        while True:
+            try:
+                sent = await self.drain_once(box)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                sent = 0  # e.g. database locked; try again next tick
+            if time.time() - last_prune > 3600:
+                last_prune = time.time()
+                await asyncio.to_thread(box.prune)
+            if not sent:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), OUTBOX_POLL_SEC)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    async def drain_once(self, box: Outbox, client: Optional[httpx.AsyncClient] = None) -> int:
+        """Send one claimed batch; returns how many entries were attempted."""
+        url = ledger_url()
+        if not url:
+            return 0
+        batch = await asyncio.to_thread(box.claim, OUTBOX_BATCH)
+        if not batch:
+            return 0
+        client = client or http_client("ledger")
+        sem = asyncio.Semaphore(OUTBOX_CONCURRENCY)
+
+        async def send(att: Dict[str, Any]):
+            async with sem:
+                r = await client.post(f"{url}/attest", json=att)
+                r.raise_for_status()
+                return r.json()
+
+        results = await asyncio.gather(*(send(att) for _, att, _ in batch), return_exceptions=True)
+        ok, failed = [], []
+        for (seq, _, attempts), res in zip(batch, results):
+            if isinstance(res, Exception):
+                failed.append((seq, attempts, str(res) or res.__class__.__name__, _retryable(res)))
+            else:
+                ok.append((seq, res))
+        dead = []
+        if ok:
+            await asyncio.to_thread(box.mark_sent, ok)
+        if failed:
+            dead = await asyncio.to_thread(box.mark_failed, failed)
+        if _settled_hooks and (ok or dead):
+            atts = {seq: att for seq, att, _ in batch}
+            await asyncio.to_thread(_settle, [(atts[seq], True) for seq, _ in ok] + [(atts[seq], False) for seq in dead])
+        return len(batch)
+
+WORKER = OutboxWorker()
+
+def enqueue_attestation(kind: str, attestation: Dict[str, Any]) -> int:
+    seq = outbox().enqueue(kind, attestation)
+    WORKER.notify()
+    return seq
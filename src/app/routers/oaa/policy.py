@@ -1,21 +1,51 @@
+import builtins, threading
 import yaml
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from types import CodeType
+from typing import Dict, Any, List, Optional, Tuple
 from .models import Source, SourceScore
 
 DEFAULT_PATH = Path(__file__).with_name("default_policy.yaml")
 
+EFFECT_ORDER = {"deny": 0, "review": 1, "pass": 2}
+_EVAL_GLOBALS: Dict[str, Any] = {"__builtins__": builtins}
+
 class Policy:
+    _cache: Dict[Path, Tuple[Tuple[int, int], "Policy"]] = {}
+    _lock = threading.Lock()
+
     def __init__(self, spec: Dict[str, Any]):
         self.spec = spec
         self.rules = spec.get("rules", [])
         self.default_effect = spec.get("defaults","review")
+        # (id, effect, compiled `when` or None if it does not compile)
+        self.compiled: List[Tuple[str, str, Optional[CodeType]]] = []
+        for r in self.rules:
+            rid = r.get("id","rule")
+            try:
+                code = compile(r.get("when",""), f"<policy:{rid}>", "eval")
+            except (SyntaxError, ValueError, TypeError):
+                code = None  # reported as "<id>:error" on every eval, as before
+            self.compiled.append((rid, r.get("effect","review"), code))
 
     @classmethod
     def load(cls, p: Path|None = None) -> "Policy":
+        """Parse + compile once per file; reloads when the file's mtime/size change."""
         path = p or DEFAULT_PATH
-        data = yaml.safe_load(path.read_text(encoding="utf-8"))
-        return cls(data)
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        hit = cls._cache.get(path)
+        if hit and hit[0] == stamp:
+            return hit[1]
+        with cls._lock:
+            hit = cls._cache.get(path)
+            if hit and hit[0] == stamp:
+                return hit[1]
+            data = yaml.safe_load(path.read_text(encoding="utf-8"))
+            pol = cls(data)
+            cls._cache[path] = (stamp, pol)
+            return pol
 
     def eval(self, src: Source, score: SourceScore) -> Tuple[str, List[str]]:
         """
@@ -23,7 +53,6 @@ class Policy:
         effect in {"pass","deny","review"}
         """
         reasons: List[str] = []
-        effect_order = {"deny": 0, "review": 1, "pass": 2}
         final_effect = self.default_effect
 
         ctx = {
@@ -37,19 +66,18 @@ class Policy:
         }
 
         if src.last_update:
-            from datetime import datetime
             ctx["last_update_days"] = (datetime.utcnow() - src.last_update).days
 
-        for r in self.rules:
-            rid = r.get("id","rule")
-            when = r.get("when","")
-            effect = r.get("effect","review")
+        for rid, effect, code in self.compiled:
+            if code is None:
+                reasons.append(f"{rid}:error")
+                continue
             try:
                 # CAUTION: eval on trusted policy only (your own YAML)
-                if eval(when, {}, ctx):
+                if eval(code, _EVAL_GLOBALS, ctx):
                     reasons.append(f"{rid}:{effect}")
                     # choose the strongest (deny < review < pass)
-                    if effect_order[effect] < effect_order[final_effect]:
+                    if EFFECT_ORDER[effect] < EFFECT_ORDER[final_effect]:
                         final_effect = effect
             except Exception:
                 reasons.append(f"{rid}:error")
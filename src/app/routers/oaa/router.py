@@ -1,17 +1,21 @@
-from fastapi import APIRouter, HTTPException, Header, BackgroundTasks
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Header, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, Callable, Container, Dict, Optional, List, Tuple
 from datetime import datetime
-import httpx
-import os, time, uuid, asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os, time, uuid, asyncio, base64, json, math
 
-from .models import IngestRequest, FilterRequest, FilterResult, Source, SourceScore, ReputeVote, ReputeResult, VerifyRequest, VerifyResponse
+from .models import IngestRequest, FilterRequest, FilterResult, Source, SourceScore, ReputeVote, ReputeResult, VerifyRequest, VerifyResponse, VerifyBatchRequest, VerifyBatchResponse, IngestJob
 from .scoring import score_source
+from .ingest import JOBS, ingest_url, new_job, process_chunk, start_job
 from .policy import Policy, apply_policy
-from .store import upsert_source, list_sources, record_vote, summarize_reputation, votes_count, SOURCES, SCORES
-from .keys import keyset
-from .state import build_state, sign_state, anchor_to_ledger
+from .store import get_source, update_score, list_sources, page_sources, record_vote, summarize_reputation, votes_count
+from .keys import keyset_service
+from ...utils.nonce_store import nonce_guard, nonce_key
+from .outbox import enqueue_attestation, ledger_url, outbox, WORKER as OUTBOX_WORKER
+from .state import ANCHOR_MODES, build_state, build_delta, anchor_state, source_proof
 from .echo_routes import router as echo_router
-from ...crypto.ed25519 import ed25519_sign, ed25519_verify, canonical_json, sha256_hex
+from ...crypto.ed25519 import oaa_signer, ed25519_verify_raw, load_verify_key, canonicalize, sha256_hex
 
 router = APIRouter(prefix="/oaa", tags=["OAA"])
 
@@ -25,45 +29,38 @@ def _require_admin(x_admin_token: Optional[str]):
 async def ingest_snapshot(req: IngestRequest, x_admin_token: Optional[str] = Header(None)):
     _require_admin(x_admin_token)
 
-    sources: List[Source] = []
-
     if req.sources:
-        sources = req.sources
+        pol = Policy.load()
+        results = process_chunk(pol, req.sources)
     elif req.url:
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.get(str(req.url))
-            r.raise_for_status()
-            payload = r.json()
-            # Expecting list[dict] shaped close to Source; normalize
-            for item in payload:
-                try:
-                    # basic normalization
-                    item.setdefault("id", item.get("id") or item.get("name","").lower().replace(" ","-"))
-                    # coerce last_update if present
-                    if "last_update" in item and isinstance(item["last_update"], str):
-                        try:
-                            item["last_update"] = datetime.fromisoformat(item["last_update"].replace("Z",""))
-                        except:
-                            item.pop("last_update", None)
-                    s = Source(**item)
-                    sources.append(s)
-                except Exception:
-                    continue
+        # Expecting list[dict] shaped close to Source; streamed and normalized chunk by chunk
+        results = []
+        job = await ingest_url(str(req.url), new_job(str(req.url)), collect=results)
+        if job.status == "failed":
+            raise HTTPException(status_code=502, detail=f"Snapshot ingest failed: {job.error}")
     else:
         raise HTTPException(status_code=400, detail="Provide url or sources")
 
-    pol = Policy.load()
-    added = 0
-    results = []
-    for s in sources:
-        sc = score_source(s)
-        sc, reasons = apply_policy(pol, s, sc)
-        upsert_source(s, sc)
-        results.append({"id": s.id, "composite": sc.composite, "gate": sc.policy_gate, "reasons": reasons})
-        added += 1
-
     # TODO: anchor snapshot hash to Civic Ledger here
-    return {"ok": True, "added": added, "results": results, "policy": "default_policy.yaml"}
+    return {"ok": True, "added": len(results), "results": results, "policy": "default_policy.yaml"}
+
+@router.post("/ingest/jobs", status_code=202)
+async def start_ingest_job(req: IngestRequest, x_admin_token: Optional[str] = Header(None)):
+    """Stream a remote catalog in the background; poll /oaa/ingest/jobs/{job_id} for progress."""
+    _require_admin(x_admin_token)
+    if not req.url:
+        raise HTTPException(status_code=400, detail="Provide url")
+    job = start_job(str(req.url))
+    return {"ok": True, "job_id": job.job_id, "status_url": f"/oaa/ingest/jobs/{job.job_id}"}
+
+@router.get("/ingest/jobs/{job_id}", response_model=IngestJob)
+def get_ingest_job(job_id: str, x_admin_token: Optional[str] = Header(None)):
+    # jobs are tracked per worker process
+    _require_admin(x_admin_token)
+    job = JOBS.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @router.post("/filter", response_model=FilterResult)
 async def filter_source(req: FilterRequest):
@@ -72,31 +69,75 @@ async def filter_source(req: FilterRequest):
     sc, reasons = apply_policy(pol, req.source, sc)
     return FilterResult(score=sc, reasons=reasons)
 
+SOURCES_PAGE_MAX = 1000
+SOURCES_STREAM_PAGE = 500
+
+def _encode_cursor(src: Source, sc: SourceScore) -> str:
+    raw = json.dumps([sc.composite, src.id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        composite, sid = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(composite), str(sid)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Bad cursor")
+
+def _stream_sources(min_score: float, gate: Optional[str], after: Optional[tuple]):
+    # one store page in memory at a time, however large the catalog is
+    while True:
+        page = page_sources(min_score=min_score, gate=gate, after=after, limit=SOURCES_STREAM_PAGE)
+        for src, sc in page:
+            yield f'{{"source":{src.model_dump_json()},"score":{sc.model_dump_json()}}}\n'
+        if len(page) < SOURCES_STREAM_PAGE:
+            return
+        after = (page[-1][1].composite, page[-1][0].id)
+
 @router.get("/sources")
-def get_sources(min_score: float = 0.0, gate: Optional[str] = None):
-    items = []
-    for src, sc in list_sources(min_score=min_score, gate=gate):
-        items.append({
-            "source": src.model_dump(),
-            "score": sc.model_dump()
-        })
-    return {"count": len(items), "items": items}
+def get_sources(min_score: float = 0.0, gate: Optional[str] = None,
+                limit: Optional[int] = None, cursor: Optional[str] = None,
+                format: str = "json"):
+    """
+    Sources ordered by composite desc, id asc.
+    - limit/cursor: keyset pagination; pass next_cursor back to get the next page
+    - format=ndjson: stream every matching source (from cursor, if given) line by line
+    Without limit/cursor the full list is returned in one body (legacy shape).
+    """
+    after = _decode_cursor(cursor) if cursor else None
+    if format == "ndjson":
+        return StreamingResponse(_stream_sources(min_score, gate, after), media_type="application/x-ndjson")
+
+    if limit is None and after is None:
+        items = []
+        for src, sc in list_sources(min_score=min_score, gate=gate):
+            items.append({
+                "source": src.model_dump(),
+                "score": sc.model_dump()
+            })
+        return {"count": len(items), "items": items}
+
+    limit = max(1, min(limit or 100, SOURCES_PAGE_MAX))
+    page = page_sources(min_score=min_score, gate=gate, after=after, limit=limit)
+    items = [{"source": src.model_dump(), "score": sc.model_dump()} for src, sc in page]
+    next_cursor = _encode_cursor(*page[-1]) if len(page) == limit else None
+    return {"count": len(items), "items": items, "next_cursor": next_cursor}
 
 @router.post("/repute/vote", response_model=ReputeResult)
 async def repute_vote(v: ReputeVote):
-    if v.source_id not in SOURCES:
+    found = get_source(v.source_id)
+    if not found:
         raise HTTPException(status_code=404, detail="Source not found")
+    _, sc = found
 
-    prev_rep = SCORES[v.source_id].scores.get("reputation", 0.7)
+    prev_rep = sc.scores.get("reputation", 0.7)
 
     # Record vote locally
     record_vote(v.source_id, v.model_dump())
 
     # Recompute reputation and update score
     new_rep = summarize_reputation(v.source_id)
-    sc = SCORES[v.source_id]
     sc.scores["reputation"] = round(new_rep, 2)
-    SCORES[v.source_id] = sc
+    update_score(sc)
 
     # --- Build attestation payload ---
     now_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
@@ -116,24 +157,21 @@ async def repute_vote(v: ReputeVote):
     }
 
     attestation = None
-    priv_b64 = os.getenv("OAA_ED25519_PRIVATE_B64", "")
-    pub_b64  = os.getenv("OAA_ED25519_PUBLIC_B64", "")
-    ledger_url = os.getenv("LEDGER_URL", "").rstrip("/")
     try:
-        if priv_b64 and pub_b64:
-            content_hash, sig_b64 = ed25519_sign(priv_b64, att)
+        signer = oaa_signer()
+        if signer:
+            content_hash, sig_b64 = signer.sign(att)
             attestation = {
                 "content": att,
                 "content_hash": f"sha256:{content_hash}",
                 "signature": f"ed25519:{sig_b64}",
-                "public_key_b64": pub_b64,
+                "public_key_b64": signer.public_key_b64,
                 "signing_key": "oaa:ed25519:v1",
             }
-            if ledger_url:
-                async with httpx.AsyncClient(timeout=15) as client:
-                    r = await client.post(f"{ledger_url}/attest", json=attestation)
-                    r.raise_for_status()
-                    attestation["ledger_receipt"] = r.json()
+            if ledger_url():
+                # durable hand-off; the outbox worker POSTs it to the ledger
+                seq = await asyncio.to_thread(enqueue_attestation, "oaa.repute.vote", attestation)
+                attestation["ledger_outbox"] = {"id": seq, "status": "pending"}
     except Exception as e:
         attestation = attestation or {"content": att, "error": str(e)}
 
@@ -145,36 +183,61 @@ async def repute_vote(v: ReputeVote):
     )
 
 @router.get("/.well-known/oaa-keys.json")
-def well_known_keys():
-    return keyset()
+def well_known_keys(if_none_match: Optional[str] = Header(None)):
+    ks = keyset_service()
+    headers = {"ETag": ks.etag, "Cache-Control": "public, max-age=300"}
+    if if_none_match and ks.etag.removeprefix("W/") in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=ks.body, media_type="application/json", headers=headers)
 
 @router.get("/state/snapshot")
-def get_state_snapshot():
-    snap = build_state()
+def get_state_snapshot(full: bool = False):
+    snap = build_state(full=full)
     # Also return hash for quick diffing
     return {"snapshot": snap, "hash": "sha256:" + sha256_hex(snap)}
 
+@router.get("/state/proof/{source_id}")
+def get_state_proof(source_id: str):
+    # Merkle inclusion proof: leaf_hash = sha256(0x00 || canonical(item)), folded up to root
+    p = source_proof(source_id)
+    if not p:
+        raise HTTPException(404, "Source not found")
+    return p
+
+@router.get("/state/delta")
+def get_state_delta(since: str):
+    # since = a previously anchored merkle_root
+    delta = build_delta(since)
+    if delta is None:
+        raise HTTPException(404, "Unknown anchored root")
+    return {"delta": delta, "hash": "sha256:" + sha256_hex(delta)}
+
 @router.post("/state/anchor")
-async def post_state_anchor(x_admin_token: Optional[str] = Header(None)):
+async def post_state_anchor(mode: str = "full", x_admin_token: Optional[str] = Header(None)):
     _require_admin(x_admin_token)
-    snap = build_state()
-    att  = sign_state(snap)
-    try:
-        receipt = await anchor_to_ledger(att)
-        att["ledger_receipt"] = receipt
-    except Exception as e:
-        att["ledger_error"] = str(e)
+    if mode not in ANCHOR_MODES:
+        raise HTTPException(400, f"mode must be one of {ANCHOR_MODES}")
+    att = await anchor_state(mode)
     return {"ok": True, "attestation": att}
 
+@router.get("/ledger/outbox")
+def ledger_outbox_stats():
+    return {"ok": True, "worker_running": OUTBOX_WORKER.running, **outbox().stats()}
+
+@router.get("/ledger/outbox/{entry_id}")
+def ledger_outbox_entry(entry_id: int):
+    entry = outbox().get(entry_id)
+    if not entry:
+        raise HTTPException(404, "Outbox entry not found")
+    return entry
+
 @router.post("/cron/daily")
 async def cron_daily(background: BackgroundTasks, x_admin_token: Optional[str] = Header(None)):
     _require_admin(x_admin_token)
     # run anchor in background so cron returns fast
     async def _job():
-        snap = build_state()
-        att  = sign_state(snap)
         try:
-            receipt = await anchor_to_ledger(att)
+            await anchor_state(os.getenv("OAA_ANCHOR_MODE", "full"))
             # you could write to disk or log here if desired
         except Exception:
             pass
@@ -182,19 +245,33 @@ async def cron_daily(background: BackgroundTasks, x_admin_token: Optional[str] =
     background.add_task(_job)
     return {"ok": True, "queued": True, "ts": time.time()}
 
-@router.post("/verify", response_model=VerifyResponse)
-async def verify_attestation(req: VerifyRequest):
-    """
-    Verify an attestation object from OAA
-    """
+def _allowed_pubs() -> Optional[Container[str]]:
+    # Known signer public keys (optional key pinning); None if keyset unavailable
+    try:
+        return keyset_service().by_x
+    except:
+        return None
+
+def _check_ts(content: Dict[str, Any]) -> Optional[bool]:
+    if not content.get("ts"):
+        return True
     try:
-        att = req.attestation
-        
-        # 1) Check hash
-        canon = canonical_json(att["content"])
-        recomputed = sha256_hex(att["content"])
+        ts = datetime.fromisoformat(content["ts"].replace("Z", ""))
+        now = datetime.utcnow()
+        diff_minutes = abs((now - ts).total_seconds()) / 60
+        ts_window = int(os.getenv("OAA_VERIFY_TS_WINDOW_MIN", "10"))
+        return diff_minutes <= ts_window
+    except:
+        return None  # timestamp parsing failed
+
+def _verify_one(att: Dict[str, Any], allowed_pubs: Optional[Container[str]],
+                verify_key_for: Callable[[str], Any]) -> VerifyResponse:
+    """Verify a single attestation; shared by /verify and /verify/batch."""
+    try:
+        # 1) Check hash (serialize content once; sign and hash cover the same bytes)
+        msg, recomputed = canonicalize(att["content"])
         got = att.get("content_hash", "").replace("sha256:", "")
-        
+
         if not got or got != recomputed:
             return VerifyResponse(
                 ok=False,
@@ -209,56 +286,34 @@ async def verify_attestation(req: VerifyRequest):
                 reason="bad_sig_format",
                 recomputed_hash=recomputed
             )
-        
+
         sig_b64 = att["signature"].split(":", 1)[1]
         pub_b64 = att["public_key_b64"]
-        
+
         # Check if signer is known (optional key pinning)
-        signer_known = True
-        try:
-            keyset_data = keyset()
-            allowed_pubs = {k["x"] for k in keyset_data.get("keys", [])}
-            signer_known = pub_b64 in allowed_pubs
-        except:
-            signer_known = None  # keyset unavailable
+        signer_known = None if allowed_pubs is None else pub_b64 in allowed_pubs
 
         # 3) Check timestamp freshness (optional)
-        ts_ok = True
-        content = att.get("content", {})
-        if content.get("ts"):
-            try:
-                ts = datetime.fromisoformat(content["ts"].replace("Z", ""))
-                now = datetime.utcnow()
-                diff_minutes = abs((now - ts).total_seconds()) / 60
-                ts_window = int(os.getenv("OAA_VERIFY_TS_WINDOW_MIN", "10"))
-                ts_ok = diff_minutes <= ts_window
-            except:
-                ts_ok = None  # timestamp parsing failed
-
-        # 4) Nonce replay defense (basic check - would need Redis for production)
-        nonce_ok = True
-        # This is a placeholder - in production you'd check Redis
-        # nonce_ok = not await nonce_seen_async(content.get("voter_id", ""), content.get("nonce", ""))
-
-        # 5) Verify Ed25519 signature
-        sig_ok = ed25519_verify(pub_b64, att["content"], sig_b64)
-        
+        ts_ok = _check_ts(att.get("content", {}))
+
+        # 4) Verify Ed25519 signature (nonce replay check runs afterwards in _check_nonces)
+        vk = verify_key_for(pub_b64)
+        sig_ok = ed25519_verify_raw(vk, msg, base64.b64decode(sig_b64))
+
         if not sig_ok:
             return VerifyResponse(
                 ok=False,
                 reason="signature_invalid",
                 recomputed_hash=recomputed,
                 signer_known=signer_known,
-                ts_ok=ts_ok,
-                nonce_ok=nonce_ok
+                ts_ok=ts_ok
             )
 
         return VerifyResponse(
             ok=True,
             recomputed_hash=recomputed,
             signer_known=signer_known,
-            ts_ok=ts_ok,
-            nonce_ok=nonce_ok
+            ts_ok=ts_ok
         )
 
     except KeyError as e:
@@ -272,6 +327,177 @@ async def verify_attestation(req: VerifyRequest):
             reason=f"verification_error: {str(e)}"
         )
 
+# ---- Nonce replay defense ----
+# /verify always burns the nonce (OAA_VERIFY_REPLAY_CHECK=false turns this off
+# for the whole deployment). /verify/batch and /verify/audit re-check stored
+# attestations, so they only report whether the nonce has been seen.
+REPLAY_CHECK = os.getenv("OAA_VERIFY_REPLAY_CHECK", "true").lower() != "false"
+REQUIRE_NONCE = os.getenv("OAA_VERIFY_REQUIRE_NONCE", "false").lower() == "true"
+
+def _nonce_key(att: Dict[str, Any]) -> Optional[str]:
+    content = att.get("content") or {}
+    nonce = content.get("nonce")
+    if not nonce:
+        return None
+    return nonce_key(content.get("voter_id") or att.get("public_key_b64", ""), str(nonce))
+
+def _nonce_targets(atts: List[Dict[str, Any]], results: List[VerifyResponse]) -> Tuple[List[int], List[str]]:
+    """(indexes, keys) of verified attestations that carry a nonce; applies OAA_VERIFY_REQUIRE_NONCE."""
+    idx, keys = [], []
+    for i, (att, res) in enumerate(zip(atts, results)):
+        if not res.ok:
+            continue
+        key = _nonce_key(att)
+        if key is None:
+            if REQUIRE_NONCE:
+                res.ok, res.reason, res.nonce_ok = False, "nonce_missing", False
+            continue
+        idx.append(i)
+        keys.append(key)
+    return idx, keys
+
+async def _check_nonces(atts: List[Dict[str, Any]], results: List[VerifyResponse]):
+    """
+    Burn the nonce of every attestation whose signature verified (forged ones
+    never reach the store) and fail replays. One store round trip per call.
+    nonce_ok stays None when there is no nonce or the store is unreachable.
+    """
+    if not REPLAY_CHECK:
+        return
+    idx, keys = _nonce_targets(atts, results)
+    if not keys:
+        return
+    for i, seen in zip(idx, await nonce_guard().seen_many(keys)):
+        if seen is None:
+            continue
+        res = results[i]
+        res.nonce_ok = not seen
+        if seen:
+            res.ok, res.reason = False, "nonce_replay"
+
+async def _peek_nonces(atts: List[Dict[str, Any]], results: List[VerifyResponse]):
+    """Audit mode: set nonce_seen without consuming anything or failing the result."""
+    if not REPLAY_CHECK:
+        return
+    idx, keys = _nonce_targets(atts, results)
+    if not keys:
+        return
+    for i, seen in zip(idx, await nonce_guard().peek_many(keys)):
+        results[i].nonce_seen = seen
+
+@router.post("/verify", response_model=VerifyResponse)
+async def verify_attestation(req: VerifyRequest):
+    """
+    Verify an attestation object from OAA; consumes its nonce, so a repeat
+    within OAA_NONCE_TTL_SEC fails with nonce_replay.
+    """
+    res = _verify_one(req.attestation, _allowed_pubs(), load_verify_key)
+    await _check_nonces([req.attestation], [res])
+    return res
+
+@router.post("/verify/audit", response_model=VerifyResponse)
+async def audit_attestation(req: VerifyRequest):
+    """
+    Re-verify a stored attestation without consuming its nonce; nonce_seen
+    reports whether it was already used within OAA_NONCE_TTL_SEC.
+    """
+    res = _verify_one(req.attestation, _allowed_pubs(), load_verify_key)
+    await _peek_nonces([req.attestation], [res])
+    return res
+
+# ---- Batch verification ----
+VERIFY_WORKERS = int(os.getenv("OAA_VERIFY_WORKERS", "0") or 0) or min(8, os.cpu_count() or 1)
+VERIFY_BATCH_MAX = int(os.getenv("OAA_VERIFY_BATCH_MAX", "10000"))
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+_verify_pool: Optional[ThreadPoolExecutor] = None
+
+def _get_verify_pool() -> ThreadPoolExecutor:
+    # PyNaCl releases the GIL inside libsodium, so threads give real parallelism
+    global _verify_pool
+    if _verify_pool is None:
+        _verify_pool = ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix="oaa-verify")
+    return _verify_pool
+
+async def _read_batch(request: Request) -> List[Dict[str, Any]]:
+    """Accept a JSON list, {"attestations": [...]}, or an NDJSON stream."""
+    ctype = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    atts: List[Dict[str, Any]] = []
+    if ctype in NDJSON_TYPES:
+        buf = b""
+        async for chunk in request.stream():
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    atts.append(json.loads(line))
+                if len(atts) > VERIFY_BATCH_MAX:
+                    raise HTTPException(status_code=413, detail=f"Batch exceeds {VERIFY_BATCH_MAX} attestations")
+        if buf.strip():
+            atts.append(json.loads(buf))
+    else:
+        payload = json.loads(await request.body())
+        if isinstance(payload, list):
+            payload = {"attestations": payload}
+        atts = VerifyBatchRequest(**payload).attestations
+    if len(atts) > VERIFY_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {VERIFY_BATCH_MAX} attestations")
+    return atts
+
+@router.post("/verify/batch", response_model=VerifyBatchResponse)
+async def verify_attestation_batch(request: Request):
+    """
+    Verify many attestations in one call; results keep the request order.
+    Body: JSON list, {"attestations": [...]}, or NDJSON (one attestation per line).
+    Read-only like /verify/audit: nonces are reported (nonce_seen), not consumed.
+    """
+    try:
+        atts = await _read_batch(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Bad batch body: {e}")
+
+    allowed_pubs = _allowed_pubs()
+
+    # Parse each distinct public key once; the dict is read-only inside workers
+    vks: Dict[str, Any] = {}
+    for att in atts:
+        pub = att.get("public_key_b64") if isinstance(att, dict) else None
+        if isinstance(pub, str) and pub not in vks:
+            try:
+                vks[pub] = load_verify_key(pub)
+            except Exception as e:
+                vks[pub] = str(e)
+
+    def verify_key_for(pub_b64: str):
+        vk = vks[pub_b64]
+        if isinstance(vk, str):
+            raise ValueError(vk)
+        return vk
+
+    def run_chunk(chunk: List[Dict[str, Any]]) -> List[VerifyResponse]:
+        return [_verify_one(att, allowed_pubs, verify_key_for) for att in chunk]
+
+    # Spread the Ed25519 checks across the worker pool in contiguous chunks
+    size = max(64, math.ceil(len(atts) / (VERIFY_WORKERS * 4)))
+    loop = asyncio.get_running_loop()
+    pool = _get_verify_pool()
+    chunks = await asyncio.gather(*[
+        loop.run_in_executor(pool, run_chunk, atts[i:i + size])
+        for i in range(0, len(atts), size)
+    ])
+    results = [r for chunk in chunks for r in chunk]
+    await _peek_nonces([a if isinstance(a, dict) else {} for a in atts], results)
+    verified = sum(1 for r in results if r.ok)
+
+    return VerifyBatchResponse(
+        ok=verified == len(results),
+        count=len(results),
+        verified=verified,
+        results=results
+    )
+
 @router.get("/_health/redis")
 async def redis_health():
     # Placeholder for Redis health check
@@ -1,51 +1,134 @@
 # app/routers/oaa/state.py
-import time, os
-from typing import Dict, Any, List, Tuple
+import asyncio, time, os
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-from ...crypto.ed25519 import ed25519_sign, sha256_hex
-from .store import SOURCES, SCORES, VOTES
-
-def build_state() -> Dict[str, Any]:
-    # Deterministic snapshot (sorted by source_id)
-    items: List[Dict[str, Any]] = []
-    for sid in sorted(SOURCES.keys()):
-        src = SOURCES[sid]
-        sc  = SCORES.get(sid)
-        votes = VOTES.get(sid, [])
-        items.append({
-            "source": src.model_dump(),
-            "score": (sc.model_dump() if sc else None),
-            "vote_count": len(votes),
-        })
+from ...crypto.ed25519 import oaa_signer, sha256_hex
+from .outbox import enqueue_attestation, ledger_url, on_settled
+from .store import (get_source, iter_sources, votes_count, state_item, state_root, state_proof,
+                    state_leaves, stage_anchor, confirm_anchor, drop_staged_anchor, anchored_leaves, last_anchor)
+
+# Leaves are sha256(0x00 || canonical_json(item)) in source_id order; see merkle.py
+ANCHOR_MODES = ("full", "delta")
+STATE_KINDS = ("oaa.state.snapshot", "oaa.state.delta")
+TREE_DESCRIPTOR = {"hash": "sha256", "leaf_prefix": "00", "node_prefix": "01", "order": "source_id", "odd": "promote"}
+
+def state_items() -> List[Dict[str, Any]]:
+    # Full item list (sorted by source_id); each item hashes to its Merkle leaf
+    return [state_item(src.model_dump(mode="json"), sc.model_dump(mode="json") if sc else None, votes_count(src.id))
+            for src, sc in iter_sources()]
+
+def _header(kind: str, root: str, count: int) -> Dict[str, Any]:
     now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
     return {
-        "type": "oaa.state.snapshot",
-        "version": "lab7-v1",
+        "type": kind,
+        "version": "lab7-v2",
         "ts": now,
         "issuer": os.getenv("OAA_ISSUER","oaa.lab7"),
-        "items": items,
+        "merkle_root": root,
+        "leaf_count": count,
+        "tree": TREE_DESCRIPTOR,
     }
 
+def build_state(full: bool = False) -> Dict[str, Any]:
+    # Snapshot header: the Merkle root stands in for the item list, so this is
+    # O(1) after the first call. full=True also embeds the items.
+    snap = _header("oaa.state.snapshot", *state_root())
+    if full:
+        snap["items"] = state_items()
+    return snap
+
+def _item(source_id: str) -> Optional[Dict[str, Any]]:
+    row = get_source(source_id)
+    if row is None:
+        return None
+    src, sc = row
+    return state_item(src.model_dump(mode="json"), sc.model_dump(mode="json"), votes_count(source_id))
+
+def _delta(base_root: str, base: Dict[str, str], root: str, leaves: Dict[str, str]) -> Dict[str, Any]:
+    # Compare leaf hashes only; items are loaded just for added/changed sources
+    added = sorted(k for k in leaves if k not in base)
+    changed = sorted(k for k in leaves if k in base and base[k] != leaves[k])
+    removed = sorted(k for k in base if k not in leaves)
+    delta = _header("oaa.state.delta", root, len(leaves))
+    delta.update({
+        "base_root": base_root,
+        "added": [i for i in map(_item, added) if i],
+        "changed": [i for i in map(_item, changed) if i],
+        "removed": removed,
+    })
+    return delta
+
+def build_delta(since: str) -> Optional[Dict[str, Any]]:
+    """Sources added/changed/removed since the anchored root `since`; None if that root is unknown."""
+    since = since.removeprefix("sha256:")
+    base = anchored_leaves(since)
+    if base is None:
+        return None
+    return _delta(since, base, *state_leaves())
+
+async def anchor_state(mode: str = "full") -> Dict[str, Any]:
+    """
+    Sign and anchor the current state. mode="delta" ships only the changes
+    since the last recorded anchor (falling back to the full header when there
+    is none). The root's leaves are staged here and recorded as anchored only
+    when the outbox delivers the attestation to the ledger; a dead-lettered
+    anchor, or one with no LEDGER_URL to go to, is never recorded.
+    """
+    root, leaves = state_leaves()
+    last = last_anchor() if mode == "delta" else None
+    base = anchored_leaves(last["root"]) if last else None
+    if base is not None:
+        snap = _delta(last["root"], base, root, leaves)
+    else:
+        snap = _header("oaa.state.snapshot", root, len(leaves))
+    att = sign_state(snap)
+    staged = False
+    try:
+        if ledger_url():
+            await asyncio.to_thread(stage_anchor, root, leaves)  # before the worker can deliver it
+            staged = True
+        att["ledger_outbox"] = await anchor_to_ledger(att)
+    except Exception as e:
+        att["ledger_error"] = str(e)
+        if staged:
+            await asyncio.to_thread(drop_staged_anchor, root)
+    return att
+
+def _anchor_settled(att: Dict[str, Any], delivered: bool):
+    # outbox hook: runs in the delivering worker, possibly in another process
+    content = att.get("content") or {}
+    if content.get("type") not in STATE_KINDS or not content.get("merkle_root"):
+        return
+    if delivered:
+        confirm_anchor(content["merkle_root"])
+    else:
+        drop_staged_anchor(content["merkle_root"])
+
+on_settled(_anchor_settled)
+
+def source_proof(source_id: str) -> Optional[Dict[str, Any]]:
+    """Inclusion proof for one source against the current root, or None."""
+    p, item = state_proof(source_id), _item(source_id)
+    if p is None or item is None:
+        return None
+    return {"source_id": source_id, "item": item, **p}
+
 def sign_state(snapshot: Dict[str, Any]) -> Dict[str, Any]:
-    priv_b64 = os.getenv("OAA_ED25519_PRIVATE_B64","")
-    pub_b64  = os.getenv("OAA_ED25519_PUBLIC_B64","")
-    if not (priv_b64 and pub_b64):
+    signer = oaa_signer()
+    if not signer:
         raise RuntimeError("Missing OAA_ED25519_PRIVATE_B64 or OAA_ED25519_PUBLIC_B64")
-    content_hash, sig_b64 = ed25519_sign(priv_b64, snapshot)
+    content_hash, sig_b64 = signer.sign(snapshot)
     return {
         "content": snapshot,
         "content_hash": f"sha256:{content_hash}",
         "signature": f"ed25519:{sig_b64}",
-        "public_key_b64": pub_b64,
-        "signing_key": os.getenv("OAA_SIGNING_VERSION","oaa:ed25519:v1")
+        "public_key_b64": signer.public_key_b64,
+        "signing_key": signer.version
     }
 
 async def anchor_to_ledger(attestation: Dict[str, Any]) -> Dict[str, Any]:
-    ledger_url = os.getenv("LEDGER_URL","").rstrip("/")
-    if not ledger_url:
+    # Enqueue in the durable outbox; delivery (with retries) is the worker's job
+    if not ledger_url():
         return {"anchored": False, "reason": "LEDGER_URL not set"}
-    import httpx
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.post(f"{ledger_url}/attest", json=attestation)
-        r.raise_for_status()
-        return r.json()
+    seq = await asyncio.to_thread(enqueue_attestation, attestation["content"]["type"], attestation)
+    return {"id": seq, "status": "pending"}
@@ -1,41 +1,596 @@
-from typing import Dict, List
+import json, os, sqlite3, threading, time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
 from .models import Source, SourceScore
+from .merkle import MerkleTree, leaf_hash
 
-# In-memory store (swap to DB later)
-SOURCES: Dict[str, Source] = {}
-SCORES: Dict[str, SourceScore] = {}
-VOTES: Dict[str, list[dict]] = {}
+ANCHOR_KEEP = int(os.getenv("OAA_ANCHOR_KEEP", "30"))  # anchored leaf sets kept for deltas
 
+class RepAggregate(NamedTuple):
+    """Running per-source vote totals; stake_sum adds up-vote stakes and subtracts all others."""
+    up: int = 0
+    down: int = 0
+    neutral: int = 0
+    stake_sum: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.up + self.down + self.neutral
+
+    def add(self, vote: dict) -> "RepAggregate":
+        op = vote["opinion"]
+        return RepAggregate(
+            self.up + (op == "up"),
+            self.down + (op == "down"),
+            self.neutral + (op not in ("up", "down")),
+            self.stake_sum + vote["stake_gic"] * (1 if op == "up" else -1),
+        )
+
+def aggregate_votes(votes: Iterable[dict]) -> RepAggregate:
+    agg = RepAggregate()
+    for v in votes:
+        agg = agg.add(v)
+    return agg
+
+def state_item(source: dict, score: Optional[dict], vote_count: int) -> dict:
+    """One entry of the OAA state (JSON-mode dumps); its hash is the Merkle leaf."""
+    return {"source": source, "score": score, "vote_count": vote_count}
+
+# ---- Backends ----
+# A backend stores (Source, SourceScore) pairs keyed by source id plus the
+# per-source vote log. Listings come back ordered by composite desc, id asc.
+# Every write also refreshes that source's leaf in the state Merkle tree.
+
+class MemoryStore:
+    """Process-local dicts (tests / throwaway dev runs)."""
+
+    def __init__(self):
+        self.sources: Dict[str, Source] = {}
+        self.scores: Dict[str, SourceScore] = {}
+        self.votes: Dict[str, list[dict]] = {}
+        self.reputation: Dict[str, RepAggregate] = {}
+        self.tree = MerkleTree()
+        self.anchors: "OrderedDict[str, tuple[float, Dict[str, str]]]" = OrderedDict()
+        self.staged: Dict[str, Dict[str, str]] = {}  # handed to the outbox, not yet delivered
+
+    def _refresh_leaf(self, source_id: str):
+        s, sc = self.sources.get(source_id), self.scores.get(source_id)
+        if s:
+            item = state_item(s.model_dump(mode="json"), sc.model_dump(mode="json") if sc else None,
+                              self.votes_count(source_id))
+            self.tree.set(source_id, leaf_hash(item))
+
+    def upsert(self, s: Source, score: SourceScore):
+        self.sources[s.id] = s
+        self.scores[s.id] = score
+        self._refresh_leaf(s.id)
+
+    def upsert_many(self, pairs: List[tuple[Source, SourceScore]]):
+        for s, score in pairs:
+            self.upsert(s, score)
+
+    def get(self, source_id: str) -> Optional[tuple[Source, SourceScore]]:
+        s = self.sources.get(source_id)
+        sc = self.scores.get(source_id)
+        return (s, sc) if s and sc else None
+
+    def update_score(self, score: SourceScore):
+        self.scores[score.source_id] = score
+        self._refresh_leaf(score.source_id)
+
+    def list_sources(self, min_score: float = 0.0, gate: str|None = None) -> List[tuple[Source, SourceScore]]:
+        out = []
+        for sid, s in self.sources.items():
+            sc = self.scores.get(sid)
+            if not sc: continue
+            if sc.composite < min_score: continue
+            if gate and sc.policy_gate != gate: continue
+            out.append((s, sc))
+        out.sort(key=lambda t: (-t[1].composite, t[0].id))
+        return out
+
+    def page(self, min_score: float = 0.0, gate: str|None = None,
+             after: Optional[tuple[float, str]] = None, limit: int = 100) -> List[tuple[Source, SourceScore]]:
+        rows = self.list_sources(min_score=min_score, gate=gate)
+        if after:
+            key = (-after[0], after[1])
+            rows = [r for r in rows if (-r[1].composite, r[0].id) > key]
+        return rows[:limit]
+
+    def iter_all(self) -> Iterator[tuple[Source, Optional[SourceScore]]]:
+        for sid in sorted(self.sources):
+            yield self.sources[sid], self.scores.get(sid)
+
+    def record_vote(self, source_id: str, vote: dict):
+        self.votes.setdefault(source_id, []).append(vote)
+        self.reputation[source_id] = self.reputation.get(source_id, RepAggregate()).add(vote)
+        self._refresh_leaf(source_id)
+
+    def get_votes(self, source_id: str) -> list[dict]:
+        return self.votes.get(source_id, [])
+
+    def state_root(self) -> tuple[str, int]:
+        return self.tree.root(), len(self.tree)
+
+    def state_proof(self, source_id: str) -> Optional[dict]:
+        return self.tree.proof(source_id)
+
+    def state_leaves(self) -> tuple[str, Dict[str, str]]:
+        return self.tree.root(), self.tree.leaves()
+
+    def record_anchor(self, root: str, leaves: Dict[str, str]):
+        self.anchors.pop(root, None)
+        self.anchors[root] = (time.time(), dict(leaves))
+        while len(self.anchors) > ANCHOR_KEEP:
+            self.anchors.popitem(last=False)
+
+    def stage_anchor(self, root: str, leaves: Dict[str, str]):
+        self.staged[root] = dict(leaves)
+
+    def confirm_anchor(self, root: str) -> bool:
+        leaves = self.staged.pop(root, None)
+        if leaves is None:
+            return False
+        self.record_anchor(root, leaves)
+        return True
+
+    def drop_staged_anchor(self, root: str):
+        self.staged.pop(root, None)
+
+    def anchored_leaves(self, root: str) -> Optional[Dict[str, str]]:
+        a = self.anchors.get(root)
+        return a[1] if a else None
+
+    def last_anchor(self) -> Optional[dict]:
+        if not self.anchors:
+            return None
+        root, (ts, leaves) = next(reversed(self.anchors.items()))
+        return {"root": root, "ts": ts, "leaf_count": len(leaves)}
+
+    def votes_count(self, source_id: str) -> int:
+        return self.rep_aggregate(source_id).total
+
+    def rep_aggregate(self, source_id: str) -> RepAggregate:
+        return self.reputation.get(source_id, RepAggregate())
+
+    def rebuild_reputation(self, write: bool = False) -> Dict[str, tuple[RepAggregate, RepAggregate]]:
+        """Recompute aggregates from the vote log; returns {source_id: (stored, rebuilt)} for mismatches."""
+        mismatches = {}
+        for sid in set(self.votes) | set(self.reputation):
+            rebuilt = aggregate_votes(self.votes.get(sid, []))
+            stored = self.rep_aggregate(sid)
+            if stored != rebuilt:
+                mismatches[sid] = (stored, rebuilt)
+                if write:
+                    self.reputation[sid] = rebuilt
+                    self._refresh_leaf(sid)
+        return mismatches
+
+
+class SQLiteStore:
+    """
+    Embedded SQLite in WAL mode: survives restarts and is shared by every
+    uvicorn worker on the host. Listings are index range scans over
+    (composite, id) and (policy_gate, composite, id).
+
+    Leaf hashes live next to each row and every write bumps state_meta's
+    version; a worker applies its own writes to its in-memory Merkle tree
+    and reloads the leaf column only when it sees another writer's version.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sources (
+        id          TEXT PRIMARY KEY,
+        source      TEXT NOT NULL,
+        score       TEXT NOT NULL,
+        composite   REAL NOT NULL,
+        policy_gate TEXT NOT NULL,
+        leaf        TEXT
+    );
+    CREATE INDEX IF NOT EXISTS sources_composite_idx ON sources(composite DESC, id);
+    CREATE INDEX IF NOT EXISTS sources_gate_composite_idx ON sources(policy_gate, composite DESC, id);
+    CREATE TABLE IF NOT EXISTS votes (
+        seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_id TEXT NOT NULL,
+        vote      TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS votes_source_idx ON votes(source_id, seq);
+    CREATE TABLE IF NOT EXISTS reputation (
+        source_id TEXT PRIMARY KEY,
+        up        INTEGER NOT NULL DEFAULT 0,
+        down      INTEGER NOT NULL DEFAULT 0,
+        neutral   INTEGER NOT NULL DEFAULT 0,
+        stake_sum REAL NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS state_meta (
+        k TEXT PRIMARY KEY,
+        v INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO state_meta(k, v) VALUES ('version', 0);
+    CREATE TABLE IF NOT EXISTS anchors (
+        seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+        root       TEXT NOT NULL UNIQUE,
+        ts         REAL NOT NULL,
+        leaf_count INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS anchor_leaves (
+        anchor_seq INTEGER NOT NULL,
+        id         TEXT NOT NULL,
+        leaf       TEXT NOT NULL,
+        PRIMARY KEY (anchor_seq, id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS staged_anchors (
+        root   TEXT PRIMARY KEY,
+        ts     REAL NOT NULL,
+        leaves TEXT NOT NULL
+    );
+    """
+
+    UPSERT_SQL = (
+        "INSERT INTO sources(id, source, score, composite, policy_gate, leaf) VALUES (?,?,?,?,?,?) "
+        "ON CONFLICT(id) DO UPDATE SET source=excluded.source, score=excluded.score, "
+        "composite=excluded.composite, policy_gate=excluded.policy_gate, leaf=excluded.leaf"
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.tree = MerkleTree()
+        self._tree_version: Optional[int] = None
+        self._tree_lock = threading.Lock()
+        conn = self._conn()
+        conn.executescript(self.SCHEMA)
+        # databases created before leaf hashes were stored
+        if "leaf" not in {r[1] for r in conn.execute("PRAGMA table_info(sources)")}:
+            conn.execute("ALTER TABLE sources ADD COLUMN leaf TEXT")
+        # ... or before the reputation table existed: seed it from the log
+        if conn.execute("SELECT 1 FROM votes LIMIT 1").fetchone() and not conn.execute("SELECT 1 FROM reputation LIMIT 1").fetchone():
+            self.rebuild_reputation(write=True)
+        if conn.execute("SELECT 1 FROM sources WHERE leaf IS NULL LIMIT 1").fetchone():
+            with self._write() as c:
+                self._refresh_leaves(c, [r[0] for r in c.execute("SELECT id FROM sources WHERE leaf IS NULL")])
+
+    def _conn(self) -> sqlite3.Connection:
+        # one connection per thread; sync routes run on the threadpool
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE ... COMMIT; leaf changes reach the tree only after commit."""
+        conn = self._conn()
+        self._local.pending = None
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            self._local.pending = None
+            raise
+        self._apply_pending()
+
+    @staticmethod
+    def _row(source_json: str, score_json: str) -> tuple[Source, SourceScore]:
+        return Source.model_validate_json(source_json), SourceScore.model_validate_json(score_json)
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, source_id: str) -> int:
+        row = conn.execute("SELECT up + down + neutral FROM reputation WHERE source_id = ?", (source_id,)).fetchone()
+        return row[0] if row else 0
+
+    def _leaf(self, conn: sqlite3.Connection, source_id: str, source_json: str, score_json: str) -> str:
+        return leaf_hash(state_item(json.loads(source_json), json.loads(score_json), self._count(conn, source_id)))
+
+    def _refresh_leaves(self, conn: sqlite3.Connection, ids: Iterable[str]) -> Dict[str, str]:
+        """Recompute and store leaves for `ids` inside the caller's transaction."""
+        leaves = {}
+        for sid in ids:
+            row = conn.execute("SELECT source, score FROM sources WHERE id = ?", (sid,)).fetchone()
+            if row:
+                leaves[sid] = self._leaf(conn, sid, *row)
+                conn.execute("UPDATE sources SET leaf = ? WHERE id = ?", (leaves[sid], sid))
+        self._commit_leaves(conn, leaves)
+        return leaves
+
+    def _commit_leaves(self, conn: sqlite3.Connection, leaves: Dict[str, str]):
+        # bump the shared version in the same transaction; _write applies the
+        # leaves to our tree after commit if it was current
+        if not leaves:
+            return
+        conn.execute("UPDATE state_meta SET v = v + 1 WHERE k = 'version'")
+        version = conn.execute("SELECT v FROM state_meta WHERE k = 'version'").fetchone()[0]
+        self._local.pending = (leaves, version)
+
+    def _apply_pending(self):
+        pending = getattr(self._local, "pending", None)
+        if not pending:
+            return
+        self._local.pending = None
+        leaves, version = pending
+        with self._tree_lock:
+            if self._tree_version == version - 1:
+                for sid, h in leaves.items():
+                    self.tree.set(sid, h)
+                self._tree_version = version
+            else:
+                self._tree_version = None  # another writer got in between: reload on next read
+
+    def _synced_tree(self) -> MerkleTree:
+        conn = self._conn()
+        version = conn.execute("SELECT v FROM state_meta WHERE k = 'version'").fetchone()[0]
+        with self._tree_lock:
+            if self._tree_version != version:
+                # one read transaction so the leaves match the version we record
+                conn.execute("BEGIN")
+                try:
+                    version = conn.execute("SELECT v FROM state_meta WHERE k = 'version'").fetchone()[0]
+                    leaves = {sid: h for sid, h in conn.execute("SELECT id, leaf FROM sources")}
+                finally:
+                    conn.execute("COMMIT")
+                self.tree = MerkleTree(leaves)
+                self._tree_version = version
+            return self.tree
+
+    def upsert(self, s: Source, score: SourceScore):
+        self.upsert_many([(s, score)])
+
+    def upsert_many(self, pairs: List[tuple[Source, SourceScore]]):
+        # one transaction per batch instead of one per row
+        with self._write() as conn:
+            rows, leaves = [], {}
+            for s, sc in pairs:
+                src_json, sc_json = s.model_dump_json(), sc.model_dump_json()
+                leaves[s.id] = self._leaf(conn, s.id, src_json, sc_json)
+                rows.append((s.id, src_json, sc_json, sc.composite, sc.policy_gate, leaves[s.id]))
+            conn.executemany(self.UPSERT_SQL, rows)
+            self._commit_leaves(conn, leaves)
+
+    def get(self, source_id: str) -> Optional[tuple[Source, SourceScore]]:
+        row = self._conn().execute("SELECT source, score FROM sources WHERE id = ?", (source_id,)).fetchone()
+        return self._row(*row) if row else None
+
+    def update_score(self, score: SourceScore):
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE sources SET score = ?, composite = ?, policy_gate = ? WHERE id = ?",
+                (score.model_dump_json(), score.composite, score.policy_gate, score.source_id),
+            )
+            self._refresh_leaves(conn, [score.source_id])
+
+    def list_sources(self, min_score: float = 0.0, gate: str|None = None) -> List[tuple[Source, SourceScore]]:
+        sql = "SELECT source, score FROM sources WHERE composite >= ?"
+        args: list = [min_score]
+        if gate:
+            sql += " AND policy_gate = ?"
+            args.append(gate)
+        sql += " ORDER BY composite DESC, id"
+        return [self._row(*r) for r in self._conn().execute(sql, args)]
+
+    def page(self, min_score: float = 0.0, gate: str|None = None,
+             after: Optional[tuple[float, str]] = None, limit: int = 100) -> List[tuple[Source, SourceScore]]:
+        # keyset pagination: seek past (composite, id) on the same index order
+        sql = "SELECT source, score FROM sources WHERE composite >= ?"
+        args: list = [min_score]
+        if gate:
+            sql += " AND policy_gate = ?"
+            args.append(gate)
+        if after:
+            sql += " AND (composite < ? OR (composite = ? AND id > ?))"
+            args += [after[0], after[0], after[1]]
+        sql += " ORDER BY composite DESC, id LIMIT ?"
+        args.append(limit)
+        return [self._row(*r) for r in self._conn().execute(sql, args)]
+
+    def iter_all(self) -> Iterator[tuple[Source, Optional[SourceScore]]]:
+        for r in self._conn().execute("SELECT source, score FROM sources ORDER BY id"):
+            yield self._row(*r)
+
+    def record_vote(self, source_id: str, vote: dict):
+        # append to the log and bump the aggregate atomically
+        d = RepAggregate().add(vote)
+        with self._write() as conn:
+            conn.execute("INSERT INTO votes(source_id, vote) VALUES (?, ?)", (source_id, json.dumps(vote)))
+            conn.execute(
+                "INSERT INTO reputation(source_id, up, down, neutral, stake_sum) VALUES (?,?,?,?,?) "
+                "ON CONFLICT(source_id) DO UPDATE SET up = up + excluded.up, down = down + excluded.down, "
+                "neutral = neutral + excluded.neutral, stake_sum = stake_sum + excluded.stake_sum",
+                (source_id, *d),
+            )
+            self._refresh_leaves(conn, [source_id])
+
+    def get_votes(self, source_id: str) -> list[dict]:
+        rows = self._conn().execute("SELECT vote FROM votes WHERE source_id = ? ORDER BY seq", (source_id,))
+        return [json.loads(r[0]) for r in rows]
+
+    def votes_count(self, source_id: str) -> int:
+        return self.rep_aggregate(source_id).total
+
+    def rep_aggregate(self, source_id: str) -> RepAggregate:
+        row = self._conn().execute(
+            "SELECT up, down, neutral, stake_sum FROM reputation WHERE source_id = ?", (source_id,)
+        ).fetchone()
+        return RepAggregate(*row) if row else RepAggregate()
+
+    def rebuild_reputation(self, write: bool = False) -> Dict[str, tuple[RepAggregate, RepAggregate]]:
+        """Recompute aggregates from the vote log; returns {source_id: (stored, rebuilt)} for mismatches."""
+        conn = self._conn()
+        rebuilt: Dict[str, RepAggregate] = {}
+        for sid, vote in conn.execute("SELECT source_id, vote FROM votes ORDER BY seq"):
+            rebuilt[sid] = rebuilt.get(sid, RepAggregate()).add(json.loads(vote))
+        stored = {r[0]: RepAggregate(*r[1:]) for r in conn.execute(
+            "SELECT source_id, up, down, neutral, stake_sum FROM reputation")}
+        mismatches = {}
+        for sid in set(rebuilt) | set(stored):
+            want = rebuilt.get(sid, RepAggregate())
+            have = stored.get(sid, RepAggregate())
+            if have != want:
+                mismatches[sid] = (have, want)
+        if write and mismatches:
+            with self._write() as conn:
+                conn.execute("DELETE FROM reputation")
+                conn.executemany(
+                    "INSERT INTO reputation(source_id, up, down, neutral, stake_sum) VALUES (?,?,?,?,?)",
+                    [(sid, *agg) for sid, agg in rebuilt.items()],
+                )
+                self._refresh_leaves(conn, list(mismatches))
+        return mismatches
+
+    # read under _tree_lock: _apply_pending may be updating the tree meanwhile
+    def state_root(self) -> tuple[str, int]:
+        tree = self._synced_tree()
+        with self._tree_lock:
+            return tree.root(), len(tree)
+
+    def state_proof(self, source_id: str) -> Optional[dict]:
+        tree = self._synced_tree()
+        with self._tree_lock:
+            return tree.proof(source_id)
+
+    def state_leaves(self) -> tuple[str, Dict[str, str]]:
+        tree = self._synced_tree()
+        with self._tree_lock:
+            return tree.root(), tree.leaves()
+
+    @staticmethod
+    def _insert_anchor(conn: sqlite3.Connection, root: str, leaves: Dict[str, str]):
+        # re-anchoring an unchanged root moves it to the end
+        conn.execute("DELETE FROM anchor_leaves WHERE anchor_seq IN (SELECT seq FROM anchors WHERE root = ?)", (root,))
+        conn.execute("DELETE FROM anchors WHERE root = ?", (root,))
+        seq = conn.execute("INSERT INTO anchors(root, ts, leaf_count) VALUES (?,?,?)",
+                           (root, time.time(), len(leaves))).lastrowid
+        conn.executemany("INSERT INTO anchor_leaves(anchor_seq, id, leaf) VALUES (?,?,?)",
+                         [(seq, sid, h) for sid, h in leaves.items()])
+        old = "SELECT seq FROM anchors ORDER BY seq DESC LIMIT -1 OFFSET ?"
+        conn.execute(f"DELETE FROM anchor_leaves WHERE anchor_seq IN ({old})", (ANCHOR_KEEP,))
+        conn.execute(f"DELETE FROM anchors WHERE seq IN ({old})", (ANCHOR_KEEP,))
+
+    def record_anchor(self, root: str, leaves: Dict[str, str]):
+        with self._write() as conn:
+            self._insert_anchor(conn, root, leaves)
+
+    def stage_anchor(self, root: str, leaves: Dict[str, str]):
+        with self._write() as conn:
+            conn.execute("INSERT OR REPLACE INTO staged_anchors(root, ts, leaves) VALUES (?,?,?)",
+                         (root, time.time(), json.dumps(leaves)))
+
+    def confirm_anchor(self, root: str) -> bool:
+        with self._write() as conn:
+            row = conn.execute("SELECT leaves FROM staged_anchors WHERE root = ?", (root,)).fetchone()
+            if not row:
+                return False
+            conn.execute("DELETE FROM staged_anchors WHERE root = ?", (root,))
+            self._insert_anchor(conn, root, json.loads(row[0]))
+        return True
+
+    def drop_staged_anchor(self, root: str):
+        with self._write() as conn:
+            conn.execute("DELETE FROM staged_anchors WHERE root = ?", (root,))
+
+    def anchored_leaves(self, root: str) -> Optional[Dict[str, str]]:
+        conn = self._conn()
+        row = conn.execute("SELECT seq FROM anchors WHERE root = ?", (root,)).fetchone()
+        if not row:
+            return None
+        return {sid: h for sid, h in conn.execute("SELECT id, leaf FROM anchor_leaves WHERE anchor_seq = ?", row)}
+
+    def last_anchor(self) -> Optional[dict]:
+        row = self._conn().execute("SELECT root, ts, leaf_count FROM anchors ORDER BY seq DESC LIMIT 1").fetchone()
+        return dict(zip(("root", "ts", "leaf_count"), row)) if row else None
+
+
+def open_store(backend: str|None = None):
+    """OAA_STORE=sqlite (default, file at OAA_STORE_PATH) or memory."""
+    backend = (backend or os.getenv("OAA_STORE", "sqlite")).lower()
+    if backend == "memory":
+        return MemoryStore()
+    if backend == "sqlite":
+        return SQLiteStore(os.getenv("OAA_STORE_PATH", "data/oaa.sqlite3"))
+    raise ValueError(f"Unknown OAA_STORE backend: {backend}")
+
+STORE = open_store()
+
+# ---- Store API used by the routers ----
 def upsert_source(s: Source, score: SourceScore):
-    SOURCES[s.id] = s
-    SCORES[s.id] = score
+    STORE.upsert(s, score)
+
+def upsert_sources(pairs: List[tuple[Source, SourceScore]]):
+    STORE.upsert_many(pairs)
+
+def get_source(source_id: str) -> Optional[tuple[Source, SourceScore]]:
+    return STORE.get(source_id)
+
+def update_score(score: SourceScore):
+    STORE.update_score(score)
 
 def list_sources(min_score: float = 0.0, gate: str|None = None) -> List[tuple[Source, SourceScore]]:
-    out = []
-    for sid, s in SOURCES.items():
-        sc = SCORES.get(sid)
-        if not sc: continue
-        if sc.composite < min_score: continue
-        if gate and sc.policy_gate != gate: continue
-        out.append((s, sc))
-    # sort by composite desc
-    out.sort(key=lambda t: t[1].composite, reverse=True)
-    return out
+    return STORE.list_sources(min_score=min_score, gate=gate)
+
+def page_sources(min_score: float = 0.0, gate: str|None = None,
+                 after: Optional[tuple[float, str]] = None, limit: int = 100) -> List[tuple[Source, SourceScore]]:
+    """One page ordered by (composite desc, id), starting after the given key."""
+    return STORE.page(min_score=min_score, gate=gate, after=after, limit=limit)
+
+def iter_sources() -> Iterator[tuple[Source, Optional[SourceScore]]]:
+    # all sources, sorted by source_id
+    return STORE.iter_all()
 
 def record_vote(source_id: str, vote: dict):
-    VOTES.setdefault(source_id, []).append(vote)
+    STORE.record_vote(source_id, vote)
 
 def votes_count(source_id: str) -> int:
-    return len(VOTES.get(source_id, []))
+    return STORE.votes_count(source_id)
 
-def summarize_reputation(source_id: str) -> float:
-    votes = VOTES.get(source_id, [])
-    if not votes:
+def reputation_from(agg: RepAggregate) -> float:
+    if not agg.total:
         return 0.7  # baseline neutral
-    up = sum(1 for v in votes if v["opinion"] == "up")
-    down = sum(1 for v in votes if v["opinion"] == "down")
-    total = len(votes)
-    base = (up - down) / max(1, total)
-    stake_bonus = sum(v["stake_gic"] * (1 if v["opinion"] == "up" else -1) for v in votes)
-    rep = 0.7 + 0.15*base + 0.001*stake_bonus
+    base = (agg.up - agg.down) / max(1, agg.total)
+    rep = 0.7 + 0.15*base + 0.001*agg.stake_sum
     return max(0.0, min(1.0, rep))
+
+def state_root() -> tuple[str, int]:
+    """(Merkle root hex, leaf count) over all sources."""
+    return STORE.state_root()
+
+def state_proof(source_id: str) -> Optional[dict]:
+    return STORE.state_proof(source_id)
+
+def state_leaves() -> tuple[str, Dict[str, str]]:
+    """Consistent (root, {source_id: leaf_hash}) pair for diffing."""
+    return STORE.state_leaves()
+
+def record_anchor(root: str, leaves: Dict[str, str]):
+    STORE.record_anchor(root, leaves)
+
+def stage_anchor(root: str, leaves: Dict[str, str]):
+    """Keep the leaf set of an anchor handed to the ledger outbox until it is delivered."""
+    STORE.stage_anchor(root, leaves)
+
+def confirm_anchor(root: str) -> bool:
+    """The ledger accepted `root`: promote its staged leaves to a recorded anchor."""
+    return STORE.confirm_anchor(root)
+
+def drop_staged_anchor(root: str):
+    STORE.drop_staged_anchor(root)
+
+def anchored_leaves(root: str) -> Optional[Dict[str, str]]:
+    return STORE.anchored_leaves(root)
+
+def last_anchor() -> Optional[dict]:
+    return STORE.last_anchor()
+
+def summarize_reputation(source_id: str) -> float:
+    # O(1): reads the running aggregate maintained by record_vote
+    return reputation_from(STORE.rep_aggregate(source_id))
+
+def rebuild_reputation(write: bool = False) -> Dict[str, tuple[RepAggregate, RepAggregate]]:
+    return STORE.rebuild_reputation(write=write)
@@ -2,7 +2,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import Any, Dict, List, Optional
-import os, json, pathlib, hashlib, datetime, base64
+import json, hashlib, datetime, base64
 
 try:
     import nacl.signing
@@ -10,52 +10,15 @@ try:
 except ImportError:
     raise RuntimeError("PyNaCl is required. Add 'pynacl' to requirements.txt")
 
+from ...crypto.ed25519 import load_verify_key
+from .keys import keyset_service
+
 router = APIRouter()
-KEYS_FILE = pathlib.Path("data/keys.json")
 
 # ---------- Helpers ----------
 def _now_iso() -> str:
     return datetime.datetime.utcnow().isoformat() + "Z"
 
-def _load_key_history() -> List[Dict[str, Any]]:
-    if not KEYS_FILE.exists():
-        return []
-    try:
-        return json.loads(KEYS_FILE.read_text())
-    except json.JSONDecodeError:
-        return []
-
-def _current_key() -> Dict[str, Any]:
-    return {
-        "kty": "OKP",
-        "crv": "Ed25519",
-        "kid": os.getenv("OAA_SIGNING_VERSION"),
-        "x": os.getenv("OAA_ED25519_PUBLIC_B64"),
-        "created": os.getenv("OAA_SIGNING_CREATED"),
-        "issuer": os.getenv("OAA_ISSUER", "oaa.lab7")
-    }
-
-def _all_keys() -> List[Dict[str, Any]]:
-    cur = _current_key()
-    hist = _load_key_history()
-    # Filter out empties and duplicates
-    keys = []
-    seen = set()
-    for k in [cur] + hist:
-        x = (k or {}).get("x") or ""
-        if not x:
-            continue
-        sig = (k.get("kid") or "") + ":" + x
-        if sig in seen:
-            continue
-        seen.add(sig)
-        keys.append(k)
-    return keys
-
-def _b64_to_bytes(s: str) -> bytes:
-    # allow raw or prefixed
-    return base64.b64decode(s)
-
 def _sig_to_bytes(sig: str) -> bytes:
     # supports "ed25519:..." or raw base64
     if sig.startswith("ed25519:"):
@@ -90,6 +53,10 @@ class VerifyKeyHistoryBody(BaseModel):
         description="If only a SHA-256 digest was signed, provide 'sha256:<hex>' or '<hex>'."
     )
     signature: str = Field(..., description="Signature as 'ed25519:<base64>' or base64 only.")
+    kid: Optional[str] = Field(
+        default=None,
+        description="Key ID the signer used; when known only that key is checked."
+    )
 
     # Optional reference metadata (not used in verification, included in response)
     meta: Optional[Dict[str, Any]] = None
@@ -101,6 +68,7 @@ def verify_key_history(body: VerifyKeyHistoryBody):
     """
     Verifies a signature against the provided payload or digest,
     trying the current env key first, then archived keys in data/keys.json.
+    If a known 'kid' is supplied, only that key is tried.
 
     Returns which key verified the signature.
     """
@@ -123,14 +91,14 @@ def verify_key_history(body: VerifyKeyHistoryBody):
     sig = _sig_to_bytes(body.signature)
 
     attempted = []
-    for idx, key in enumerate(_all_keys()):
+    for key, source, history_index in keyset_service().candidates(body.kid):
         pub_b64 = key.get("x")
         kid = key.get("kid")
         created = key.get("created")
         issuer = key.get("issuer", "oaa.lab7")
 
         try:
-            verify_key = nacl.signing.VerifyKey(_b64_to_bytes(pub_b64))
+            verify_key = load_verify_key(pub_b64)
             verify_key.verify(msg, sig)  # raises if invalid
             # success
             return {
@@ -142,8 +110,8 @@ def verify_key_history(body: VerifyKeyHistoryBody):
                     "kid": kid,
                     "public_key_b64": pub_b64,
                     "created": created,
-                    "source": "current" if idx == 0 else "history",
-                    "history_index": None if idx == 0 else idx - 1
+                    "source": source,
+                    "history_index": history_index
                 },
                 "attempted": attempted,
                 "ts": _now_iso(),
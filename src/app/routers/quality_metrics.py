@@ -3,38 +3,102 @@ Quality Metrics Router
 Implements anti-slop metrics tracking and reporting for the OAA system.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from fastapi.responses import JSONResponse
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
+import math
 import os
-import hashlib
-from collections import defaultdict, Counter
 import logging
 
+from ..utils.quality_series import FIELDS, MinuteSeries, shared_series
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/dev/quality", tags=["quality-metrics"])
 
-# In-memory storage for metrics (in production, use Redis or database)
-quality_metrics = {
-    "provenance_coverage": [],
-    "hallucination_rate": [],
-    "duplicate_ratio": [],
-    "beacon_validity": [],
-    "copilot_overlap_score": [],
-    "rollback_rate": [],
-    "outputs": [],
-    "quarantined_items": []
-}
+BATCH_MAX = int(os.getenv("QUALITY_METRICS_BATCH_MAX", "10000"))
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+DERIVED = ["provenance_coverage", "hallucination_rate", "duplicate_ratio", "beacon_validity"]
+RECENT_MINUTES = 7 * 24 * 60  # window for rollback_rate and copilot_overlap_score
+
+def _iso(ts: float) -> str:
+    return datetime.utcfromtimestamp(ts).isoformat()
+
+def _ratio(n: float, d: float) -> float:
+    return n / d if d > 0 else 0
+
+def _derived(c: Dict[str, float]) -> Dict[str, float]:
+    """Derived quality ratios from a set of summed counters."""
+    total = c["outputs"]
+    return {
+        "provenance_coverage": _ratio(c["provenance"], total),
+        "hallucination_rate": _ratio(c["unsourced"], total),  # outputs without sources
+        "duplicate_ratio": _ratio(c["duplicates"], total),
+        "beacon_validity": _ratio(c["beacon_valid"], total),
+    }
+
+EVENT_KINDS = ("output", "copilot_overlap", "rollback")
+
+def _output_deltas(has_provenance=False, sources=None, is_duplicate=False,
+                   is_quarantined=False, beacon_valid=True) -> Dict[str, float]:
+    return {
+        "outputs": 1,
+        "provenance": bool(has_provenance),
+        "unsourced": not sources,
+        "duplicates": bool(is_duplicate),
+        "beacon_valid": bool(beacon_valid),
+        "quarantined": bool(is_quarantined),
+    }
+
+def _overlap_deltas(overlap_score: float) -> Dict[str, float]:
+    score = float(overlap_score)
+    if not math.isfinite(score):
+        raise ValueError("overlap_score must be a finite number")
+    return {"overlap_sum": score, "overlap_n": 1}
+
+def _event_deltas(ev: dict):
+    """(kind, ts or None, counter deltas) for one batch event."""
+    if not isinstance(ev, dict):
+        raise TypeError("event must be an object")
+    kind = ev.get("event", "output")
+    ts = ev.get("ts")
+    if ts is not None:
+        ts = float(ts)
+        if not math.isfinite(ts):
+            raise ValueError("ts must be a finite number of epoch seconds")
+    if kind == "output":
+        if not isinstance(ev.get("sources") or [], list):
+            raise ValueError("sources must be a list")
+        return kind, ts, _output_deltas(ev.get("has_provenance", False), ev.get("sources"),
+                                        ev.get("is_duplicate", False), ev.get("is_quarantined", False),
+                                        ev.get("beacon_valid", True))
+    if kind == "copilot_overlap":
+        return kind, ts, _overlap_deltas(ev["overlap_score"])
+    if kind == "rollback":
+        return kind, ts, {"rollbacks": 1}
+    raise ValueError(f"unknown event {kind!r}; expected one of {', '.join(EVENT_KINDS)}")
 
 class QualityMetricsService:
-    """Service for tracking and calculating quality metrics."""
+    """Service for tracking and calculating quality metrics.
+
+    Events are folded into per-minute counters (see utils/quality_series.py)
+    covering QUALITY_METRICS_RETENTION_DAYS; nothing per-output is kept.
+    With QUALITY_METRICS_SHARED_PATH set the counters live in that mmap'd
+    file, so every worker on the host writes to and reports one view.
+    """
     
     def __init__(self):
         self.metrics_enabled = os.getenv("QUALITY_METRICS_ENABLED", "false").lower() == "true"
         self.retention_days = int(os.getenv("QUALITY_METRICS_RETENTION_DAYS", "30"))
+        self.retention_minutes = max(1, self.retention_days) * 24 * 60
+        self.shared_path = os.getenv("QUALITY_METRICS_SHARED_PATH") or None
+        if self.shared_path:
+            self.series = shared_series(self.shared_path, self.retention_minutes, windows=(RECENT_MINUTES,))
+        else:
+            self.series = MinuteSeries(self.retention_minutes, windows=(RECENT_MINUTES,))
     
     def record_output(self, output_data: dict, has_provenance: bool = False, 
                      sources: List[str] = None, is_duplicate: bool = False,
@@ -42,167 +106,76 @@ class QualityMetricsService:
         """Record a new output for quality tracking."""
         if not self.metrics_enabled:
             return
-            
-        timestamp = datetime.utcnow()
-        output_hash = hashlib.sha256(json.dumps(output_data, sort_keys=True).encode()).hexdigest()
-        
-        record = {
-            "timestamp": timestamp.isoformat(),
-            "hash": output_hash,
-            "has_provenance": has_provenance,
-            "sources": sources or [],
-            "is_duplicate": is_duplicate,
-            "is_quarantined": is_quarantined,
-            "beacon_valid": beacon_valid,
-            "output_type": output_data.get("type", "unknown")
-        }
-        
-        quality_metrics["outputs"].append(record)
-        
-        # Clean up old records
-        self._cleanup_old_records()
-        
-        # Update derived metrics
-        self._update_derived_metrics()
+        self.series.add(_output_deltas(has_provenance, sources, is_duplicate, is_quarantined, beacon_valid))
     
     def record_copilot_overlap(self, pr_id: str, overlap_score: float):
-        """Record Copilot overlap score for a PR."""
+        """Record Copilot overlap score for a PR; a non-finite score raises ValueError."""
+        deltas = _overlap_deltas(overlap_score)
         if not self.metrics_enabled:
             return
-            
-        record = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "pr_id": pr_id,
-            "overlap_score": overlap_score
-        }
-        
-        quality_metrics["copilot_overlap_score"].append(record)
-        self._cleanup_old_records()
+        self.series.add(deltas)
     
     def record_rollback(self, reason: str, output_hash: str = None):
         """Record a rollback event."""
         if not self.metrics_enabled:
             return
-            
-        record = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "reason": reason,
-            "output_hash": output_hash
-        }
-        
-        quality_metrics["rollback_rate"].append(record)
-        self._cleanup_old_records()
-    
-    def _cleanup_old_records(self):
-        """Remove records older than retention period."""
-        cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
-        
-        for metric_name in quality_metrics:
-            if isinstance(quality_metrics[metric_name], list):
-                quality_metrics[metric_name] = [
-                    record for record in quality_metrics[metric_name]
-                    if datetime.fromisoformat(record["timestamp"]) > cutoff
-                ]
+        self.series.add({"rollbacks": 1})
     
-    def _update_derived_metrics(self):
-        """Update derived metrics based on raw data."""
-        if not quality_metrics["outputs"]:
-            return
-        
-        # Calculate provenance coverage
-        total_outputs = len(quality_metrics["outputs"])
-        outputs_with_provenance = sum(1 for o in quality_metrics["outputs"] if o["has_provenance"])
-        provenance_coverage = outputs_with_provenance / total_outputs if total_outputs > 0 else 0
-        
-        # Calculate hallucination rate (outputs without sources)
-        outputs_without_sources = sum(1 for o in quality_metrics["outputs"] if not o["sources"])
-        hallucination_rate = outputs_without_sources / total_outputs if total_outputs > 0 else 0
-        
-        # Calculate duplicate ratio
-        duplicates = sum(1 for o in quality_metrics["outputs"] if o["is_duplicate"])
-        duplicate_ratio = duplicates / total_outputs if total_outputs > 0 else 0
-        
-        # Calculate beacon validity
-        valid_beacons = sum(1 for o in quality_metrics["outputs"] if o["beacon_valid"])
-        beacon_validity = valid_beacons / total_outputs if total_outputs > 0 else 0
-        
-        # Store calculated metrics
-        timestamp = datetime.utcnow().isoformat()
-        
-        quality_metrics["provenance_coverage"].append({
-            "timestamp": timestamp,
-            "value": provenance_coverage,
-            "total_outputs": total_outputs
-        })
-        
-        quality_metrics["hallucination_rate"].append({
-            "timestamp": timestamp,
-            "value": hallucination_rate,
-            "total_outputs": total_outputs
-        })
-        
-        quality_metrics["duplicate_ratio"].append({
-            "timestamp": timestamp,
-            "value": duplicate_ratio,
-            "total_outputs": total_outputs
-        })
-        
-        quality_metrics["beacon_validity"].append({
-            "timestamp": timestamp,
-            "value": beacon_validity,
-            "total_outputs": total_outputs
-        })
+    def record_batch(self, events: List[dict]) -> Dict[str, int]:
+        """Record many events in one aggregate update; returns counts per event kind.
+
+        Each event is {"event": "output" | "copilot_overlap" | "rollback", ...}
+        with the same fields as the single-event endpoints, plus an optional
+        "ts" (epoch seconds) for clients that buffer before sending. Invalid
+        events raise ValueError and nothing is recorded.
+        """
+        counts = dict.fromkeys(EVENT_KINDS, 0)
+        minutes: Dict[Optional[int], list] = {}  # minute -> [latest ts, summed deltas]
+        for i, ev in enumerate(events):
+            try:
+                kind, ts, deltas = _event_deltas(ev)
+            except (TypeError, ValueError, KeyError) as e:
+                raise ValueError(f"event {i}: {e}")
+            counts[kind] += 1
+            key = None if ts is None else int(ts // 60)
+            slot = minutes.setdefault(key, [ts, dict.fromkeys(FIELDS, 0.0)])
+            if ts is not None and ts > slot[0]:
+                slot[0] = ts
+            for k, v in deltas.items():
+                slot[1][k] += v
+        if self.metrics_enabled:
+            self.series.add_many(minutes.values())
+        return counts
     
     def get_current_metrics(self) -> Dict:
         """Get current quality metrics."""
         if not self.metrics_enabled:
             return {"status": "disabled", "message": "Quality metrics are disabled"}
         
-        # Get latest values
+        now = datetime.utcnow().isoformat()
+        totals = self.series.totals(self.retention_minutes)
+        recent = self.series.totals(RECENT_MINUTES)
+        total_outputs = int(totals["outputs"])
+        last = self.series.last_ts
+        
         latest_metrics = {}
-        for metric_name in ["provenance_coverage", "hallucination_rate", "duplicate_ratio", "beacon_validity"]:
-            if quality_metrics[metric_name]:
-                latest = quality_metrics[metric_name][-1]
+        for metric_name, value in _derived(totals).items():
+            if total_outputs:
                 latest_metrics[metric_name] = {
-                    "value": latest["value"],
-                    "timestamp": latest["timestamp"],
-                    "total_outputs": latest.get("total_outputs", 0)
+                    "value": value,
+                    "timestamp": _iso(last),
+                    "total_outputs": total_outputs
                 }
             else:
                 latest_metrics[metric_name] = {"value": 0, "timestamp": None, "total_outputs": 0}
         
-        # Calculate rollback rate
-        if quality_metrics["rollback_rate"]:
-            recent_rollbacks = len([
-                r for r in quality_metrics["rollback_rate"]
-                if datetime.fromisoformat(r["timestamp"]) > datetime.utcnow() - timedelta(days=7)
-            ])
-            recent_outputs = len([
-                o for o in quality_metrics["outputs"]
-                if datetime.fromisoformat(o["timestamp"]) > datetime.utcnow() - timedelta(days=7)
-            ])
-            rollback_rate = recent_rollbacks / recent_outputs if recent_outputs > 0 else 0
-        else:
-            rollback_rate = 0
-        
         latest_metrics["rollback_rate"] = {
-            "value": rollback_rate,
-            "timestamp": datetime.utcnow().isoformat()
+            "value": _ratio(recent["rollbacks"], recent["outputs"]),
+            "timestamp": now
         }
-        
-        # Calculate Copilot overlap score
-        if quality_metrics["copilot_overlap_score"]:
-            recent_scores = [
-                c["overlap_score"] for c in quality_metrics["copilot_overlap_score"]
-                if datetime.fromisoformat(c["timestamp"]) > datetime.utcnow() - timedelta(days=7)
-            ]
-            copilot_overlap = sum(recent_scores) / len(recent_scores) if recent_scores else 0
-        else:
-            copilot_overlap = 0
-        
         latest_metrics["copilot_overlap_score"] = {
-            "value": copilot_overlap,
-            "timestamp": datetime.utcnow().isoformat()
+            "value": _ratio(recent["overlap_sum"], recent["overlap_n"]),
+            "timestamp": now
         }
         
         # Overall health score
@@ -224,23 +197,36 @@ class QualityMetricsService:
                 "beacon_validity": 0.95,
                 "copilot_overlap": 0.5
             },
-            "total_outputs": len(quality_metrics["outputs"]),
-            "quarantined_items": len(quality_metrics["quarantined_items"])
+            "total_outputs": total_outputs,
+            "quarantined_items": int(totals["quarantined"])
         }
     
     def get_historical_metrics(self, hours: int = 24) -> Dict:
-        """Get historical metrics for the specified time period."""
+        """Get historical metrics for the specified time period.
+
+        One point per minute that recorded outputs, valued over the retention
+        window as of the end of that minute (oldest first).
+        """
         if not self.metrics_enabled:
             return {"status": "disabled"}
         
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
-        
-        historical = {}
-        for metric_name in ["provenance_coverage", "hallucination_rate", "duplicate_ratio", "beacon_validity"]:
-            historical[metric_name] = [
-                record for record in quality_metrics[metric_name]
-                if datetime.fromisoformat(record["timestamp"]) > cutoff
-            ]
+        minutes = min(max(0, hours) * 60, self.retention_minutes)
+        running = self.series.totals(self.retention_minutes)
+        historical = {metric_name: [] for metric_name in DERIVED}
+        # walk back from the current totals, peeling off one bucket at a time
+        for minute, counts in self.series.buckets(minutes):
+            if counts["outputs"] and running["outputs"] > 0:
+                ts = _iso(minute * 60)
+                for metric_name, value in _derived(running).items():
+                    historical[metric_name].append({
+                        "timestamp": ts,
+                        "value": value,
+                        "total_outputs": int(running["outputs"])
+                    })
+            for k, v in counts.items():
+                running[k] -= v
+        for points in historical.values():
+            points.reverse()
         
         return {
             "status": "enabled",
@@ -284,7 +270,10 @@ def record_output(
 @router.post("/record-copilot-overlap")
 def record_copilot_overlap(pr_id: str, overlap_score: float):
     """Record Copilot overlap score for a PR."""
-    quality_service.record_copilot_overlap(pr_id, overlap_score)
+    try:
+        quality_service.record_copilot_overlap(pr_id, overlap_score)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"status": "recorded"}
 
 @router.post("/record-rollback")
@@ -293,12 +282,58 @@ def record_rollback(reason: str, output_hash: Optional[str] = None):
     quality_service.record_rollback(reason, output_hash)
     return {"status": "recorded"}
 
+async def _read_events(request: Request) -> List[dict]:
+    """Accept a JSON list, {"events": [...]}, or an NDJSON stream."""
+    ctype = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if ctype in NDJSON_TYPES:
+        events, buf = [], b""
+        async for chunk in request.stream():
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            events.extend(json.loads(line) for line in lines if line.strip())
+            if len(events) > BATCH_MAX:
+                break
+        if buf.strip():
+            events.append(json.loads(buf))
+    else:
+        events = json.loads(await request.body())
+        if isinstance(events, dict):
+            events = events.get("events")
+        if not isinstance(events, list):
+            raise ValueError("expected a JSON list of events")
+    return events
+
+@router.post("/record-batch")
+async def record_batch(request: Request):
+    """
+    Record many quality events in one call.
+    Body: JSON list, {"events": [...]}, or NDJSON (one event per line); see
+    QualityMetricsService.record_batch for the event fields.
+    """
+    try:
+        events = await _read_events(request)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Bad batch body: {e}")
+    if len(events) > BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {BATCH_MAX} events")
+    try:
+        counts = quality_service.record_batch(events)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "status": "recorded" if quality_service.metrics_enabled else "disabled",
+        "accepted": len(events),
+        "counts": counts
+    }
+
 @router.get("/health")
 def quality_health():
     """Health check for quality metrics system."""
+    totals = quality_service.series.totals(quality_service.retention_minutes)
     return {
         "status": "ok" if quality_service.metrics_enabled else "disabled",
         "enabled": quality_service.metrics_enabled,
         "retention_days": quality_service.retention_days,
-        "total_records": sum(len(records) for records in quality_metrics.values() if isinstance(records, list))
+        "backend": "shared" if quality_service.shared_path else "memory",
+        "total_records": int(totals["outputs"] + totals["rollbacks"] + totals["overlap_n"])
     }
\ No newline at end of file
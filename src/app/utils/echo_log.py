@@ -0,0 +1,460 @@
+# app/utils/echo_log.py
+# Segmented append-only log for echo pulses and the sentinels' records.
+# Records are compact NDJSON lines in size-rotated segments
+# <stream>_<seq>.ndjson; each segment has a sidecar <stream>_<seq>.idx of
+# fixed-size entries (epoch ts, byte offset, length), so readers can count,
+# seek and (since records arrive in time order) bisect by time through mmap
+# without parsing any JSON. Old segments are rolled into daily gzip archives
+# by compact(). Stdlib only: the sentinel scripts import this module too.
+import gzip, json, mmap, os, re, struct, threading, time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl  # POSIX: serialises writers across processes
+except ImportError:
+    fcntl = None
+
+SEGMENT_BYTES = int(os.getenv("ECHO_SEGMENT_BYTES", str(8 << 20)))
+COMPACT_AFTER_DAYS = float(os.getenv("ECHO_COMPACT_AFTER_DAYS", "30"))
+MIGRATE_BATCH = 1000  # legacy files appended (and checkpointed) per batch
+IDX = struct.Struct("<dQI")  # ts (epoch seconds), offset, length incl. newline
+
+def record_ts(record: Dict[str, Any], default: Optional[float] = None) -> float:
+    """Epoch seconds of a record's ISO "timestamp" (naive means UTC)."""
+    try:
+        dt = datetime.fromisoformat(str(record["timestamp"]).replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    except (KeyError, TypeError, ValueError):
+        return time.time() if default is None else default
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+class _Mapped:
+    """Read-only view of one segment at a given index size."""
+
+    def __init__(self, idx_size: int, idx: Optional[mmap.mmap], data: Optional[mmap.mmap]):
+        self.idx_size, self.idx, self.data = idx_size, idx, data
+        self.count = idx_size // IDX.size
+
+    def entry(self, i: int) -> Tuple[float, int, int]:
+        return IDX.unpack_from(self.idx, i * IDX.size)
+
+    def line(self, i: int) -> bytes:
+        _, off, n = self.entry(i)
+        return self.data[off:off + n - 1]
+
+def _map(path: Path, size: int) -> Optional[mmap.mmap]:
+    if size <= 0:
+        return None
+    with open(path, "rb") as fh:
+        return mmap.mmap(fh.fileno(), size, access=mmap.ACCESS_READ)
+
+class SegmentedLog:
+    """
+    One stream of records in `directory`. Positions are (segment name, i).
+    Writers in several processes are serialised with flock() on
+    <stream>.lock (thread lock only where fcntl is unavailable).
+    """
+
+    def __init__(self, directory, stream: str = "echo", segment_bytes: int = SEGMENT_BYTES):
+        self.dir = Path(directory)
+        self.stream = stream
+        self.segment_bytes = segment_bytes
+        self._re = re.compile(rf"^{re.escape(stream)}_(\d{{8}})\.ndjson$")
+        self._maps: Dict[str, _Mapped] = {}
+        self._active: Optional[str] = None  # newest segment seen; all older ones are sealed
+        self._lock = threading.Lock()  # guards _maps
+        self._write_lock = threading.Lock()
+        self._import_lock = threading.Lock()
+        self._writer: Optional[Tuple[str, int, int, float]] = None  # (segment, data size, idx size, last ts) after our last append
+
+    # ---- layout ----
+    def _name(self, seq: int) -> str:
+        return f"{self.stream}_{seq:08d}"
+
+    def _data(self, name: str) -> Path:
+        return self.dir / f"{name}.ndjson"
+
+    def _idx(self, name: str) -> Path:
+        return self.dir / f"{name}.idx"
+
+    def segments(self) -> List[str]:
+        """Segment names, oldest first."""
+        try:
+            with os.scandir(self.dir) as it:
+                names = [e.name[:-7] for e in it if self._re.match(e.name)]
+        except FileNotFoundError:
+            names = []
+        for gone in set(self._maps) - set(names):
+            self._maps.pop(gone, None)  # compacted away
+        names.sort()
+        active = names[-1] if names else None
+        if active != self._active and self._active is not None:
+            self._maps.pop(self._active, None)  # sealed since we mapped it: may have grown
+        self._active = active
+        return names
+
+    # ---- writing ----
+    @contextmanager
+    def _flocked(self, thread_lock: threading.Lock, suffix: str):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.dir / f"{self.stream}{suffix}", "a") as fh:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def _locked(self):
+        return self._flocked(self._write_lock, ".lock")
+
+    def _repair(self, name: str) -> Tuple[int, int, float]:
+        """Make data and index agree after a crashed writer; returns (data size, count, last ts)."""
+        data, idx = self._data(name), self._idx(name)
+        dsize = data.stat().st_size if data.exists() else 0
+        isize = idx.stat().st_size if idx.exists() else 0
+        count = isize // IDX.size
+        entries = []
+        if count:
+            with open(idx, "rb") as fh:
+                raw = fh.read(count * IDX.size)
+            entries = [e for e in IDX.iter_unpack(raw)]
+        while entries and entries[-1][1] + entries[-1][2] > dsize:
+            entries.pop()  # index points past the data
+        end = entries[-1][1] + entries[-1][2] if entries else 0
+        extra = []
+        if dsize > end:
+            # lines written but never indexed; a trailing partial line is dropped
+            with open(data, "rb") as fh:
+                fh.seek(end)
+                tail = fh.read()
+            off, last_ts = end, entries[-1][0] if entries else time.time()
+            for line in tail.split(b"\n")[:-1]:
+                try:
+                    last_ts = max(last_ts, record_ts(json.loads(line), last_ts))
+                except ValueError:
+                    pass
+                extra.append((last_ts, off, len(line) + 1))
+                off += len(line) + 1
+            end = off
+        if len(entries) != count or isize % IDX.size or extra or dsize != end:
+            with open(idx, "wb") as fh:
+                fh.write(b"".join(IDX.pack(*e) for e in entries + extra))
+            if dsize != end:
+                os.truncate(data, end)
+            self._maps.pop(name, None)
+        last = (entries + extra)[-1][0] if entries or extra else 0.0
+        return end, len(entries) + len(extra), last
+
+    def _tail_state(self, name: str) -> Tuple[int, int, float]:
+        """
+        (data size, count, last ts) of the segment being appended to. Two
+        stat() calls when nothing else wrote since our last append; otherwise
+        one index entry is read, and only a crashed writer costs a full _repair.
+        """
+        data, idx = self._data(name), self._idx(name)
+        dsize = data.stat().st_size if data.exists() else 0
+        isize = idx.stat().st_size if idx.exists() else 0
+        w = self._writer
+        if w is not None and w[:3] == (name, dsize, isize):
+            return dsize, isize // IDX.size, w[3]
+        if not isize % IDX.size:
+            if not isize:
+                if not dsize:
+                    return 0, 0, 0.0
+            else:
+                with open(idx, "rb") as fh:
+                    fh.seek(isize - IDX.size)
+                    ts, off, n = IDX.unpack(fh.read(IDX.size))
+                if off + n == dsize:
+                    return dsize, isize // IDX.size, ts
+        return self._repair(name)
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Append records in order; returns "<segment>.ndjson#<i>" locators.
+        The indexed ts never goes backwards (a late record is indexed at the
+        previous record's time), which keeps the index bisectable.
+        """
+        out: List[str] = []
+        with self._locked():
+            segs = self.segments()
+            name = segs[-1] if segs else self._name(1)
+            size, count, last_ts = self._tail_state(name) if segs else (0, 0, 0.0)
+            data = idx = None
+            try:
+                for record in records:
+                    line = _encode(record)
+                    if size and size + len(line) > self.segment_bytes:
+                        if data:
+                            data.close(); idx.close()
+                            data = idx = None
+                        name = self._name(int(name.rsplit("_", 1)[1]) + 1)
+                        size = count = 0
+                    if data is None:
+                        data, idx = open(self._data(name), "ab"), open(self._idx(name), "ab")
+                    data.write(line)
+                    data.flush()  # data before index: an entry never points at missing bytes
+                    last_ts = max(last_ts, record_ts(record))
+                    idx.write(IDX.pack(last_ts, size, len(line)))
+                    idx.flush()
+                    out.append(f"{name}.ndjson#{count}")
+                    size += len(line)
+                    count += 1
+            finally:
+                if data:
+                    data.close(); idx.close()
+                self._writer = (name, size, count * IDX.size, last_ts)
+        return out
+
+    def append(self, record: Dict[str, Any]) -> str:
+        return self.append_many([record])[0]
+
+    # ---- reading ----
+    def _view(self, name: str) -> _Mapped:
+        m = self._maps.get(name)
+        if m is not None and self._active is not None and name < self._active:
+            return m  # sealed segments never change
+        try:
+            isize = self._idx(name).stat().st_size
+        except FileNotFoundError:
+            isize = 0
+        isize -= isize % IDX.size
+        m = self._maps.get(name)
+        if m is None or m.idx_size != isize:
+            with self._lock:
+                if isize:
+                    idx = _map(self._idx(name), isize)
+                    _, off, n = IDX.unpack_from(idx, isize - IDX.size)
+                    m = _Mapped(isize, idx, _map(self._data(name), off + n))
+                else:
+                    m = _Mapped(0, None, None)
+                self._maps[name] = m
+        return m
+
+    def count(self, name: str) -> int:
+        return self._view(name).count
+
+    def entry(self, name: str, i: int) -> Tuple[float, int, int]:
+        return self._view(name).entry(i)
+
+    def read(self, name: str, i: int) -> bytes:
+        """Raw JSON bytes of one record (no trailing newline)."""
+        return self._view(name).line(i)
+
+    def get(self, name: str, i: int) -> Dict[str, Any]:
+        return json.loads(self.read(name, i))
+
+    def latest(self) -> Optional[Tuple[str, int]]:
+        for name in reversed(self.segments()):
+            n = self.count(name)
+            if n:
+                return name, n - 1
+        return None
+
+    def tail(self, limit: int) -> List[Tuple[str, int]]:
+        """Positions of the newest `limit` records, oldest first."""
+        out: List[Tuple[str, int]] = []
+        for name in reversed(self.segments()):
+            n = self.count(name)
+            take = min(n, limit - len(out))
+            out[:0] = [(name, i) for i in range(n - take, n)]
+            if len(out) >= limit:
+                break
+        return out
+
+    def _first_at_or_after(self, name: str, ts: float) -> int:
+        """Index of the first record in `name` indexed at >= ts (count if none)."""
+        view = self._view(name)
+        lo, hi = 0, view.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if view.entry(mid)[0] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def seek(self, ts: float) -> Optional[Tuple[str, int]]:
+        """Position of the first record indexed at >= ts: bisect segments, then entries."""
+        segs = [n for n in self.segments() if self.count(n)]
+        lo, hi = 0, len(segs)
+        while lo < hi:  # first segment whose newest record is >= ts
+            mid = (lo + hi) // 2
+            view = self._view(segs[mid])
+            if view.entry(view.count - 1)[0] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(segs):
+            return None
+        return segs[lo], self._first_at_or_after(segs[lo], ts)
+
+    def scan(self, start: Tuple[str, int], until: Optional[float] = None,
+             limit: Optional[int] = None) -> Tuple[List[Tuple[str, int]], Optional[Tuple[str, int]]]:
+        """
+        Positions from `start` (inclusive) up to records indexed before `until`,
+        at most `limit` of them; returns (positions, next position or None).
+        A start in a segment compacted away resumes at the next live segment.
+        """
+        out: List[Tuple[str, int]] = []
+        name0, i0 = start
+        for name in self.segments():
+            if name < name0:
+                continue
+            view = self._view(name)
+            for i in range(i0 if name == name0 else 0, view.count):
+                if until is not None and view.entry(i)[0] >= until:
+                    return out, None
+                if limit is not None and len(out) >= limit:
+                    return out, (name, i)
+                out.append((name, i))
+        return out, None
+
+    def oldest_ts(self) -> Optional[float]:
+        for name in self.segments():
+            if self.count(name):
+                return self.entry(name, 0)[0]
+        return None
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        for name in self.segments():
+            for i in range(self.count(name)):
+                yield name, i
+
+    # ---- maintenance ----
+    def import_legacy(self, pattern: Optional[str] = None, remove: bool = False) -> Tuple[int, List[str]]:
+        """
+        Fold this directory's legacy one-record-per-file <stream>_*.json files
+        into the log, once. Progress is saved after every batch: the name of
+        the last file appended goes to <stream>.importing, so an import that
+        stops partway resumes after it instead of appending those files again.
+        The <stream>.imported marker, written under the import lock when the
+        import finishes, turns later calls in any process into no-ops
+        (remove=True then only deletes the already-imported files).
+        Returns (records written, files skipped as unreadable).
+        """
+        pattern = pattern or f"{self.stream}_*.json"
+        marker = self.dir / f"{self.stream}.imported"
+        progress = self.dir / f"{self.stream}.importing"
+        if marker.exists() and not remove:
+            return 0, []
+        if not marker.exists() and not any(self.dir.glob(pattern)):
+            return 0, []
+        with self._flocked(self._import_lock, ".import.lock"):
+            if marker.exists():
+                if remove:
+                    for p in self.dir.glob(pattern):
+                        p.unlink(missing_ok=True)
+                return 0, []
+            after = self._resume_point(progress, pattern) if progress.exists() else None
+
+            def saved(last: str):
+                tmp = progress.with_name(progress.name + ".tmp")
+                tmp.write_text(f"{last}\n")
+                os.replace(tmp, progress)
+
+            saved(after or "")
+            written, skipped = migrate_json_files(self.dir, self, pattern, remove=remove,
+                                                  after=after, on_batch=saved)
+            marker.write_text(f"{written}\n")
+            progress.unlink(missing_ok=True)
+        return written, skipped
+
+    def _resume_point(self, progress: Path, pattern: str) -> Optional[str]:
+        """
+        Name of the last legacy file already in the log. The saved name can
+        trail by the batch that was being appended when the import stopped;
+        those files are matched against the newest record instead.
+        """
+        after = progress.read_text().strip() or None
+        pos = self.latest()
+        if pos is None:
+            return after
+        last = self.read(*pos)
+        pending = sorted(p for p in self.dir.glob(pattern) if p.is_file() and (after is None or p.name > after))
+        for p in reversed(pending[:MIGRATE_BATCH]):
+            try:
+                if json.loads(p.read_text(encoding="utf-8")) == json.loads(last):
+                    return p.name
+            except (OSError, ValueError):
+                continue
+        return after
+
+    def compact(self, older_than_days: float = COMPACT_AFTER_DAYS, archive_dir=None,
+                now: Optional[float] = None) -> List[str]:
+        """
+        Roll sealed segments whose newest record is older than the cutoff into
+        <archive_dir>/<stream>_<YYYY-MM-DD>.ndjson.gz (one gzip member per run,
+        grouped by UTC day) and delete them. The active segment is never touched.
+        """
+        cutoff = (time.time() if now is None else now) - older_than_days * 86400
+        archive = Path(archive_dir) if archive_dir else self.dir / "archive"
+        done: List[str] = []
+        with self._locked():
+            segs = self.segments()
+            for name in segs[:-1]:
+                view = self._view(name)
+                if view.count and view.entry(view.count - 1)[0] >= cutoff:
+                    break  # segments are in time order
+                days: Dict[str, List[bytes]] = {}
+                for i in range(view.count):
+                    ts, off, n = view.entry(i)
+                    day = datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+                    days.setdefault(day, []).append(view.data[off:off + n])
+                archive.mkdir(parents=True, exist_ok=True)
+                for day, lines in days.items():
+                    with gzip.open(archive / f"{self.stream}_{day}.ndjson.gz", "ab") as fh:
+                        fh.write(b"".join(lines))
+                self._idx(name).unlink()
+                self._data(name).unlink()
+                self._maps.pop(name, None)
+                done.append(name)
+        return done
+
+def migrate_json_files(src_dir, log: SegmentedLog, pattern: str = "echo_*.json",
+                       remove: bool = False, after: Optional[str] = None,
+                       on_batch: Optional[Callable[[str], None]] = None) -> Tuple[int, List[str]]:
+    """
+    Append every <pattern> file in `src_dir` to `log`, oldest first (names are
+    timestamp-prefixed), skipping names up to and including `after`. Returns
+    (records written, files skipped as unreadable). Files are deleted only
+    with remove=True and only after they are appended; on_batch gets the
+    name of the last file of each appended batch.
+    """
+    files = sorted(p for p in Path(src_dir).glob(pattern) if p.is_file() and (after is None or p.name > after))
+    skipped: List[str] = []
+    written = 0
+    batch: List[Tuple[Path, Dict[str, Any]]] = []
+
+    def flush():
+        nonlocal written
+        log.append_many(rec for _, rec in batch)
+        written += len(batch)
+        if remove:
+            for p, _ in batch:
+                p.unlink()
+        if on_batch:
+            on_batch(batch[-1][0].name)
+        batch.clear()
+
+    for p in files:
+        try:
+            batch.append((p, json.loads(p.read_text(encoding="utf-8"))))
+        except (OSError, ValueError):
+            skipped.append(p.name)
+        if len(batch) >= MIGRATE_BATCH:
+            flush()
+    if batch:
+        flush()
+    return written, skipped
@@ -0,0 +1,182 @@
+# app/utils/http_clients.py
+# Shared outbound HTTP clients, one pooled httpx.AsyncClient per upstream.
+# Connections are kept alive across requests instead of paying a TCP+TLS
+# handshake per call; the owning app's lifespan closes them on shutdown.
+#
+# Per-upstream settings come from env, falling back to the global default:
+#   HTTP_<NAME>_MAX_CONNECTIONS / HTTP_MAX_CONNECTIONS   (default 20)
+#   HTTP_<NAME>_MAX_KEEPALIVE   / HTTP_MAX_KEEPALIVE     (default 10)
+#   HTTP_<NAME>_KEEPALIVE_SEC   / HTTP_KEEPALIVE_SEC     (default 30)
+#   HTTP_<NAME>_TIMEOUT_SEC     / per-upstream default
+#   HTTP_<NAME>_CONNECT_TIMEOUT_SEC / HTTP_CONNECT_TIMEOUT_SEC (default 5)
+#   HTTP_<NAME>_HTTP2           / HTTP_HTTP2             (default false; needs `h2`)
+import asyncio, os, threading, time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (optional: enables HTTP/2)
+except ImportError:
+    h2 = None
+
+def _env(name: str, key: str, default: str) -> str:
+    return os.getenv(f"HTTP_{name.upper()}_{key}", os.getenv(f"HTTP_{key}", default))
+
+@dataclass(frozen=True)
+class Upstream:
+    name: str
+    timeout: float = 15.0
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    transport: Optional[httpx.AsyncBaseTransport] = None  # tests: httpx.MockTransport
+
+    @classmethod
+    def from_env(cls, name: str, timeout: float = 15.0) -> "Upstream":
+        return cls(
+            name=name,
+            timeout=float(os.getenv(f"HTTP_{name.upper()}_TIMEOUT_SEC", timeout)),
+            connect_timeout=float(_env(name, "CONNECT_TIMEOUT_SEC", "5")),
+            max_connections=int(_env(name, "MAX_CONNECTIONS", "20")),
+            max_keepalive=int(_env(name, "MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(_env(name, "KEEPALIVE_SEC", "30")),
+            http2=_env(name, "HTTP2", "false").lower() in ("1", "true", "yes") and h2 is not None,
+        )
+
+class PoolStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.clients_created = 0
+        self.last_request_at: Optional[float] = None
+
+class _CountedStream(httpx.AsyncByteStream):
+    # keeps a request "in flight" until its body has been read or closed
+    def __init__(self, stream: httpx.AsyncByteStream, done):
+        self._stream, self._done = stream, done
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._done()
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, stats: PoolStats):
+        self._inner, self._stats = inner, stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        st = self._stats
+        st.requests += 1
+        st.in_flight += 1
+        st.peak_in_flight = max(st.peak_in_flight, st.in_flight)
+        st.last_request_at = time.time()
+        finished = False
+
+        def done():
+            nonlocal finished
+            if not finished:
+                finished = True
+                st.in_flight -= 1
+
+        try:
+            resp = await self._inner.handle_async_request(request)
+        except Exception:
+            st.errors += 1
+            done()
+            raise
+        return httpx.Response(resp.status_code, headers=resp.headers, stream=_CountedStream(resp.stream, done),
+                              extensions=resp.extensions, request=request)
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+class HTTPClients:
+    """
+    Registry of lazily created clients keyed by upstream name. A client is
+    tied to the event loop it was created on; asking from another loop (e.g.
+    a second asyncio.run) transparently opens a fresh one.
+    """
+
+    def __init__(self):
+        self._configs: Dict[str, Upstream] = {}
+        self._clients: Dict[str, tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+        self._stats: Dict[str, PoolStats] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, timeout: float = 15.0) -> Upstream:
+        """Declare an upstream with its default timeout; env settings still win."""
+        with self._lock:
+            if name not in self._configs:
+                self._configs[name] = Upstream.from_env(name, timeout)
+            return self._configs[name]
+
+    def configure(self, name: str, **overrides: Any) -> Upstream:
+        """Override settings (e.g. transport= in tests); the next get() builds a new client."""
+        with self._lock:
+            cfg = replace(self._configs.get(name) or Upstream.from_env(name), **overrides)
+            self._configs[name] = cfg
+            self._clients.pop(name, None)
+            return cfg
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(name)
+        if entry and entry[1] is loop and not entry[0].is_closed:
+            return entry[0]
+        with self._lock:
+            cfg = self._configs.get(name) or self._configs.setdefault(name, Upstream.from_env(name))
+            stats = self._stats.setdefault(name, PoolStats())
+            limits = httpx.Limits(max_connections=cfg.max_connections, max_keepalive_connections=cfg.max_keepalive,
+                                  keepalive_expiry=cfg.keepalive_expiry)
+            inner = cfg.transport or httpx.AsyncHTTPTransport(limits=limits, http2=cfg.http2)
+            client = httpx.AsyncClient(
+                transport=_MeteredTransport(inner, stats),
+                timeout=httpx.Timeout(cfg.timeout, connect=cfg.connect_timeout),
+            )
+            stats.clients_created += 1
+            self._clients[name] = (client, loop)
+            return client
+
+    async def aclose(self):
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for client, loop in clients.values():
+            if loop is asyncio.get_running_loop():
+                await client.aclose()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for name, cfg in self._configs.items():
+            st = self._stats.get(name) or PoolStats()
+            out[name] = {
+                "max_connections": cfg.max_connections,
+                "max_keepalive": cfg.max_keepalive,
+                "http2": cfg.http2,
+                "timeout_sec": cfg.timeout,
+                "open": name in self._clients,
+                "requests": st.requests,
+                "errors": st.errors,
+                "in_flight": st.in_flight,
+                "peak_in_flight": st.peak_in_flight,
+                "saturation": round(st.in_flight / cfg.max_connections, 3) if cfg.max_connections else None,
+                "clients_created": st.clients_created,
+                "last_request_at": st.last_request_at,
+            }
+        return out
+
+CLIENTS = HTTPClients()
+
+def http_client(name: str) -> httpx.AsyncClient:
+    """Pooled client for upstream `name` (ledger, ingest, rubric, ...)."""
+    return CLIENTS.get(name)
@@ -0,0 +1,118 @@
+# app/utils/manifest_cache.py
+# In-memory copy of the Civic OS manifest bundle. Files are re-read only when
+# their mtime/size changes, and stat() itself runs at most once per
+# CIVIC_MANIFEST_CHECK_SEC, so polling agents cost no disk I/O.
+import gzip, hashlib, json, os, threading, time
+from email.utils import formatdate
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import brotli  # optional: precompressed br variants
+except ImportError:
+    brotli = None
+
+CHECK_SEC = float(os.getenv("CIVIC_MANIFEST_CHECK_SEC", "1.0"))
+
+MANIFESTS = [
+    "./.civic/atlas.manifest.json",
+    "./.civic/biodna.json",
+    "./.civic/virtue_accords.yaml"
+]
+
+class CachedFile(NamedTuple):
+    path: str
+    exists: bool
+    data: bytes = b""
+    size: int = 0
+    mtime: float = 0.0
+    sha256: str = ""
+    readable: bool = False
+    error: Optional[str] = None
+    encodings: Dict[str, bytes] = {}  # precompressed variants: "br", "gzip"
+
+    @property
+    def stamp(self):
+        return (self.exists, self.size, self.mtime)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.sha256[:32]}"'
+
+    @property
+    def last_modified(self) -> str:
+        return formatdate(int(self.mtime), usegmt=True)
+
+def _compress(data: bytes) -> Dict[str, bytes]:
+    # mtime=0 keeps gzip output (and so its ETag) identical across workers
+    out = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        out["br"] = brotli.compress(data, quality=11)
+    return {enc: b for enc, b in out.items() if len(b) < len(data)}
+
+def _stat(path: str):
+    try:
+        st = os.stat(path)
+        return (True, st.st_size, st.st_mtime_ns / 1e9)
+    except OSError:
+        return (False, 0, 0.0)
+
+def _load(path: str) -> CachedFile:
+    exists, size, mtime = _stat(path)
+    if not exists:
+        return CachedFile(path, False)
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError as e:
+        return CachedFile(path, True, size=size, mtime=mtime, error=str(e))
+    # parse once per change so /status can report readability without reparsing
+    readable, error = True, None
+    try:
+        if path.endswith(".json"):
+            json.loads(data)
+        else:
+            data.decode("utf-8")
+    except Exception as e:
+        readable, error = False, str(e)
+    return CachedFile(path, True, data, len(data), mtime, hashlib.sha256(data).hexdigest(), readable, error,
+                      _compress(data))
+
+class ManifestCache:
+    def __init__(self, paths: List[str] = MANIFESTS, check_sec: float = CHECK_SEC):
+        self.paths = list(paths)
+        self.check_sec = check_sec
+        self.files: Dict[str, CachedFile] = {}
+        self.bundle_sha256 = ""
+        self.version = 0  # bumped whenever any file changes
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> "ManifestCache":
+        now = time.monotonic()
+        if not force and self.files and now - self._checked < self.check_sec:
+            return self
+        with self._lock:
+            changed = False
+            files = dict(self.files)
+            for p in self.paths:
+                cur = files.get(p)
+                if cur is None or cur.stamp != _stat(p):
+                    files[p] = _load(p)
+                    changed = True
+            if changed:
+                # combined sha256 over the bytes of every present file, in bundle order
+                sha = hashlib.sha256()
+                for p in self.paths:
+                    sha.update(files[p].data)
+                self.files, self.bundle_sha256 = files, sha.hexdigest()
+                self.version += 1
+            self._checked = now
+        return self
+
+    def get(self, path: str) -> Optional[CachedFile]:
+        return self.refresh().files.get(path)
+
+_cache = ManifestCache()
+
+def manifest_cache() -> ManifestCache:
+    return _cache.refresh()
@@ -1,8 +1,13 @@
-import os, asyncio
+import os, asyncio, hashlib, threading, time
+from abc import ABC, abstractmethod
+from typing import List, Optional
 import redis.asyncio as redis
 
 _redis_url = os.getenv("OAA_NONCE_REDIS_URL")
 _ttl = int(os.getenv("OAA_NONCE_TTL_SEC", "600") or "600")
+_slices = int(os.getenv("OAA_NONCE_SLICES", "4"))
+_bloom_bits = int(os.getenv("OAA_NONCE_BLOOM_BITS", str(1 << 22)))  # per slice (512 KiB)
+_bloom_hashes = int(os.getenv("OAA_NONCE_BLOOM_HASHES", "7"))
 
 # Lazy global
 _redis: redis.Redis | None = None
@@ -15,12 +20,174 @@ async def get_redis() -> redis.Redis:
         _redis = redis.from_url(_redis_url, decode_responses=True)
     return _redis
 
+# ---- Process-local, time-sliced structures ----
+# Time is cut into `slices` windows of ttl/(slices-1) seconds; entries go into
+# the current window and a window is dropped whole once it is older than the
+# TTL, so expiry costs nothing per key. A key stays visible for between ttl
+# and ttl + one window.
+
+class _Sliced(ABC):
+    def __init__(self, ttl: int, slices: int):
+        self.width = ttl / max(1, slices - 1)
+        self.slices = slices
+        self._windows: dict = {}  # window index -> container
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new(self):
+        """Empty container for a fresh window."""
+
+    def _live(self, now: Optional[float] = None):
+        cur = int((time.time() if now is None else now) // self.width)
+        if cur not in self._windows:
+            for w in [w for w in self._windows if w <= cur - self.slices]:
+                del self._windows[w]
+            self._windows[cur] = self._new()
+        return cur
+
+class TimeSlicedBloom(_Sliced):
+    """Bloom filter per window: might_contain() False means definitely not added within the TTL."""
+
+    def __init__(self, ttl: int = _ttl, slices: int = _slices, bits: int = _bloom_bits, hashes: int = _bloom_hashes):
+        super().__init__(ttl, slices)
+        self.bits, self.hashes = bits, hashes
+
+    def _new(self):
+        return bytearray(self.bits // 8 + 1)
+
+    def _positions(self, key: str) -> List[int]:
+        # double hashing over one 128-bit digest
+        d = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, key: str, now: Optional[float] = None):
+        pos = self._positions(key)
+        with self._lock:
+            arr = self._windows[self._live(now)]
+            for p in pos:
+                arr[p >> 3] |= 1 << (p & 7)
+
+    def might_contain(self, key: str, now: Optional[float] = None) -> bool:
+        pos = self._positions(key)
+        with self._lock:
+            self._live(now)
+            return any(all(arr[p >> 3] & (1 << (p & 7)) for p in pos) for arr in self._windows.values())
+
+class MemoryNonceStore(_Sliced):
+    """Exact in-memory TTL set; the replay authority when OAA_NONCE_REDIS_URL is unset."""
+
+    def __init__(self, ttl: int = _ttl, slices: int = _slices):
+        super().__init__(ttl, slices)
+
+    def _new(self):
+        return set()
+
+    def add(self, key: str, now: Optional[float] = None):
+        with self._lock:
+            self._windows[self._live(now)].add(key)
+
+    def contains(self, key: str, now: Optional[float] = None) -> bool:
+        with self._lock:
+            self._live(now)
+            return any(key in s for s in self._windows.values())
+
+async def redis_set_nx_many(keys: List[str], ttl: int = _ttl) -> List[bool]:
+    """One pipelined round trip of SET NX EX; True where the key already existed."""
+    r = await get_redis()
+    async with r.pipeline(transaction=False) as p:
+        for key in keys:
+            p.set(key, "1", ex=ttl, nx=True)
+        res = await p.execute()
+    return [ok is None for ok in res]
+
+async def redis_exists_many(keys: List[str]) -> List[bool]:
+    """One pipelined round trip of EXISTS; nothing is written."""
+    r = await get_redis()
+    async with r.pipeline(transaction=False) as p:
+        for key in keys:
+            p.exists(key)
+        res = await p.execute()
+    return [bool(n) for n in res]
+
+class NonceGuard:
+    """
+    Replay check for many keys at once. The Bloom filter fronts the local
+    exact store: a miss means this process has definitely not seen the key,
+    so without Redis it is accepted with no further lookup. With Redis, a
+    process-local filter cannot prove a key is new to *other* workers, so
+    new keys still take one pipelined SET NX round trip per call, while
+    replays this process has already recorded are answered locally.
+    """
+
+    def __init__(self, ttl: int = _ttl, redis_url: Optional[str] = _redis_url):
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self.bloom = TimeSlicedBloom(ttl)
+        self.local = MemoryNonceStore(ttl)
+
+    async def seen_many(self, keys: List[str]) -> List[Optional[bool]]:
+        """True = replay, False = first use (now recorded), None = backend unavailable."""
+        now = time.time()
+        out: List[Optional[bool]] = [None] * len(keys)
+        first: dict = {}
+        remote: List[str] = []
+        for i, key in enumerate(keys):
+            if key in first:
+                out[i] = True  # repeated within the same batch
+                continue
+            first[key] = i
+            if self.bloom.might_contain(key, now) and self.local.contains(key, now):
+                out[i] = True
+            elif not self.redis_url:
+                out[i] = False
+            else:
+                remote.append(key)
+        if remote:
+            try:
+                for key, seen in zip(remote, await redis_set_nx_many(remote, self.ttl)):
+                    out[first[key]] = seen
+            except Exception:
+                pass  # leave as None: unknown
+        for key, i in first.items():
+            if out[i] is not None:
+                self.bloom.add(key, now)
+                self.local.add(key, now)
+        return out
+
+    async def peek_many(self, keys: List[str]) -> List[Optional[bool]]:
+        """Read-only: True = already recorded, False = not seen, None = backend unavailable. Records nothing."""
+        now = time.time()
+        out: List[Optional[bool]] = [None] * len(keys)
+        remote: List[int] = []
+        for i, key in enumerate(keys):
+            if self.bloom.might_contain(key, now) and self.local.contains(key, now):
+                out[i] = True
+            elif not self.redis_url:
+                out[i] = False
+            else:
+                remote.append(i)
+        if remote:
+            try:
+                for i, seen in zip(remote, await redis_exists_many([keys[i] for i in remote])):
+                    out[i] = seen
+            except Exception:
+                pass  # leave as None: unknown
+        return out
+
+_guard: Optional[NonceGuard] = None
+
+def nonce_guard() -> NonceGuard:
+    global _guard
+    if _guard is None:
+        _guard = NonceGuard()
+    return _guard
+
+def nonce_key(scope: str, nonce: str) -> str:
+    return f"nonce:{scope}:{nonce}"
+
 async def nonce_seen(voter_id: str, nonce: str) -> bool:
     """Returns True if already seen, False otherwise (and records)."""
     if not voter_id or not nonce:
         return False
-    r = await get_redis()
-    key = f"nonce:{voter_id}:{nonce}"
-    ok = await r.set(key, "1", ex=_ttl, nx=True)
-    # redis.set returns True if key was set, None if exists
-    return ok is None  # True means replay (already exists)
+    return bool((await nonce_guard().seen_many([nonce_key(voter_id, nonce)]))[0])
@@ -0,0 +1,141 @@
+# app/utils/probe.py
+# Concurrent health probing for the sentinels. Every target in a sweep is
+# probed at once over the shared "probe" connection pool, so a sweep takes
+# about as long as its slowest probe instead of the sum of all of them.
+#   - per-target timeout (each attempt) and deadline (whole probe)
+#   - hedged retries: if an attempt is still pending after PROBE_HEDGE_SEC, a
+#     second one is raced against it; an attempt that fails fast is retried
+#     at once; the first UP wins
+#   - each attempt starts after a random 0..PROBE_JITTER_SEC delay so sweeps
+#     from several sentinels do not hit a service in lockstep
+# Blocking callers (probe_services) run sweeps on one long-lived background
+# loop, so the pooled client and its warm connections survive between sweeps.
+import asyncio, os, random, threading, time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from .http_clients import CLIENTS, http_client
+
+PROBE_TIMEOUT_SEC = float(os.getenv("PROBE_TIMEOUT_SEC", "10"))
+PROBE_RETRIES = int(os.getenv("PROBE_RETRIES", "1"))
+PROBE_HEDGE_SEC = float(os.getenv("PROBE_HEDGE_SEC", "2"))
+PROBE_JITTER_SEC = float(os.getenv("PROBE_JITTER_SEC", "0.05"))
+PROBE_DEADLINE_SEC = float(os.getenv("PROBE_DEADLINE_SEC", "0") or 0)  # 0: timeout * (retries + 1)
+CLIENTS.register("probe", timeout=PROBE_TIMEOUT_SEC)
+
+T = TypeVar("T")
+
+@dataclass
+class ProbeTarget:
+    name: str
+    url: str
+    timeout: float = PROBE_TIMEOUT_SEC
+    retries: int = PROBE_RETRIES
+    deadline: Optional[float] = None
+
+@dataclass
+class ProbeResult:
+    name: str
+    url: str
+    status: str  # "UP" | "DOWN"
+    latency_ms: Optional[float]
+    error: Optional[str]
+    attempts: int = 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The per-service shape the sentinels have always reported."""
+        return {"status": self.status, "latency_ms": self.latency_ms, "error": self.error, "url": self.url}
+
+class ProbeEngine:
+    def __init__(self, hedge_after: float = PROBE_HEDGE_SEC, jitter: float = PROBE_JITTER_SEC,
+                 client_name: str = "probe"):
+        self.hedge_after = hedge_after
+        self.jitter = jitter
+        self.client_name = client_name
+
+    async def _attempt(self, t: ProbeTarget) -> ProbeResult:
+        if self.jitter > 0:
+            await asyncio.sleep(random.uniform(0, self.jitter))
+        t0 = time.perf_counter()
+        try:
+            r = await http_client(self.client_name).get(t.url, timeout=t.timeout, follow_redirects=True)
+            latency = round((time.perf_counter() - t0) * 1000, 2)
+            if r.status_code < 400:
+                return ProbeResult(t.name, t.url, "UP", latency, None)
+            return ProbeResult(t.name, t.url, "DOWN", latency, f"HTTP {r.status_code}")
+        except Exception as e:
+            return ProbeResult(t.name, t.url, "DOWN", None, str(e) or e.__class__.__name__)
+
+    async def _race(self, t: ProbeTarget) -> ProbeResult:
+        budget = 1 + max(0, t.retries)
+        pending = {asyncio.create_task(self._attempt(t))}
+        launched, last = 1, None
+        try:
+            while pending:
+                hedge = self.hedge_after if launched < budget and self.hedge_after > 0 else None
+                done, pending = await asyncio.wait(pending, timeout=hedge, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    res = task.result()
+                    if res.status == "UP":
+                        res.attempts = launched
+                        return res
+                    last = res
+                # still slow (hedge) or failed fast (retry): spend the next attempt now
+                if launched < budget and (not done or not pending):
+                    pending.add(asyncio.create_task(self._attempt(t)))
+                    launched += 1
+            last.attempts = launched
+            return last
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def probe(self, t: ProbeTarget) -> ProbeResult:
+        deadline = t.deadline or PROBE_DEADLINE_SEC or t.timeout * (1 + max(0, t.retries))
+        try:
+            return await asyncio.wait_for(self._race(t), deadline)
+        except asyncio.TimeoutError:
+            return ProbeResult(t.name, t.url, "DOWN", None, f"deadline exceeded ({deadline:g}s)")
+
+    async def sweep(self, targets: List[ProbeTarget]) -> List[ProbeResult]:
+        """Probe every target concurrently; results keep the input order."""
+        return list(await asyncio.gather(*(self.probe(t) for t in targets)))
+
+ENGINE = ProbeEngine()
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="probe-loop", daemon=True).start()
+        return _loop
+
+def run_sync(factory: Callable[[], Awaitable[T]]) -> T:
+    """
+    Run a coroutine from sync code on the shared background loop, even when
+    this thread already runs a loop. Clients it opens stay pooled for the
+    next call; nothing is closed here.
+    """
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:  # would block the loop it waits on
+        raise RuntimeError("run_sync() called on the probe loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(factory(), loop).result()
+
+def targets_for(services: Dict[str, str], timeout: float = PROBE_TIMEOUT_SEC,
+                retries: int = PROBE_RETRIES) -> List[ProbeTarget]:
+    return [ProbeTarget(name, url, timeout=timeout, retries=retries) for name, url in services.items()]
+
+def probe_services(services: Dict[str, str], timeout: float = PROBE_TIMEOUT_SEC,
+                   retries: int = PROBE_RETRIES, engine: Optional[ProbeEngine] = None) -> Dict[str, Dict[str, Any]]:
+    """Blocking sweep of {name: url}; returns {name: {status, latency_ms, error, url}}."""
+    engine = engine or ENGINE
+    results = run_sync(lambda: engine.sweep(targets_for(services, timeout, retries)))
+    return {r.name: r.as_dict() for r in results}
@@ -0,0 +1,198 @@
+# app/utils/quality_series.py
+# Bounded per-minute counters for the quality metrics router. One slot per
+# epoch minute in a ring of `retention` minutes; writes touch one slot plus
+# the running totals of each window, so record_* is O(1) and memory is fixed.
+# All state (header, window totals, slots) lives in one flat float64 buffer,
+# so several workers can share it through an mmap'd file (shared_series).
+import math, mmap, os, threading, time
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+try:
+    import fcntl  # POSIX only: cross-process lock for the shared file
+except ImportError:
+    fcntl = None
+
+FIELDS = (
+    "outputs", "provenance", "unsourced", "duplicates", "beacon_valid",
+    "quarantined", "rollbacks", "overlap_sum", "overlap_n",
+)
+NF = len(FIELDS)
+STRIDE = 1 + NF  # slot = [epoch minute, *FIELDS]
+
+class MinuteSeries:
+    """
+    Ring of per-minute counter buckets with running totals over fixed
+    trailing windows (in minutes). A bucket leaves a window's totals once its
+    minute is `span` minutes old; the ring slot itself is reused `capacity`
+    minutes later.
+    """
+
+    def __init__(self, capacity: int, windows: Sequence[int] = (), buf=None, lock=None):
+        self.capacity = max(1, int(capacity))
+        self.windows = tuple(sorted({min(int(w), self.capacity) for w in (self.capacity, *windows)}))
+        # layout: [last_ts, expired minute per window..., totals per window..., slots...]
+        self._tot = 1 + len(self.windows)
+        self._slots = self._tot + NF * len(self.windows)
+        size = self._slots + STRIDE * self.capacity
+        self.buf = buf if buf is not None else memoryview(bytearray(8 * size)).cast("d")
+        if len(self.buf) < size:
+            raise ValueError(f"buffer too small: {len(self.buf)} < {size}")
+        self.lock = lock or threading.Lock()
+
+    @staticmethod
+    def size_for(capacity: int, windows: Sequence[int] = ()) -> int:
+        """Buffer length (float64 items) needed for these parameters."""
+        n = len({min(int(w), max(1, int(capacity))) for w in (capacity, *windows)})
+        return 1 + n + NF * n + STRIDE * max(1, int(capacity))
+
+    def _bucket(self, minute: int) -> int:
+        return self._slots + STRIDE * (minute % self.capacity)
+
+    def _due(self, now_min: int) -> bool:
+        """True if some bucket has aged out of a window since the last advance."""
+        b = self.buf
+        return any(b[1 + i] == 0 or now_min - span > b[1 + i] for i, span in enumerate(self.windows))
+
+    def _advance(self, now_min: int):
+        """Drop buckets that have aged out of each window's running totals."""
+        b = self.buf
+        for i, span in enumerate(self.windows):
+            hdr, tot = 1 + i, self._tot + NF * i
+            start, stop = int(b[hdr]) + 1, now_min - span  # minutes (expired, stop] leave the window
+            if b[hdr] == 0:
+                b[hdr] = stop  # fresh buffer: nothing recorded yet, nothing to expire
+                continue
+            if stop < start:
+                continue
+            if stop - start >= self.capacity:
+                # idle for longer than the ring: recount from what is still live
+                for f in range(NF):
+                    b[tot + f] = 0.0
+                for m, at in self._live(now_min - span + 1, now_min):
+                    for f in range(NF):
+                        b[tot + f] += b[at + 1 + f]
+            else:
+                for m in range(start, stop + 1):
+                    at = self._bucket(m)
+                    if b[at] == m:
+                        for f in range(NF):
+                            b[tot + f] -= b[at + 1 + f]
+            b[hdr] = stop
+
+    def _live(self, lo: int, hi: int) -> Iterator[Tuple[int, int]]:
+        """(minute, slot offset) for populated buckets with lo <= minute <= hi, newest first."""
+        b = self.buf
+        lo = max(lo, hi - self.capacity + 1)
+        for m in range(hi, lo - 1, -1):
+            at = self._bucket(m)
+            if b[at] == m:
+                yield m, at
+
+    def add(self, deltas: Dict[str, float], ts: Optional[float] = None, now: Optional[float] = None):
+        """Add counters to the bucket for `ts` (default now). O(fields x windows)."""
+        self.add_many([(ts, deltas)], now)
+
+    def add_many(self, items: Iterable[Tuple[Optional[float], Dict[str, float]]], now: Optional[float] = None):
+        """Apply (ts, deltas) pairs under one lock; ts None means now.
+        Non-finite values are dropped: one inf would poison a window total for
+        good (inf - inf is NaN once it expires)."""
+        now = time.time() if now is None else now
+        now_min = int(now // 60)
+        b = self.buf
+        with self.lock:
+            self._advance(now_min)
+            for ts, deltas in items:
+                ts = now if ts is None else ts
+                if not math.isfinite(ts):
+                    continue
+                minute = int(ts // 60)
+                if minute <= now_min - self.capacity or minute > now_min:
+                    continue  # outside the ring
+                at = self._bucket(minute)
+                if b[at] != minute:
+                    if b[at] > minute:
+                        continue  # slot already holds a newer minute
+                    b[at] = minute
+                    for f in range(NF):
+                        b[at + 1 + f] = 0.0
+                idx = [(FIELDS.index(k), v) for k, v in deltas.items() if v and math.isfinite(v)]
+                for f, v in idx:
+                    b[at + 1 + f] += v
+                for i, span in enumerate(self.windows):
+                    if minute > now_min - span:
+                        tot = self._tot + NF * i
+                        for f, v in idx:
+                            b[tot + f] += v
+                if ts > b[0]:
+                    b[0] = ts
+
+    @property
+    def last_ts(self) -> Optional[float]:
+        return self.buf[0] or None
+
+    def totals(self, span: int, now: Optional[float] = None) -> Dict[str, float]:
+        """Counters summed over the trailing `span` minutes (must be a configured window)."""
+        i = self.windows.index(min(int(span), self.capacity))
+        tot = self._tot + NF * i
+        now_min = int((time.time() if now is None else now) // 60)
+        if not self._due(now_min):
+            # lock-free read: at worst it sees a concurrent write half applied
+            return dict(zip(FIELDS, self.buf[tot:tot + NF]))
+        with self.lock:
+            self._advance(now_min)
+            return dict(zip(FIELDS, self.buf[tot:tot + NF]))
+
+    def buckets(self, minutes: int, now: Optional[float] = None) -> Iterator[Tuple[int, Dict[str, float]]]:
+        """(epoch minute, counters) for non-empty buckets in the last `minutes`, newest first."""
+        now_min = int((time.time() if now is None else now) // 60)
+        with self.lock:
+            rows = [(m, dict(zip(FIELDS, self.buf[at + 1:at + STRIDE])))
+                    for m, at in self._live(now_min - int(minutes) + 1, now_min)]
+        return iter(rows)
+
+    def clear(self):
+        with self.lock:
+            self.buf[:] = memoryview(bytearray(8 * len(self.buf))).cast("d")
+
+class _FileLock:
+    """Thread lock plus flock(): excludes other threads and other processes."""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        self._thread = threading.Lock()
+
+    def __enter__(self):
+        self._thread.acquire()
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        except BaseException:
+            self._thread.release()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self._thread.release()
+
+def shared_series(path: str, capacity: int, windows: Sequence[int] = ()) -> MinuteSeries:
+    """
+    MinuteSeries over an mmap'd file, shared by every process that opens the
+    same path (e.g. uvicorn workers; put it on /dev/shm to keep it off disk).
+    A file sized for different parameters is reset.
+    """
+    if fcntl is None:
+        raise RuntimeError("shared quality metrics need fcntl (POSIX)")
+    size = 8 * MinuteSeries.size_for(capacity, windows)
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        if os.fstat(fd).st_size != size:
+            os.ftruncate(fd, 0)  # drop counters laid out for other parameters
+            os.ftruncate(fd, size)
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    buf = memoryview(mmap.mmap(fd, size)).cast("d")
+    return MinuteSeries(capacity, windows, buf=buf, lock=_FileLock(fd))
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, APIRouter
 from datetime import datetime
 from typing import Dict
@@ -17,8 +18,18 @@ from .rewards import maybe_mint
 from .indexer import apply_tx, get_balance
 from .critique import critique_text
 from .rubric_client import score_async
+from ...app.utils.http_clients import CLIENTS as http_clients
 
-app = FastAPI(title="lab7-proof OAA Orchestrator", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await http_clients.aclose()  # pooled rubric connections
+
+app = FastAPI(title="lab7-proof OAA Orchestrator", version="0.1.0", lifespan=lifespan)
+
+@app.get("/_health/http")
+def http_pools():
+    return {"ok": True, "pools": http_clients.metrics()}
 
 # Create v1 API router
 api = APIRouter(prefix="/v1")
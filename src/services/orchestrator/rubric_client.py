@@ -1,11 +1,13 @@
-import os, httpx
+import os
 from .models import RubricScores
+from ...app.utils.http_clients import CLIENTS, http_client
 
 BASE = os.getenv("RUBRIC_BASE_URL", "http://localhost:8090")
+CLIENTS.register("rubric", timeout=10)
 
 async def score_async(prompt: str, answer: str, prev_answer: str | None = None) -> RubricScores:
-    async with httpx.AsyncClient(timeout=10) as client:
-        r = await client.post(f"{BASE}/rubric/score", json={"prompt": prompt, "answer": answer, "prev_answer": prev_answer})
-        r.raise_for_status()
-        data = r.json()["scores"]
-        return RubricScores(**data)
+    # pooled keep-alive client (HTTP_RUBRIC_* env), closed by the app lifespan
+    r = await http_client("rubric").post(f"{BASE}/rubric/score", json={"prompt": prompt, "answer": answer, "prev_answer": prev_answer})
+    r.raise_for_status()
+    data = r.json()["scores"]
+    return RubricScores(**data)
@@ -0,0 +1,5 @@
+# tests/conftest.py
+import os
+
+# Keep the OAA store in memory so test runs never touch data/oaa.sqlite3
+os.environ.setdefault("OAA_STORE", "memory")
@@ -0,0 +1,73 @@
+# tests/test_canonical_json.py
+import json
+import math
+import pathlib
+import random
+
+import pytest
+
+from src.app.crypto import ed25519 as crypto
+
+CORPUS = json.loads(
+    (pathlib.Path(__file__).parent / "data" / "canonical_json_corpus.json").read_text(encoding="utf-8")
+)
+
+
+def _reference(obj):
+    # The original encoder every existing attestation was signed over
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        if crypto.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(crypto, "orjson", None)
+    return request.param
+
+
+@pytest.mark.parametrize("case", CORPUS["cases"], ids=[c["name"] for c in CORPUS["cases"]])
+def test_corpus_bytes_digest_and_signature(case, encoder):
+    msg, digest = crypto.canonicalize(case["input"])
+    assert msg == case["canonical"].encode("utf-8")
+    assert digest == case["sha256"]
+    assert crypto.sha256_hex(case["input"]) == case["sha256"]
+
+    if "signature" in case:
+        got_hash, sig = crypto.ed25519_sign(CORPUS["signing_seed_b64"], case["input"])
+        assert got_hash == case["sha256"]
+        assert f"ed25519:{sig}" == case["signature"]
+        assert crypto.ed25519_verify(CORPUS["public_key_b64"], case["input"], case["signature"].split(":", 1)[1])
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        float("nan"),
+        {"x": float("inf")},
+        [1e-7, 1e16, -0.0, 9.999999999999998e15, 0.0001],
+        {"tuple": (1, "a", None)},
+        {2: "int keys", 10: "sort numerically"},
+        2**64,
+        -(2**63) - 1,
+    ],
+)
+def test_edge_values_match_reference(obj, encoder):
+    assert crypto.canonical_bytes(obj) == _reference(obj)
+
+
+def test_random_floats_match_reference(encoder):
+    rng = random.Random(7)
+    values = [rng.choice([1, -1]) * 10 ** rng.uniform(-8, 20) for _ in range(5000)]
+    values = [v for v in values if math.isfinite(v)]
+    assert crypto.canonical_bytes({"v": values}) == _reference({"v": values})
+
+
+def test_types_json_rejects_are_still_rejected(encoder):
+    from datetime import datetime
+
+    with pytest.raises(TypeError):
+        crypto.canonical_bytes({"ts": datetime(2025, 1, 1)})
+
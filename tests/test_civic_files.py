@@ -0,0 +1,58 @@
+# tests/test_civic_files.py
+import gzip
+
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+
+client = TestClient(app)
+ATLAS = open(".civic/atlas.manifest.json", "rb").read()
+
+
+def test_serves_bundle_files_with_validators():
+    for name, ctype in [("atlas.manifest.json", "application/json"), ("biodna.json", "application/json"),
+                        ("virtue_accords.yaml", "application/yaml")]:
+        r = client.get(f"/.civic/{name}", headers={"accept-encoding": "identity"})
+        assert r.status_code == 200, name
+        assert r.headers["content-type"].startswith(ctype)
+        assert r.content == open(f".civic/{name}", "rb").read()
+        assert r.headers["etag"].startswith('"') and r.headers["last-modified"]
+
+    r = client.get("/.civic/atlas.manifest.json", headers={"accept-encoding": "identity"})
+    assert client.get("/.civic/atlas.manifest.json", headers={"if-none-match": r.headers["etag"]}).status_code == 304
+    assert client.get("/.civic/atlas.manifest.json",
+                      headers={"if-modified-since": r.headers["last-modified"]}).status_code == 304
+    assert client.get("/.civic/attestation.json").status_code == 404  # not part of the bundle
+
+
+def test_gzip_variant():
+    r = client.get("/.civic/atlas.manifest.json", headers={"accept-encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["etag"].endswith('-gzip"')
+    assert r.content == ATLAS  # httpx decodes it
+    raw = client.get("/.civic/atlas.manifest.json", headers={"accept-encoding": "gzip;q=0"})
+    assert "content-encoding" not in raw.headers
+
+
+def test_byte_ranges():
+    r = client.get("/.civic/atlas.manifest.json", headers={"range": "bytes=10-19", "accept-encoding": "gzip"})
+    assert r.status_code == 206
+    assert r.content == ATLAS[10:20]
+    assert r.headers["content-range"] == f"bytes 10-19/{len(ATLAS)}"
+    assert "content-encoding" not in r.headers
+
+    assert client.get("/.civic/atlas.manifest.json", headers={"range": "bytes=-5"}).content == ATLAS[-5:]
+    assert client.get("/.civic/atlas.manifest.json", headers={"range": f"bytes={len(ATLAS)}-"}).status_code == 416
+    # last < first is invalid syntax: the header is ignored (RFC 9110 14.2)
+    for bad in ("bytes=10-5", "bytes=x-", "items=0-1"):
+        r = client.get("/.civic/atlas.manifest.json", headers={"range": bad, "accept-encoding": "identity"})
+        assert r.status_code == 200 and r.content == ATLAS and "content-range" not in r.headers, bad
+    # If-Range with a stale validator falls back to the full body
+    r = client.get("/.civic/atlas.manifest.json", headers={"range": "bytes=0-1", "if-range": '"stale"'})
+    assert r.status_code == 200 and r.content == ATLAS
+
+
+def test_head_has_length_but_no_body():
+    r = client.head("/.civic/biodna.json", headers={"accept-encoding": "identity"})
+    assert r.status_code == 200 and r.content == b""
+    assert int(r.headers["content-length"]) == len(open(".civic/biodna.json", "rb").read())
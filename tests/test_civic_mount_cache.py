@@ -0,0 +1,54 @@
+# tests/test_civic_mount_cache.py
+import hashlib
+import os
+
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+from src.app.utils.manifest_cache import MANIFESTS, ManifestCache
+
+client = TestClient(app)
+
+
+def test_mount_signature_and_conditional_get():
+    sha = hashlib.sha256()
+    for p in MANIFESTS:
+        with open(p, "rb") as fh:
+            sha.update(fh.read())
+
+    r = client.get("/api/civic/mount")
+    assert r.status_code == 200
+    assert r.json()["gi_signature"] == "sha256:" + sha.hexdigest()
+    etag = r.headers["etag"]
+
+    r = client.get("/api/civic/mount", headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+    # a different host gets different manifest_urls, so a different tag
+    assert client.get("/api/civic/mount", headers={"host": "other.test"}).headers["etag"] != etag
+
+
+def test_status_reports_cached_readability():
+    body = client.get("/api/civic/status").json()
+    assert body["overall_health"] == "healthy"
+    assert all(m["readable"] for m in body["manifests"].values())
+
+
+def test_cache_reloads_only_on_change(tmp_path):
+    a, b = tmp_path / "a.json", tmp_path / "b.yaml"
+    a.write_text('{"x": 1}')
+    b.write_text("k: v\n")
+    cache = ManifestCache([str(a), str(b)], check_sec=0).refresh()
+    first, version = cache.bundle_sha256, cache.version
+    assert first == hashlib.sha256(b'{"x": 1}k: v\n').hexdigest()
+
+    assert cache.refresh().version == version  # unchanged stat: nothing re-read
+
+    a.write_text("{broken")
+    st = os.stat(a)
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    cache.refresh()
+    assert cache.version == version + 1 and cache.bundle_sha256 != first
+    assert not cache.files[str(a)].readable
+
+    b.unlink()
+    assert not cache.refresh().files[str(b)].exists
@@ -0,0 +1,64 @@
+# tests/test_http_clients.py
+import asyncio
+
+import httpx
+
+from src.app.utils.http_clients import HTTPClients
+
+
+def _registry():
+    reg = HTTPClients()
+    reg.register("up", timeout=3)
+    reg.configure("up", transport=httpx.MockTransport(lambda req: httpx.Response(200, json={"path": req.url.path})),
+                  max_connections=4)
+    return reg
+
+
+def test_client_is_reused_within_a_loop_and_counted():
+    reg = _registry()
+
+    async def run():
+        a, b = reg.get("up"), reg.get("up")
+        assert a is b
+        rs = await asyncio.gather(*(a.get(f"http://up.test/{i}") for i in range(5)))
+        assert [r.json()["path"] for r in rs] == [f"/{i}" for i in range(5)]
+        async with a.stream("GET", "http://up.test/s") as r:
+            assert reg.metrics()["up"]["in_flight"] == 1
+            await r.aread()
+        await reg.aclose()
+        return a
+
+    client = asyncio.run(run())
+    assert client.is_closed
+    m = reg.metrics()["up"]
+    assert (m["requests"], m["errors"], m["in_flight"], m["max_connections"]) == (6, 0, 0, 4)
+    assert m["timeout_sec"] == 3 and m["peak_in_flight"] >= 1
+
+
+def test_new_loop_gets_a_new_client():
+    reg = _registry()
+
+    async def grab():
+        return reg.get("up")
+
+    assert asyncio.run(grab()) is not asyncio.run(grab())
+    assert reg.metrics()["up"]["clients_created"] == 2
+
+
+def test_errors_are_counted(monkeypatch):
+    reg = HTTPClients()
+
+    def down(req):
+        raise httpx.ConnectError("refused")
+
+    reg.configure("down", transport=httpx.MockTransport(down))
+
+    async def run():
+        try:
+            await reg.get("down").get("http://down.test/")
+        except httpx.ConnectError:
+            pass
+
+    asyncio.run(run())
+    m = reg.metrics()["down"]
+    assert (m["errors"], m["in_flight"]) == (1, 0)
@@ -0,0 +1,115 @@
+# tests/test_nonce_store.py
+import asyncio
+import base64
+import uuid
+
+from fastapi.testclient import TestClient
+from nacl import signing
+
+from src.app.crypto.ed25519 import ed25519_sign
+from src.app.main import app
+from src.app.utils import nonce_store
+from src.app.utils.nonce_store import MemoryNonceStore, NonceGuard, TimeSlicedBloom
+
+client = TestClient(app)
+
+
+def _attestation(sk: signing.SigningKey, nonce: str, **extra) -> dict:
+    content = {"type": "oaa.test", "nonce": nonce, **extra}
+    content_hash, sig = ed25519_sign(base64.b64encode(sk.encode()).decode(), content)
+    return {
+        "content": content,
+        "content_hash": f"sha256:{content_hash}",
+        "signature": f"ed25519:{sig}",
+        "public_key_b64": base64.b64encode(sk.verify_key.encode()).decode(),
+    }
+
+
+def test_time_slices_expire_whole_windows():
+    bloom, exact = TimeSlicedBloom(ttl=60, slices=4, bits=1 << 12, hashes=5), MemoryNonceStore(ttl=60, slices=4)
+    for s in (bloom, exact):
+        s.add("k", now=1000)
+    assert bloom.might_contain("k", now=1059) and exact.contains("k", now=1059)
+    assert not bloom.might_contain("other", now=1000) and not exact.contains("other", now=1000)
+    # gone once its window falls out of the last `slices` windows (ttl + one window at most)
+    assert not bloom.might_contain("k", now=1081) and not exact.contains("k", now=1081)
+
+
+def test_guard_without_redis_is_local():
+    guard = NonceGuard(ttl=60, redis_url=None)
+    assert asyncio.run(guard.seen_many(["a", "b", "a"])) == [False, False, True]
+    assert asyncio.run(guard.seen_many(["b", "c"])) == [True, False]
+
+
+def test_guard_pipelines_new_keys_to_redis(monkeypatch):
+    calls = []
+    remote_seen = {"x"}
+
+    async def fake_set_nx_many(keys, ttl):
+        calls.append(list(keys))
+        return [k in remote_seen for k in keys]
+
+    monkeypatch.setattr(nonce_store, "redis_set_nx_many", fake_set_nx_many)
+    guard = NonceGuard(ttl=60, redis_url="redis://test")
+    assert asyncio.run(guard.seen_many(["x", "y", "y"])) == [True, False, True]
+    assert calls == [["x", "y"]]
+    # replays already recorded by this process are answered without a round trip
+    assert asyncio.run(guard.seen_many(["y", "x"])) == [True, True]
+    assert len(calls) == 1
+
+
+def test_guard_reports_unknown_when_redis_is_down(monkeypatch):
+    async def down(keys, ttl):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(nonce_store, "redis_set_nx_many", down)
+    assert asyncio.run(NonceGuard(ttl=60, redis_url="redis://test").seen_many(["k"])) == [None]
+
+
+def test_verify_rejects_replayed_nonce():
+    sk = signing.SigningKey.generate()
+    att = _attestation(sk, str(uuid.uuid4()), voter_id="v1")
+
+    first = client.post("/oaa/verify", json={"attestation": att}).json()
+    assert first["ok"] is True and first["nonce_ok"] is True
+    again = client.post("/oaa/verify", json={"attestation": att}).json()
+    assert again["ok"] is False and again["reason"] == "nonce_replay" and again["nonce_ok"] is False
+
+
+def test_forged_attestation_does_not_burn_nonce():
+    sk = signing.SigningKey.generate()
+    att = _attestation(sk, str(uuid.uuid4()))
+    forged = dict(att, signature=_attestation(sk, "other")["signature"])
+    assert client.post("/oaa/verify", json={"attestation": forged}).json()["reason"] == "signature_invalid"
+    assert client.post("/oaa/verify", json={"attestation": att}).json()["ok"] is True
+
+
+def test_peek_does_not_record(monkeypatch):
+    guard = NonceGuard(ttl=60, redis_url=None)
+    assert asyncio.run(guard.peek_many(["k"])) == [False]
+    assert asyncio.run(guard.peek_many(["k"])) == [False]
+    asyncio.run(guard.seen_many(["k"]))
+    assert asyncio.run(guard.peek_many(["k", "j"])) == [True, False]
+
+    async def down(keys):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(nonce_store, "redis_exists_many", down)
+    assert asyncio.run(NonceGuard(ttl=60, redis_url="redis://test").peek_many(["k"])) == [None]
+
+
+def test_batch_and_audit_report_without_consuming():
+    sk = signing.SigningKey.generate()
+    fresh, used = (_attestation(sk, str(uuid.uuid4()), n=i) for i in range(2))
+    assert client.post("/oaa/verify", json={"attestation": used}).json()["nonce_ok"] is True
+    for _ in range(2):
+        body = client.post("/oaa/verify/batch", json=[fresh, used, fresh]).json()
+        assert body["verified"] == 3
+        assert [r["nonce_seen"] for r in body["results"]] == [False, True, False]
+        assert all(r["nonce_ok"] is None for r in body["results"])
+        audit = client.post("/oaa/verify/audit", json={"attestation": fresh}).json()
+        assert audit["ok"] is True and audit["nonce_seen"] is False
+    # audits did not consume the nonce; /verify still does
+    assert client.post("/oaa/verify", json={"attestation": fresh}).json()["nonce_ok"] is True
+    again = client.post("/oaa/verify", json={"attestation": fresh}).json()
+    assert again["ok"] is False and again["reason"] == "nonce_replay"
@@ -0,0 +1,186 @@
+# tests/test_oaa_echo_index.py
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+from src.app.routers.oaa import echo_index as echo_index_mod
+from src.app.routers.oaa import echo_routes
+from src.app.routers.oaa.echo_index import EchoIndex
+from src.app.utils.echo_log import IDX, SegmentedLog, migrate_json_files, record_ts
+
+client = TestClient(app)
+
+
+def _pulse(ts: str, up=("Lab4",)) -> dict:
+    return {"timestamp": ts, "kind": "echo_heartbeat", "services": {}, "summary": {"up": list(up), "down": []},
+            "fingerprint_sha256": "f" + ts}
+
+
+def _ts(i: int) -> str:
+    return f"2025-10-{1 + i // 24:02d}T{i % 24:02d}:00:00+00:00"
+
+
+def test_segments_rotate_and_read_back(tmp_path):
+    log = SegmentedLog(tmp_path, segment_bytes=400)
+    locs = log.append_many(_pulse(_ts(i)) for i in range(10))
+    assert locs[0] == "echo_00000001.ndjson#0"
+    assert len(log.segments()) > 1
+    assert [log.get(*p)["timestamp"] for p in log.tail(3)] == [_ts(7), _ts(8), _ts(9)]
+    assert log.get(*log.latest())["timestamp"] == _ts(9)
+    assert sum(1 for _ in log) == 10
+
+
+def test_writer_repairs_a_crashed_append(tmp_path):
+    log = SegmentedLog(tmp_path)
+    log.append(_pulse(_ts(0)))
+    seg = log.segments()[-1]
+    with open(tmp_path / f"{seg}.ndjson", "ab") as fh:  # line written, index never updated, then a torn line
+        fh.write(json.dumps(_pulse(_ts(1))).encode() + b"\n{\"torn")
+    log.append(_pulse(_ts(2)))
+    assert [log.get(*p)["timestamp"] for p in log.tail(5)] == [_ts(0), _ts(1), _ts(2)]
+    assert (tmp_path / f"{seg}.idx").stat().st_size == 3 * IDX.size
+
+
+def test_append_does_not_rescan_the_segment(tmp_path, monkeypatch):
+    log = SegmentedLog(tmp_path)
+    log.append(_pulse(_ts(0)))
+    scans = []
+    monkeypatch.setattr(log, "_repair", lambda name: scans.append(name))
+    for i in range(1, 20):
+        log.append(_pulse(_ts(i)))
+    SegmentedLog(tmp_path).append(_pulse(_ts(20)))  # another writer in between
+    log.append(_pulse(_ts(21)))
+    assert scans == []
+    assert sum(1 for _ in log) == 22 and log.get(*log.latest())["timestamp"] == _ts(21)
+
+
+def test_migrate_and_compact(tmp_path):
+    for i in range(30):
+        (tmp_path / f"echo_2025100{1 + i // 24}T{i % 24:02d}0000+0000.json").write_text(json.dumps(_pulse(_ts(i)), indent=2))
+    log = SegmentedLog(tmp_path, segment_bytes=1000)
+    written, skipped = migrate_json_files(tmp_path, log, remove=True)
+    assert (written, skipped) == (30, []) and not list(tmp_path.glob("echo_*.json"))
+
+    before = len(log.segments())
+    done = log.compact(older_than_days=0)
+    assert len(done) == before - 1 and len(log.segments()) == 1  # active segment is kept
+    archived = gzip.open(tmp_path / "archive" / "echo_2025-10-01.ndjson.gz").read().splitlines()
+    assert json.loads(archived[0])["timestamp"] == _ts(0)
+    assert all(json.loads(line)["timestamp"].startswith("2025-10-01") for line in archived)
+
+
+def test_legacy_files_are_imported_at_startup_once(tmp_path, monkeypatch):
+    for i in range(3):
+        (tmp_path / f"echo_20251001T{i:02d}0000+0000.json").write_text(json.dumps(_pulse(_ts(i))))
+    monkeypatch.setattr(echo_routes, "ECHO_LOG_DIR", tmp_path)
+    # serving a request never imports
+    assert EchoIndex(tmp_path, check_sec=0).latest() is None
+    with TestClient(app):
+        pass
+    idx = EchoIndex(tmp_path, check_sec=0)
+    assert idx.latest().timestamp == _ts(2)
+    assert [e.timestamp for e in idx.newest(5)] == [_ts(0), _ts(1), _ts(2)]
+    # a second startup (or another worker) does not import them again
+    echo_routes.import_legacy_pulses()
+    assert SegmentedLog(tmp_path).import_legacy() == (0, [])
+    assert sum(1 for _ in SegmentedLog(tmp_path)) == 3
+    # the operator's cleanup just deletes the already-imported originals
+    assert SegmentedLog(tmp_path).import_legacy(remove=True) == (0, [])
+    assert not list(tmp_path.glob("echo_*.json")) and sum(1 for _ in SegmentedLog(tmp_path)) == 3
+
+
+def test_interrupted_import_resumes_without_duplicates(tmp_path, monkeypatch):
+    from src.app.utils import echo_log
+
+    for i in range(7):
+        (tmp_path / f"echo_20251001T{i:02d}0000+0000.json").write_text(json.dumps(_pulse(_ts(i))))
+    monkeypatch.setattr(echo_log, "MIGRATE_BATCH", 2)
+    real_append = SegmentedLog.append_many
+    calls = []
+
+    def crash_after_second_batch(self, records):
+        calls.append(1)
+        out = real_append(self, records)
+        if len(calls) == 2:
+            raise OSError("disk went away")  # appended, but progress not saved
+        return out
+
+    monkeypatch.setattr(SegmentedLog, "append_many", crash_after_second_batch)
+    try:
+        SegmentedLog(tmp_path).import_legacy()
+    except OSError:
+        pass
+    monkeypatch.setattr(SegmentedLog, "append_many", real_append)
+    log = SegmentedLog(tmp_path)
+    assert (tmp_path / "echo.importing").read_text().strip() == "echo_20251001T010000+0000.json"
+    assert log.import_legacy() == (3, [])
+    assert [log.get(*pos)["timestamp"] for pos in log] == [_ts(i) for i in range(7)]
+    assert not (tmp_path / "echo.importing").exists() and (tmp_path / "echo.imported").exists()
+
+
+def test_index_follows_the_log(tmp_path):
+    log = SegmentedLog(tmp_path)
+    idx = EchoIndex(tmp_path, check_sec=0)
+    assert idx.latest() is None
+    log.append(_pulse(_ts(0)))
+    log.append(_pulse(_ts(1)))
+    assert idx.latest().timestamp == _ts(1)
+    assert [e.name for e in idx.newest(5)] == ["echo_00000001.ndjson#0", "echo_00000001.ndjson#1"]
+
+
+def test_latest_304_needs_no_disk_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(echo_routes, "ECHO_LOG_DIR", tmp_path)
+    monkeypatch.setattr(echo_index_mod, "CHECK_SEC", 0.0)
+    SegmentedLog(tmp_path).append(_pulse(_ts(0)))
+    r = client.get("/echo/latest")
+    assert r.status_code == 200 and r.json()["kind"] == "echo_heartbeat"
+    etag = r.headers["etag"]
+
+    reads = []
+    monkeypatch.setattr(SegmentedLog, "get", lambda self, *pos: reads.append(pos))
+    r = client.get("/oaa/echo/latest", headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b"" and reads == []
+
+    body = client.get("/echo/list?limit=5").json()
+    assert body["count"] == 1 and body["items"][0]["summary"]["up"] == ["Lab4"] and reads == []
+
+
+def test_latest_404_when_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(echo_routes, "ECHO_LOG_DIR", tmp_path / "missing")
+    assert client.get("/echo/latest").status_code == 404
+    assert client.get("/echo/list").json() == {"count": 0, "items": []}
+
+
+def test_seek_bisects_across_segments(tmp_path):
+    log = SegmentedLog(tmp_path, segment_bytes=600)
+    log.append_many(_pulse(_ts(i)) for i in range(60))
+    assert len(log.segments()) > 3
+    pos = log.seek(record_ts({"timestamp": _ts(37)}))
+    assert log.get(*pos)["timestamp"] == _ts(37)
+    assert log.seek(1e12) is None
+
+
+def test_range_streams_ndjson_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(echo_routes, "ECHO_LOG_DIR", tmp_path)
+    SegmentedLog(tmp_path, segment_bytes=600).append_many(_pulse(_ts(i)) for i in range(60))
+
+    r = client.get("/oaa/echo/range", params={"from": _ts(10), "to": _ts(30), "limit": 15})
+    assert r.status_code == 200 and r.headers["content-type"].startswith("application/x-ndjson")
+    first = [json.loads(line)["timestamp"] for line in r.text.splitlines()]
+    assert first == [_ts(i) for i in range(10, 25)] and r.headers["x-record-count"] == "15"
+
+    r = client.get("/oaa/echo/range", params={"to": _ts(30), "cursor": r.headers["x-next-cursor"]})
+    assert [json.loads(line)["timestamp"] for line in r.text.splitlines()] == [_ts(i) for i in range(25, 30)]
+    assert "x-next-cursor" not in r.headers
+
+    # epoch bounds work too, and an empty window is an empty stream
+    empty = client.get("/echo/range", params={"from": "4102444800"})
+    assert empty.status_code == 200 and empty.text == ""
+
+
+def test_range_rejects_bad_input(tmp_path, monkeypatch):
+    monkeypatch.setattr(echo_routes, "ECHO_LOG_DIR", tmp_path)
+    assert client.get("/echo/range", params={"from": "yesterday"}).status_code == 400
+    assert client.get("/echo/range", params={"cursor": "!!"}).status_code == 400
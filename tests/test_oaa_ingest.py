@@ -0,0 +1,58 @@
+# tests/test_oaa_ingest.py
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.app.routers.oaa import ingest, store as store_mod
+from src.app.routers.oaa.ingest import SnapshotFormatError, ingest_url, iter_json_array, new_job
+from src.app.routers.oaa.store import MemoryStore
+from src.app.utils.http_clients import CLIENTS
+
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def _parse(data: bytes, size: int):
+    async def run():
+        return [x async for x in iter_json_array(_chunks(data, size))]
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 4096])
+def test_iter_json_array_handles_any_chunking(size):
+    items = [{"name": "Ünïcode ✅", "n": 1}, 12345, "s,]", [1, [2]], None, {"nested": {"a": "}"}}]
+    data = (" \n" + json.dumps(items, ensure_ascii=False, indent=1) + "\n").encode("utf-8")
+    assert _parse(data, size) == items
+    assert _parse(b"[]", size) == []
+
+
+@pytest.mark.parametrize("bad", [b'{"a": 1}', b"[1, 2", b"[1 2]", b'[{"a": }]'])
+def test_iter_json_array_rejects_malformed(bad):
+    with pytest.raises(SnapshotFormatError):
+        _parse(bad, 2)
+
+
+def test_ingest_url_streams_chunks_into_store(monkeypatch):
+    catalog = [{"name": f"API {i}", "domain": "x.example", "license": "MIT"} for i in range(25)]
+    catalog.insert(3, {"name": "bad auth", "domain": "x.example", "auth": "bogus"})
+    body = json.dumps(catalog).encode()
+
+    def handler(request):
+        return httpx.Response(200, content=_chunks(body, 64))
+
+    monkeypatch.setattr(CLIENTS, "_configs", dict(CLIENTS._configs))  # restored afterwards
+    CLIENTS.configure("ingest", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(ingest, "INGEST_CHUNK", 10)
+    st = MemoryStore()
+    monkeypatch.setattr(store_mod, "STORE", st)
+
+    results = []
+    job = asyncio.run(ingest_url("http://catalog.test/apis.json", new_job("http://catalog.test/apis.json"), collect=results))
+    assert job.status == "done", job.error
+    assert (job.received, job.added, job.skipped, job.chunks) == (26, 25, 1, 3)
+    assert len(results) == 25
+    assert st.get("api-7") is not None
@@ -0,0 +1,57 @@
+# tests/test_oaa_keyset.py
+import base64
+import json
+import os
+
+from fastapi.testclient import TestClient
+from nacl import signing
+
+from src.app.main import app
+from src.app.routers.oaa import keys as keys_mod
+from src.app.routers.oaa.keys import KeysetService
+
+client = TestClient(app)
+
+
+def _pub(sk: signing.SigningKey) -> str:
+    return base64.b64encode(sk.verify_key.encode()).decode()
+
+
+def test_keyset_reloads_only_on_mtime_change(tmp_path):
+    path = tmp_path / "keys.json"
+    a, b = signing.SigningKey.generate(), signing.SigningKey.generate()
+    path.write_text(json.dumps([{"kid": "v0", "x": _pub(a)}]))
+
+    ks = KeysetService(path).refresh()
+    first_body = ks.body
+    assert "v0" in ks.by_kid
+    assert ks.refresh().body is first_body  # unchanged file: no reload
+
+    path.write_text(json.dumps([{"kid": "v0", "x": _pub(a)}, {"kid": "v-1", "x": _pub(b)}]))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    ks.refresh()
+    assert _pub(b) in ks.by_x
+    assert [e[2] for e in ks.candidates("v-1")] == [1]
+
+
+def test_key_history_uses_kid_and_well_known_etag(tmp_path, monkeypatch):
+    old = signing.SigningKey.generate()
+    other = signing.SigningKey.generate()
+    path = tmp_path / "keys.json"
+    path.write_text(json.dumps([{"kid": "v0", "x": _pub(other)}, {"kid": "v-old", "x": _pub(old)}]))
+    monkeypatch.setattr(keys_mod, "_service", KeysetService(path))
+
+    sig = base64.b64encode(old.sign(b"hello").signature).decode()
+    r = client.post("/oaa/verify/key-history", json={"payload": "hello", "signature": sig, "kid": "v-old"})
+    body = r.json()
+    assert body["verified"] is True
+    assert body["attempted"] == []
+    assert body["signer"]["history_index"] == 1
+
+    r = client.get("/oaa/.well-known/oaa-keys.json")
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert len(r.json()["keys"]) >= 2
+    r = client.get("/oaa/.well-known/oaa-keys.json", headers={"If-None-Match": etag})
+    assert r.status_code == 304
@@ -0,0 +1,88 @@
+# tests/test_oaa_outbox.py
+import asyncio
+import base64
+import importlib
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from nacl import signing
+
+from src.app.routers.oaa import outbox as ob
+from src.app.routers.oaa.models import Source, SourceScore
+from src.app.routers.oaa.store import upsert_source
+
+
+@pytest.fixture
+def box(tmp_path, monkeypatch):
+    b = ob.Outbox(str(tmp_path / "outbox.sqlite3"))
+    monkeypatch.setattr(ob, "_outbox", b)
+    monkeypatch.setenv("LEDGER_URL", "http://ledger.test")
+    return b
+
+
+def _drain(box, handler):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await ob.OutboxWorker().drain_once(box, client)
+    return asyncio.run(run())
+
+
+def test_claim_leases_entries(box):
+    seqs = [box.enqueue("t", {"n": i}) for i in range(3)]
+    first = box.claim(2)
+    assert [s for s, _, _ in first] == seqs[:2]
+    assert [s for s, _, _ in box.claim(10)] == seqs[2:]
+    assert box.claim(10) == []
+    # an expired lease (crashed worker) makes the entry claimable again
+    assert [s for s, _, _ in box.claim(10, now=ob.time.time() + ob.OUTBOX_LEASE_SEC + 1)] == seqs
+
+
+def test_drain_marks_sent_retries_and_dead(box):
+    ok, flaky, bad = (box.enqueue("t", {"n": i}) for i in range(3))
+    statuses = {0: 200, 1: 503, 2: 400}
+
+    def handler(request: httpx.Request):
+        n = json.loads(request.content)["n"]
+        return httpx.Response(statuses[n], json={"receipt": n})
+
+    assert _drain(box, handler) == 3
+    assert box.get(ok)["status"] == "sent" and box.get(ok)["receipt"] == {"receipt": 0}
+    retry = box.get(flaky)
+    assert retry["status"] == "pending" and retry["attempts"] == 1 and retry["next_at"] > retry["created"]
+    assert box.get(bad)["status"] == "dead"
+    assert box.stats()["pending"] == 1
+
+    # not due yet, so nothing to send
+    assert _drain(box, handler) == 0
+
+
+def test_gives_up_after_max_attempts(box, monkeypatch):
+    monkeypatch.setattr(ob, "OUTBOX_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(ob, "OUTBOX_BACKOFF_SEC", 0)
+    seq = box.enqueue("t", {"n": 1})
+
+    def down(request):
+        raise httpx.ConnectError("refused")
+
+    _drain(box, down)
+    _drain(box, down)
+    entry = box.get(seq)
+    assert entry["status"] == "dead" and entry["attempts"] == 2 and "refused" in entry["last_error"]
+
+
+def test_repute_vote_enqueues(box, monkeypatch):
+    sk = signing.SigningKey.generate()
+    monkeypatch.setenv("OAA_ED25519_PRIVATE_B64", base64.b64encode(sk.encode()).decode())
+    monkeypatch.setenv("OAA_ED25519_PUBLIC_B64", base64.b64encode(sk.verify_key.encode()).decode())
+    upsert_source(Source(id="vote:1", name="V", domain="v.example"),
+                  SourceScore(source_id="vote:1", scores={"reputation": 0.7}, composite=0.7, policy_gate="pass"))
+    app = importlib.import_module("src.app.main").app
+
+    r = TestClient(app).post("/oaa/repute/vote", json={"source_id": "vote:1", "voter_id": "u1", "stake_gic": 1, "opinion": "up"})
+    assert r.status_code == 200
+    entry_id = r.json()["attestation"]["ledger_outbox"]["id"]
+    entry = TestClient(app).get(f"/oaa/ledger/outbox/{entry_id}").json()
+    assert entry["kind"] == "oaa.repute.vote" and entry["status"] == "pending"
+    assert box.claim(10)[0][1]["content"]["source_id"] == "vote:1"
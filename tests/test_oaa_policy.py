@@ -0,0 +1,45 @@
+# tests/test_oaa_policy.py
+import os
+from datetime import datetime, timedelta
+
+from src.app.routers.oaa.models import Source
+from src.app.routers.oaa.policy import Policy, apply_policy
+from src.app.routers.oaa.scoring import score_source
+
+
+def test_default_policy_is_cached_and_gates_sources():
+    pol = Policy.load()
+    assert Policy.load() is pol
+
+    good = Source(id="a", name="A", domain="a.example", license="MIT", owner={"org": "A"},
+                  last_update=datetime.utcnow() - timedelta(days=3), meta={"rate_limit": "10"})
+    leak = Source(id="b", name="B", domain="b.example", license="MIT", tags=["pii_leak"])
+    sc, reasons = apply_policy(pol, good, score_source(good))
+    assert "allow-open-licensed:pass" in reasons
+    sc, reasons = apply_policy(pol, leak, score_source(leak))
+    assert sc.policy_gate == "deny"
+    assert "block-pii-leak:deny" in reasons
+
+
+def test_policy_reloads_on_change_and_reports_bad_rules(tmp_path):
+    path = tmp_path / "policy.yaml"
+    path.write_text("rules:\n  - id: r1\n    when: \"composite > 2\"\n    effect: deny\ndefaults: pass\n")
+    src = Source(id="c", name="C", domain="c.example")
+    first = Policy.load(path)
+    assert first.eval(src, score_source(src)) == ("pass", [])
+
+    path.write_text("rules:\n  - id: r1\n    when: \"composite >\"\n    effect: deny\n"
+                    "  - id: r2\n    when: \"float(meta.get('x', '0')) == 0\"\n    effect: review\ndefaults: pass\n")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    second = Policy.load(path)
+    assert second is not first
+    assert second.eval(src, score_source(src)) == ("review", ["r1:error", "r2:review"])
+
+
+def test_rules_that_fail_to_compile_report_errors():
+    pol = Policy({"rules": [{"id": "nul", "when": "composite\x00 > 0", "effect": "deny"},
+                            {"id": "num", "when": 42, "effect": "deny"},
+                            {"id": "ok", "when": "True", "effect": "review"}], "defaults": "pass"})
+    src = Source(id="d", name="D", domain="d.example")
+    assert pol.eval(src, score_source(src)) == ("review", ["nul:error", "num:error", "ok:review"])
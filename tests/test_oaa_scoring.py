@@ -0,0 +1,58 @@
+# tests/test_oaa_scoring.py
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.app.routers.oaa import scoring
+from src.app.routers.oaa.models import Endpoint, Source
+from src.app.routers.oaa.scoring import score_source, score_sources_batch
+
+
+def _sources(n: int):
+    rng = random.Random(42)
+    now = datetime(2025, 10, 14, 12, 0, 0)
+    out = []
+    for i in range(n):
+        meta = {}
+        if rng.random() < 0.5:
+            meta["rate_limit"] = "10/s"
+        if rng.random() < 0.5:
+            meta["uptime"] = rng.choice(["0.999", "1.5", "-2", "nan", "n/a", str(rng.random())])
+        if rng.random() < 0.3:
+            meta["reputation"] = str(rng.random())
+        out.append(Source(
+            id=f"src:{i}",
+            name=f"S{i}",
+            domain=rng.choice(["", "x.example"]),
+            license=rng.choice([None, "", "MIT", "cc0", "GPL-3.0", "Apache-2.0"]),
+            owner=rng.choice([None, {}, {"org": "o"}, {"contact": "c"}, {"name": "n"}]),
+            endpoints=rng.choice([[], [Endpoint(path="/a")], [Endpoint(path="/a", schema="openapi")]]),
+            meta=meta,
+            last_update=rng.choice([None, now + timedelta(days=2), now - timedelta(days=rng.randint(0, 400))]),
+            tags=rng.sample(["geo", "unsafe", "hate", "pii_leak", "ok"], k=rng.randint(0, 3)),
+        ))
+    return now, out
+
+
+def test_batch_scores_are_identical_to_scalar():
+    now, sources = _sources(3000)
+    batch = score_sources_batch(sources, now)
+    assert [b.model_dump() for b in batch] == [score_source(s, now).model_dump() for s in sources]
+
+
+def test_batch_falls_back_without_numpy(monkeypatch):
+    monkeypatch.setattr(scoring, "np", None)
+    now, sources = _sources(50)
+    assert score_sources_batch(sources, now) == [score_source(s, now) for s in sources]
+    assert score_sources_batch([], now) == []
+
+
+def test_batch_propagates_bad_reputation_like_scalar():
+    if scoring.np is None:
+        pytest.skip("numpy not installed")
+    src = Source(id="x", name="x", domain="x", meta={"reputation": "high"})
+    with pytest.raises(ValueError):
+        score_source(src)
+    with pytest.raises(ValueError):
+        score_sources_batch([src])
@@ -0,0 +1,119 @@
+# tests/test_oaa_state_delta.py
+import asyncio
+import base64
+from datetime import datetime
+
+import httpx
+import pytest
+from nacl import signing
+
+from src.app.routers.oaa import outbox as ob, state, store
+from src.app.routers.oaa.models import Source, SourceScore
+
+
+def _pair(i: int, composite: float = 0.8):
+    src = Source(id=f"src:{i}", name=f"S{i}", domain=f"s{i}.example", last_update=datetime(2025, 1, 1))
+    sc = SourceScore(source_id=src.id, scores={"reputation": 0.7}, composite=composite, policy_gate="pass")
+    return src, sc
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def fresh_store(request, tmp_path, monkeypatch):
+    s = store.MemoryStore() if request.param == "memory" else store.SQLiteStore(str(tmp_path / "oaa.sqlite3"))
+    monkeypatch.setattr(store, "STORE", s)
+    sk = signing.SigningKey.generate()
+    monkeypatch.setenv("OAA_ED25519_PRIVATE_B64", base64.b64encode(sk.encode()).decode())
+    monkeypatch.setenv("OAA_ED25519_PUBLIC_B64", base64.b64encode(sk.verify_key.encode()).decode())
+    monkeypatch.setenv("LEDGER_URL", "http://ledger.test")
+    monkeypatch.setattr(ob, "_outbox", ob.Outbox(str(tmp_path / "outbox.sqlite3")))
+    return s
+
+
+def _deliver(status: int = 200) -> int:
+    """Drain the outbox once against a ledger answering `status`."""
+    async def run():
+        transport = httpx.MockTransport(lambda req: httpx.Response(status, json={"ok": status < 400}))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await ob.OutboxWorker().drain_once(ob.outbox(), client)
+    return asyncio.run(run())
+
+
+def test_delta_since_anchor(fresh_store):
+    fresh_store.upsert_many([_pair(i) for i in range(5)])
+    att = asyncio.run(state.anchor_state("delta"))
+    # no previous anchor: falls back to the snapshot header
+    assert att["content"]["type"] == "oaa.state.snapshot"
+    base = att["content"]["merkle_root"]
+    assert fresh_store.last_anchor() is None  # recorded only once the ledger has it
+    assert _deliver() == 1
+    assert fresh_store.last_anchor()["root"] == base
+
+    assert state.build_delta(base)["added"] == []
+    fresh_store.upsert(*_pair(9))
+    fresh_store.update_score(_pair(2, 0.1)[1])
+    fresh_store.record_vote("src:3", {"opinion": "up", "stake_gic": 1.0})
+
+    delta = state.build_delta("sha256:" + base)
+    assert [i["source"]["id"] for i in delta["added"]] == ["src:9"]
+    assert [i["source"]["id"] for i in delta["changed"]] == ["src:2", "src:3"]
+    assert delta["removed"] == []
+    assert delta["merkle_root"] == fresh_store.state_root()[0]
+    assert state.build_delta("00" * 32) is None
+
+    att = asyncio.run(state.anchor_state("delta"))
+    assert att["content"]["type"] == "oaa.state.delta"
+    assert att["content"]["base_root"] == base
+    assert len(att["content"]["changed"]) == 2
+    _deliver()
+    assert fresh_store.last_anchor()["root"] == delta["merkle_root"]
+
+
+def test_dead_lettered_anchor_is_not_recorded(fresh_store):
+    fresh_store.upsert(*_pair(1))
+    asyncio.run(state.anchor_state("full"))
+    _deliver()
+    base = fresh_store.last_anchor()["root"]
+
+    fresh_store.upsert(*_pair(2))
+    att = asyncio.run(state.anchor_state("delta"))
+    assert att["content"]["base_root"] == base
+    _deliver(400)  # permanent rejection: dead-lettered
+    assert ob.outbox().stats()["dead"] == 1
+    assert fresh_store.last_anchor()["root"] == base
+    # the next delta is still based on what the ledger actually has
+    assert asyncio.run(state.anchor_state("delta"))["content"]["base_root"] == base
+
+
+def test_anchor_not_recorded_without_ledger_url(fresh_store, monkeypatch):
+    monkeypatch.delenv("LEDGER_URL")
+    fresh_store.upsert(*_pair(1))
+    att = asyncio.run(state.anchor_state("full"))
+    assert att["ledger_outbox"]["anchored"] is False
+    assert fresh_store.last_anchor() is None
+
+
+def test_anchor_not_recorded_when_ledger_fails(fresh_store, monkeypatch):
+    fresh_store.upsert(*_pair(1))
+
+    async def boom(att):
+        raise RuntimeError("ledger down")
+
+    monkeypatch.setattr(state, "anchor_to_ledger", boom)
+    att = asyncio.run(state.anchor_state("full"))
+    assert att["ledger_error"] == "ledger down"
+    assert fresh_store.last_anchor() is None
+    assert _deliver() == 0
+    assert fresh_store.last_anchor() is None
+
+
+def test_anchor_history_is_bounded(fresh_store, monkeypatch):
+    monkeypatch.setattr(store, "ANCHOR_KEEP", 2)
+    roots = []
+    for i in range(4):
+        fresh_store.upsert(*_pair(i))
+        root, leaves = fresh_store.state_leaves()
+        fresh_store.record_anchor(root, leaves)
+        roots.append(root)
+    assert fresh_store.anchored_leaves(roots[0]) is None
+    assert fresh_store.anchored_leaves(roots[1]) is None
+    assert len(fresh_store.anchored_leaves(roots[3])) == 4
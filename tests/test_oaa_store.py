@@ -0,0 +1,91 @@
+# tests/test_oaa_store.py
+from datetime import datetime
+
+import pytest
+
+from src.app.routers.oaa.models import Source, SourceScore
+from src.app.routers.oaa.store import MemoryStore, RepAggregate, SQLiteStore, reputation_from
+
+
+def _pair(i: int, composite: float, gate: str):
+    src = Source(id=f"src:{i}", name=f"S{i}", domain=f"s{i}.example", last_update=datetime(2025, 1, i % 28 + 1))
+    sc = SourceScore(source_id=src.id, scores={"reputation": 0.7}, composite=composite, policy_gate=gate)
+    return src, sc
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore()
+    return SQLiteStore(str(tmp_path / "oaa.sqlite3"))
+
+
+def test_list_filters_and_orders(store):
+    for i, (c, g) in enumerate([(0.9, "pass"), (0.5, "deny"), (0.9, "review"), (0.85, "pass")]):
+        store.upsert(*_pair(i, c, g))
+
+    assert [s.id for s, _ in store.list_sources()] == ["src:0", "src:2", "src:3", "src:1"]
+    assert [s.id for s, _ in store.list_sources(min_score=0.8, gate="pass")] == ["src:0", "src:3"]
+    assert [s.id for s, _ in store.iter_all()] == ["src:0", "src:1", "src:2", "src:3"]
+
+
+def test_update_score_and_votes(store):
+    src, sc = _pair(1, 0.8, "review")
+    store.upsert(src, sc)
+    sc.scores["reputation"] = 0.9
+    sc.policy_gate = "pass"
+    store.update_score(sc)
+    got_src, got_sc = store.get("src:1")
+    assert got_src == src
+    assert got_sc.scores["reputation"] == 0.9
+    assert store.list_sources(gate="pass")[0][0].id == "src:1"
+
+    store.record_vote("src:1", {"opinion": "up", "stake_gic": 1.0})
+    store.record_vote("src:1", {"opinion": "down", "stake_gic": 2.0})
+    assert store.votes_count("src:1") == 2
+    assert [v["opinion"] for v in store.get_votes("src:1")] == ["up", "down"]
+    assert store.get("missing") is None
+
+
+def test_sqlite_store_persists_across_instances(tmp_path):
+    path = str(tmp_path / "oaa.sqlite3")
+    SQLiteStore(path).upsert(*_pair(7, 0.95, "pass"))
+    assert SQLiteStore(path).get("src:7")[1].composite == 0.95
+
+
+def test_upsert_many_overwrites(store):
+    store.upsert_many([_pair(1, 0.5, "deny"), _pair(2, 0.6, "deny")])
+    store.upsert_many([_pair(1, 0.99, "pass")])
+    assert [(s.id, sc.policy_gate) for s, sc in store.list_sources()] == [("src:1", "pass"), ("src:2", "deny")]
+
+
+def test_reputation_aggregate_tracks_vote_log(store):
+    votes = [
+        {"opinion": "up", "stake_gic": 10.0},
+        {"opinion": "down", "stake_gic": 2.5},
+        {"opinion": "neutral", "stake_gic": 1.0},
+        {"opinion": "up", "stake_gic": 0.0},
+    ]
+    for v in votes:
+        store.record_vote("src:1", v)
+
+    assert store.rep_aggregate("src:1") == RepAggregate(up=2, down=1, neutral=1, stake_sum=6.5)
+    assert store.votes_count("src:1") == 4
+    assert store.rebuild_reputation() == {}
+    # legacy O(n) formula
+    assert reputation_from(store.rep_aggregate("src:1")) == pytest.approx(0.7 + 0.15 * (1 / 4) + 0.001 * 6.5)
+
+
+def test_rebuild_reputation_repairs_drift(tmp_path):
+    path = str(tmp_path / "oaa.sqlite3")
+    st = SQLiteStore(path)
+    st.record_vote("src:1", {"opinion": "up", "stake_gic": 3.0})
+    st._conn().execute("UPDATE reputation SET up = 5")
+
+    mismatches = st.rebuild_reputation(write=True)
+    assert mismatches["src:1"][1] == RepAggregate(up=1, stake_sum=3.0)
+    assert st.rebuild_reputation() == {}
+
+    # databases without aggregates are seeded from the vote log on open
+    st._conn().execute("DELETE FROM reputation")
+    assert SQLiteStore(path).rep_aggregate("src:1").up == 1
@@ -0,0 +1,70 @@
+# tests/test_oaa_verify_batch.py
+import base64
+import json
+
+from fastapi.testclient import TestClient
+from nacl import signing
+
+from src.app.crypto.ed25519 import ed25519_sign
+from src.app.main import app
+
+client = TestClient(app)
+
+
+def _attestation(sk: signing.SigningKey, n: int) -> dict:
+    priv = base64.b64encode(sk.encode()).decode()
+    pub = base64.b64encode(sk.verify_key.encode()).decode()
+    content = {"type": "oaa.test", "n": n}
+    content_hash, sig = ed25519_sign(priv, content)
+    return {
+        "content": content,
+        "content_hash": f"sha256:{content_hash}",
+        "signature": f"ed25519:{sig}",
+        "public_key_b64": pub,
+    }
+
+
+def test_batch_matches_single_verify_in_order():
+    keys = [signing.SigningKey.generate() for _ in range(3)]
+    atts = [_attestation(keys[i % 3], i) for i in range(200)]
+    atts[5]["content"]["n"] = -1          # hash mismatch
+    atts[7]["signature"] = atts[8]["signature"]  # wrong signature for content
+    del atts[9]["public_key_b64"]         # missing field
+
+    r = client.post("/oaa/verify/batch", json={"attestations": atts})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["count"] == 200
+    assert body["verified"] == 197
+    assert body["ok"] is False
+
+    for att, res in zip(atts, body["results"]):
+        single = client.post("/oaa/verify", json={"attestation": att}).json()
+        assert res == single
+
+    assert body["results"][5]["reason"] == "hash_mismatch"
+    assert body["results"][7]["reason"] == "signature_invalid"
+    assert body["results"][9]["reason"].startswith("missing_field")
+
+
+def test_batch_accepts_ndjson_and_plain_list():
+    sk = signing.SigningKey.generate()
+    atts = [_attestation(sk, i) for i in range(5)]
+
+    ndjson = "\n".join(json.dumps(a) for a in atts) + "\n"
+    r = client.post(
+        "/oaa/verify/batch",
+        content=ndjson,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    assert r.json()["verified"] == 5
+
+    r = client.post("/oaa/verify/batch", json=atts)
+    assert r.status_code == 200
+    assert r.json()["ok"] is True
+
+
+def test_batch_rejects_malformed_body():
+    r = client.post("/oaa/verify/batch", content=b"{not json", headers={"content-type": "application/json"})
+    assert r.status_code == 400
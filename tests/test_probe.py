@@ -0,0 +1,106 @@
+# tests/test_probe.py
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.app.utils.http_clients import CLIENTS, http_client
+from src.app.utils.probe import ProbeEngine, ProbeTarget, probe_services
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route the "probe" client to a mock; returns the list of requested hosts."""
+    monkeypatch.setattr(CLIENTS, "_configs", dict(CLIENTS._configs))  # restored afterwards
+    seen = []
+    plan = {}
+
+    async def handler(req):
+        host = req.url.host
+        seen.append(host)
+        step = plan.get(host, [(0, 200)])
+        delay, status = step[min(seen.count(host), len(step)) - 1]
+        await asyncio.sleep(delay)
+        if status is None:
+            raise httpx.ConnectError("refused")
+        return httpx.Response(status)
+
+    CLIENTS.configure("probe", transport=httpx.MockTransport(handler))
+    return plan, seen
+
+
+def _sweep(engine, targets):
+    async def run():
+        try:
+            return await engine.sweep(targets)
+        finally:
+            await CLIENTS.aclose()
+    return asyncio.run(run())
+
+
+def test_sweep_is_concurrent_and_keeps_order(upstream):
+    plan, _ = upstream
+    plan.update({"a": [(0.3, 200)], "b": [(0.3, 503)], "c": [(0.3, 200)]})
+    targets = [ProbeTarget(n, f"http://{n}/health", timeout=2, retries=0) for n in "abc"]
+    t0 = time.perf_counter()
+    res = _sweep(ProbeEngine(hedge_after=0, jitter=0), targets)
+    assert time.perf_counter() - t0 < 0.8  # ~0.3s, not 0.9s
+    assert [(r.name, r.status, r.error) for r in res] == [("a", "UP", None), ("b", "DOWN", "HTTP 503"), ("c", "UP", None)]
+    assert res[0].latency_ms >= 250
+
+
+def test_slow_attempt_is_hedged(upstream):
+    plan, seen = upstream
+    plan["s"] = [(2.0, 200), (0, 200)]  # first attempt hangs, the hedge answers
+    t0 = time.perf_counter()
+    (r,) = _sweep(ProbeEngine(hedge_after=0.1, jitter=0), [ProbeTarget("s", "http://s/", timeout=5, retries=1)])
+    assert time.perf_counter() - t0 < 1.0
+    assert (r.status, r.attempts) == ("UP", 2) and seen == ["s", "s"]
+
+
+def test_fast_failure_is_retried_at_once(upstream):
+    plan, seen = upstream
+    plan["f"] = [(0, None), (0, 200)]
+    (r,) = _sweep(ProbeEngine(hedge_after=10, jitter=0), [ProbeTarget("f", "http://f/", timeout=5, retries=1)])
+    assert (r.status, r.attempts) == ("UP", 2) and len(seen) == 2
+
+    plan["g"] = [(0, None)]
+    (r,) = _sweep(ProbeEngine(hedge_after=10, jitter=0), [ProbeTarget("g", "http://g/", timeout=5, retries=2)])
+    assert (r.status, r.attempts) == ("DOWN", 3) and "refused" in r.error
+
+
+def test_deadline_caps_a_probe(upstream):
+    plan, _ = upstream
+    plan["h"] = [(5, 200)]
+    t0 = time.perf_counter()
+    (r,) = _sweep(ProbeEngine(hedge_after=0, jitter=0),
+                  [ProbeTarget("h", "http://h/", timeout=5, retries=0, deadline=0.2)])
+    assert time.perf_counter() - t0 < 1.0
+    assert r.status == "DOWN" and "deadline" in r.error
+
+
+def test_probe_services_works_inside_a_running_loop(upstream):
+    plan, _ = upstream
+    plan["x"] = [(0, 500)]
+
+    async def caller():  # e.g. the MCP server calling a sync handler
+        return probe_services({"ok": "http://ok/", "x": "http://x/"}, timeout=2, retries=0)
+
+    out = asyncio.run(caller())
+    assert out["ok"]["status"] == "UP" and out["ok"]["url"] == "http://ok/"
+    assert out["x"] == {"status": "DOWN", "latency_ms": out["x"]["latency_ms"], "error": "HTTP 500", "url": "http://x/"}
+
+
+def test_probe_services_keeps_its_client_between_sweeps(upstream, monkeypatch):
+    monkeypatch.setattr(CLIENTS, "_clients", dict(CLIENTS._clients))  # restored afterwards
+
+    async def other_loop_client():
+        return http_client("ledger")
+
+    ledger = asyncio.run(other_loop_client())  # another loop's client in the registry
+    before = CLIENTS.metrics()["probe"]["clients_created"]
+    for _ in range(3):
+        assert probe_services({"ok": "http://ok/"}, timeout=2, retries=0)["ok"]["status"] == "UP"
+    assert CLIENTS.metrics()["probe"]["clients_created"] == before + 1
+    assert CLIENTS._clients["ledger"][0] is ledger  # not dropped by the sweeps
@@ -0,0 +1,172 @@
+# tests/test_quality_metrics.py
+import multiprocessing
+
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+from src.app.routers import quality_metrics
+from src.app.routers.quality_metrics import QualityMetricsService
+from src.app.utils.quality_series import MinuteSeries, shared_series
+
+T0 = 1_700_000_000.0  # minute-aligned epoch
+
+
+def test_windows_expire_and_ring_reuses_slots():
+    s = MinuteSeries(capacity=10, windows=(3,))
+    s.add({"outputs": 1}, now=T0)
+    s.add({"outputs": 2, "duplicates": 1}, now=T0 + 60)
+    assert s.totals(10, now=T0 + 60)["outputs"] == 3
+    assert s.totals(3, now=T0 + 180)["outputs"] == 2  # first minute left the 3-minute window
+    assert s.totals(10, now=T0 + 180)["outputs"] == 3
+    s.add({"outputs": 5}, now=T0 + 600)  # reuses the slot of minute 0
+    assert s.totals(10, now=T0 + 600)["outputs"] == 7
+    assert [m for m, _ in s.buckets(10, now=T0 + 600)] == [int(T0 // 60) + 10, int(T0 // 60) + 1]
+    # idle past the whole ring: everything ages out
+    assert s.totals(10, now=T0 + 3600)["outputs"] == 0
+
+
+def test_late_and_future_events_are_dropped():
+    s = MinuteSeries(capacity=5)
+    s.add({"outputs": 1}, ts=T0 - 600, now=T0)
+    s.add({"outputs": 1}, ts=T0 + 120, now=T0)
+    s.add({"outputs": 1}, ts=T0 - 120, now=T0)
+    assert s.totals(5, now=T0)["outputs"] == 1
+
+
+def test_non_finite_deltas_are_ignored():
+    s = MinuteSeries(10, windows=(5,))
+    s.add({"overlap_sum": float("inf"), "overlap_n": 1}, now=T0)
+    s.add({"overlap_sum": float("nan"), "outputs": 1}, now=T0 + 60)
+    s.add({"outputs": 1}, ts=float("inf"), now=T0 + 60)
+    s.add({"overlap_sum": 0.5, "overlap_n": 1}, now=T0 + 120)
+    assert s.totals(5, now=T0 + 120)["overlap_sum"] == 0.5
+    assert s.totals(5, now=T0 + 120)["overlap_n"] == 2
+    assert s.totals(5, now=T0 + 300)["overlap_sum"] == 0.5  # still finite once minute 0 expires
+    assert s.totals(5, now=T0 + 300)["outputs"] == 1
+
+
+def test_service_reports_aggregates(monkeypatch):
+    monkeypatch.setenv("QUALITY_METRICS_ENABLED", "true")
+    svc = QualityMetricsService()
+    for i in range(4):
+        svc.record_output({"type": "t", "i": i}, has_provenance=i < 3, sources=["s"] if i else [],
+                          is_duplicate=i == 3, is_quarantined=i == 3, beacon_valid=True)
+    svc.record_rollback("bad")
+    svc.record_copilot_overlap("pr1", 0.2)
+    svc.record_copilot_overlap("pr2", 0.4)
+
+    cur = svc.get_current_metrics()
+    m = cur["metrics"]
+    assert cur["total_outputs"] == 4 and cur["quarantined_items"] == 1
+    assert m["provenance_coverage"]["value"] == 0.75
+    assert m["hallucination_rate"]["value"] == 0.25
+    assert m["duplicate_ratio"]["value"] == 0.25
+    assert m["rollback_rate"]["value"] == 0.25
+    assert abs(m["copilot_overlap_score"]["value"] - 0.3) < 1e-9
+    assert abs(cur["health_score"] - (0.225 + 0.225 + 0.15 + 0.2)) < 1e-9
+
+    hist = svc.get_historical_metrics(1)["metrics"]["provenance_coverage"]
+    assert hist[-1]["value"] == 0.75 and hist[-1]["total_outputs"] == 4
+
+
+def test_routes_use_the_service(monkeypatch):
+    monkeypatch.setenv("QUALITY_METRICS_ENABLED", "true")
+    monkeypatch.setattr(quality_metrics, "quality_service", QualityMetricsService())
+    client = TestClient(app)
+    assert client.post("/dev/quality/record-output?has_provenance=true",
+                       json={"output_data": {"type": "x"}, "sources": ["s"]}).status_code == 200
+    assert client.get("/dev/quality/").json()["total_outputs"] == 1
+    assert client.get("/dev/quality/health").json()["total_records"] == 1
+
+
+def test_record_batch_json_and_ndjson(monkeypatch):
+    monkeypatch.setenv("QUALITY_METRICS_ENABLED", "true")
+    svc = QualityMetricsService()
+    monkeypatch.setattr(quality_metrics, "quality_service", svc)
+    client = TestClient(app)
+
+    events = [{"event": "output", "has_provenance": True, "sources": ["s"]} for _ in range(3)]
+    events += [{"event": "rollback", "reason": "x"}, {"event": "copilot_overlap", "pr_id": "p", "overlap_score": 0.5}]
+    r = client.post("/dev/quality/record-batch", json=events)
+    assert r.status_code == 200
+    assert r.json()["counts"] == {"output": 3, "copilot_overlap": 1, "rollback": 1}
+
+    ndjson = "\n".join('{"event": "output", "is_duplicate": true}' for _ in range(2))
+    r = client.post("/dev/quality/record-batch", content=ndjson, headers={"content-type": "application/x-ndjson"})
+    assert r.json()["accepted"] == 2
+
+    cur = svc.get_current_metrics()
+    assert cur["total_outputs"] == 5
+    assert cur["metrics"]["duplicate_ratio"]["value"] == 0.4
+    assert cur["metrics"]["rollback_rate"]["value"] == 0.2
+
+
+def test_record_batch_rejects_bad_events_atomically(monkeypatch):
+    monkeypatch.setenv("QUALITY_METRICS_ENABLED", "true")
+    svc = QualityMetricsService()
+    monkeypatch.setattr(quality_metrics, "quality_service", svc)
+    client = TestClient(app)
+    r = client.post("/dev/quality/record-batch", json=[{"event": "output"}, {"event": "nope"}])
+    assert r.status_code == 400 and "event 1" in r.json()["detail"]
+    assert svc.get_current_metrics()["total_outputs"] == 0
+    assert client.post("/dev/quality/record-batch", content=b"{", headers={"content-type": "application/json"}).status_code == 400
+
+
+def test_record_batch_rejects_non_finite_ts(monkeypatch):
+    monkeypatch.setenv("QUALITY_METRICS_ENABLED", "true")
+    svc = QualityMetricsService()
+    monkeypatch.setattr(quality_metrics, "quality_service", svc)
+    client = TestClient(app)
+    for ts in ("Infinity", "-Infinity", "NaN", '"soon"', "1e400"):
+        body = '{"event": "output"}\n{"event": "rollback", "ts": %s}' % ts
+        r = client.post("/dev/quality/record-batch", content=body, headers={"content-type": "application/x-ndjson"})
+        assert r.status_code == 400 and "event 1" in r.json()["detail"], ts
+    assert svc.get_current_metrics()["total_outputs"] == 0
+
+
+def test_non_finite_overlap_score_is_rejected(monkeypatch):
+    monkeypatch.setenv("QUALITY_METRICS_ENABLED", "true")
+    svc = QualityMetricsService()
+    monkeypatch.setattr(quality_metrics, "quality_service", svc)
+    client = TestClient(app)
+    for score in ("Infinity", "-Infinity", "NaN", "1e400"):
+        body = '{"event": "copilot_overlap", "overlap_score": %s}' % score
+        r = client.post("/dev/quality/record-batch", content=body, headers={"content-type": "application/x-ndjson"})
+        assert r.status_code == 400 and "event 0" in r.json()["detail"], score
+    for score in ("inf", "-inf", "nan"):
+        r = client.post(f"/dev/quality/record-copilot-overlap?pr_id=p&overlap_score={score}")
+        assert r.status_code == 400, score
+    assert client.post("/dev/quality/record-copilot-overlap?pr_id=p&overlap_score=0.25").status_code == 200
+    assert client.get("/dev/quality/").status_code == 200
+
+
+def _worker_writes(path, n):
+    series = shared_series(path, 60, windows=(10,))
+    for _ in range(n):
+        series.add({"outputs": 1, "provenance": 1})
+
+
+def test_shared_series_sums_writes_from_all_processes(tmp_path):
+    path = str(tmp_path / "quality.bin")
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_worker_writes, args=(path, 500)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert all(p.exitcode == 0 for p in procs)
+    totals = shared_series(path, 60, windows=(10,)).totals(60)
+    assert totals["outputs"] == 2000 and totals["provenance"] == 2000
+    # reopening with a different layout resets instead of misreading
+    assert shared_series(path, 30).totals(30)["outputs"] == 0
+
+
+def test_service_uses_shared_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("QUALITY_METRICS_ENABLED", "true")
+    monkeypatch.setenv("QUALITY_METRICS_SHARED_PATH", str(tmp_path / "q.bin"))
+    a, b = QualityMetricsService(), QualityMetricsService()  # two "workers"
+    a.record_output({}, has_provenance=True, sources=["s"])
+    b.record_output({}, has_provenance=False, sources=["s"])
+    for svc in (a, b):
+        cur = svc.get_current_metrics()
+        assert cur["total_outputs"] == 2 and cur["metrics"]["provenance_coverage"]["value"] == 0.5
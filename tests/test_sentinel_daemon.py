@@ -0,0 +1,82 @@
+# tests/test_sentinel_daemon.py
+import asyncio
+import importlib.util
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def sentinel(tmp_path, monkeypatch):
+    """A fresh sentinel module writing under tmp_path."""
+    monkeypatch.setenv("LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setenv("STATE_PATH", str(tmp_path / "state.json"))
+    spec = importlib.util.spec_from_file_location("sentinel_under_test", ROOT / "sentinel" / "sentinel.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    monkeypatch.setattr(mod, "SERVICES", {"A": "http://a/", "B": "http://b/"})
+    return mod
+
+
+def _prober(plan):
+    """Fake probe returning the next {name: status} from plan (the last one repeats)."""
+    calls = []
+
+    async def probe():
+        statuses = plan[min(len(calls), len(plan) - 1)]
+        calls.append(statuses)
+        return {k: {"status": s, "latency_ms": 10.0 if s == "UP" else None, "error": None, "url": f"http://{k}/"}
+                for k, s in statuses.items()}
+    return probe, calls
+
+
+def test_next_tick_is_fixed_rate(sentinel):
+    assert sentinel.next_tick(0, 3.2, 10) == 10
+    assert sentinel.next_tick(10, 12.5, 10) == 20  # late wake-up does not shift the grid
+    assert sentinel.next_tick(20, 45.0, 10) == 50  # overrun: 30 and 40 are skipped
+
+
+def test_daemon_flushes_only_on_change_and_writes_no_per_run_files(sentinel, monkeypatch):
+    writes = []
+    real_save = sentinel.save_state
+    monkeypatch.setattr(sentinel, "save_state", lambda st: (writes.append(st), real_save(st)))
+    up, a_down = {"A": "UP", "B": "UP"}, {"A": "DOWN", "B": "UP"}
+    probe, calls = _prober([up, up, up, a_down, a_down, up])
+
+    d = sentinel.SentinelDaemon(interval=0.01, probe=probe)
+    asyncio.run(d.run(max_ticks=8))
+
+    assert len(calls) == 8
+    assert [w["statuses"] for w in writes] == [up, a_down, up]
+    state = json.loads(Path(sentinel.STATE_PATH).read_text())
+    assert state["statuses"] == up and state["last_attestation"]["services"]["A"]["status"] == "UP"
+    # health log: first tick plus the two changes; no attestation_*.json churn
+    log = sentinel.HEALTH_LOG
+    assert [log.get(*pos)["down_list"] for pos in log] == [[], ["A"], []]
+    assert not list(Path(sentinel.LOG_DIR).glob("attestation_*.json"))
+    stats = d.latency_stats()["A"]
+    assert (stats["n"], stats["failed"], stats["p50_ms"]) == (8, 2, 10.0)
+
+
+def test_daemon_alerts_once_per_window(sentinel, monkeypatch):
+    sent = []
+    monkeypatch.setattr(sentinel, "post_webhook", lambda msg, payload=None: sent.append(msg))
+    monkeypatch.setattr(sentinel, "ALERT_THRESHOLD", 2)
+    monkeypatch.setattr(sentinel, "ALERT_WINDOW_M", 1)
+    probe, _ = _prober([{"A": "DOWN", "B": "DOWN"}] * 6 + [{"A": "UP", "B": "UP"}])
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    async def scenario():
+        d = sentinel.SentinelDaemon(interval=30, probe=probe)
+        for sec in (0, 30, 61, 90, 125, 150, 160):
+            await d.tick(t0 + timedelta(seconds=sec))
+            await asyncio.gather(*d._tasks)
+        return d
+
+    d = asyncio.run(scenario())
+    assert len(sent) == 2  # at 61s and again at 125s
+    assert d.state["window_start"] is None